@@ -15,6 +15,10 @@ Welcome to the OCR Benchmark Dashboard! This tool helps analyze and visualize OC
 ### Available Pages:
 - **Performance Metrics**: View detailed performance metrics, costs, and latency analysis
 - **Test Results**: View detailed test results
+- **Trends**: Track accuracy, cost and latency of each model across runs
+- **Throughput Simulator**: Estimate throughput, queueing delay and cost per hour at a given concurrency
+- **Timeline**: See how each model's request pool filled up over a run
+- **Compare Runs**: Compare runs against a baseline per model and find documents that regressed
 
 Choose a page from the sidebar to get started.
 """
@@ -0,0 +1,305 @@
+"""Time the dashboard's loaders and aggregations on synthetic runs
+
+Generates runs of each size under ``--workdir`` and reports, per operation,
+the time of a first open (nothing cached or persisted), a reopen (only
+persisted sidecars), a warm call (in-process cache hit) and how much a
+first open raises the peak resident memory (measured in a forked child, so
+Unix only):
+
+    python bench.py --sizes 1000 10000 100000 --output bench.json
+    python bench.py --sizes 1000 10000 --baseline bench.json
+
+With ``--database`` the runs are also seeded into ``DATABASE_URL`` (which
+must have the Prisma schema applied) and benchmarked in database mode.
+"""
+
+import os
+import sys
+import time
+import argparse
+import shutil
+import resource
+import multiprocessing
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+import pandas as pd
+
+from utils.analytics import create_model_comparison_table, create_results_table
+from utils.data_loader import (
+    clear_caches,
+    load_metrics_table,
+    load_model_stats,
+    load_one_result,
+    load_results_for_run,
+    load_run_list,
+)
+from utils.db import dispose_engine
+from utils.metrics_table import get_metrics_table_path
+from utils.results_store import get_index_path
+from utils.synthetic import generate_results, seed_database, write_results_file
+
+# Operations timed for every run, called with (timestamp, result id)
+BENCHMARKS: Dict[str, Callable[[str, str], Any]] = {
+    "load_run_list": lambda timestamp, id: load_run_list(),
+    "load_results_for_run": lambda timestamp, id: load_results_for_run(timestamp),
+    "load_one_result": lambda timestamp, id: load_one_result(timestamp, id),
+    "create_model_comparison_table": lambda timestamp, id: (
+        create_model_comparison_table(load_model_stats(timestamp))
+    ),
+    "create_results_table": lambda timestamp, id: create_results_table(
+        load_metrics_table(timestamp)
+    ),
+}
+
+TIMING_COLUMNS = ["first_s", "reopen_s", "warm_s", "peak_mb"]
+# Differences below these are noise, whatever the ratio
+MIN_REGRESSION = {"first_s": 0.01, "reopen_s": 0.01, "warm_s": 0.01, "peak_mb": 10}
+# ru_maxrss is in bytes on macOS and in KiB elsewhere
+RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def _remove_artifacts(timestamp: str, from_db: bool) -> None:
+    """Delete the sidecars the loaders persist, so the next open is a first open"""
+    paths = [get_metrics_table_path(timestamp, from_db=from_db)]
+    if not from_db:
+        paths.append(get_index_path(Path("results") / timestamp / "results.json"))
+    for path in paths:
+        if path.exists():
+            path.unlink()
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _report_peak_memory(func: Callable[[], Any], sender) -> None:
+    start = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        func()
+        sender.send(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start)
+    except BaseException:
+        sender.send(None)
+        raise
+
+
+def peak_memory(func: Callable[[], Any]) -> float:
+    """Return how many MiB the peak RSS grows while ``func`` runs
+
+    ``func`` runs in a forked child so earlier allocations do not mask its
+    peak; unlike tracemalloc this counts NumPy and Arrow buffers and does not
+    slow the call down.
+    """
+    # The child must not share the parent's pooled connections
+    dispose_engine()
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_report_peak_memory, args=(func, sender))
+    process.start()
+    growth = receiver.recv()
+    process.join()
+    if growth is None:
+        raise RuntimeError("Benchmark failed in the memory measurement process")
+    return growth * RSS_UNIT / 2**20
+
+
+def measure(
+    func: Callable[[], Any], timestamp: str, from_db: bool, repeat: int
+) -> Dict[str, float]:
+    """Return first-open, reopen and warm timings and the first-open peak memory"""
+    clear_caches()
+    _remove_artifacts(timestamp, from_db)
+    first = _timed(func)
+
+    reopen = []
+    for _ in range(repeat):
+        clear_caches()
+        reopen.append(_timed(func))
+    warm = min(_timed(func) for _ in range(repeat))
+
+    clear_caches()
+    _remove_artifacts(timestamp, from_db)
+    return {
+        "first_s": first,
+        "reopen_s": min(reopen),
+        "warm_s": warm,
+        "peak_mb": peak_memory(func),
+    }
+
+
+def _remember_middle_id(results: Iterator[Dict[str, Any]], count: int, found: list):
+    for position, result in enumerate(results):
+        if position == count // 2:
+            found.append(result["id"])
+        yield result
+
+
+def create_run(timestamp: str, size: int, markdown_chars: int, from_db: bool) -> str:
+    """Generate a synthetic run and return the id of its middle result"""
+    found: List[str] = []
+    results = _remember_middle_id(
+        generate_results(size, markdown_chars=markdown_chars), size, found
+    )
+    if from_db:
+        from utils.db import get_engine
+
+        seed_database(get_engine(), timestamp, results, size)
+    else:
+        write_results_file(Path("results") / timestamp / "results.json", results)
+    return found[0]
+
+
+def delete_db_run(timestamp: str) -> None:
+    """Remove a seeded run and its results from the database"""
+    from sqlalchemy import text
+
+    from utils.db import get_engine
+
+    with get_engine().begin() as conn:
+        conn.execute(
+            text(
+                """
+                DELETE FROM benchmark_results WHERE benchmark_run_id IN (
+                    SELECT id FROM benchmark_runs WHERE timestamp = :timestamp
+                )
+                """
+            ),
+            {"timestamp": timestamp},
+        )
+        conn.execute(
+            text("DELETE FROM benchmark_runs WHERE timestamp = :timestamp"),
+            {"timestamp": timestamp},
+        )
+
+
+def run_benchmarks(
+    sizes: List[int], markdown_chars: int, repeat: int, modes: List[str]
+) -> pd.DataFrame:
+    """Benchmark every operation on a synthetic run of each size and mode"""
+    database_url = os.environ.pop("DATABASE_URL", None)
+    rows = []
+    try:
+        for mode in modes:
+            from_db = mode == "database"
+            if from_db:
+                os.environ["DATABASE_URL"] = database_url
+            for position, size in enumerate(sizes):
+                timestamp = f"2099-01-01-00-00-{position:02d}"
+                start = time.perf_counter()
+                result_id = create_run(timestamp, size, markdown_chars, from_db)
+                print(
+                    f"{mode}: generated {size:,} results in "
+                    f"{time.perf_counter() - start:.1f} s",
+                    file=sys.stderr,
+                )
+                try:
+                    for name, benchmark in BENCHMARKS.items():
+                        timings = measure(
+                            lambda: benchmark(timestamp, result_id),
+                            timestamp,
+                            from_db,
+                            repeat,
+                        )
+                        rows.append(
+                            {"mode": mode, "size": size, "operation": name, **timings}
+                        )
+                finally:
+                    if from_db:
+                        delete_db_run(timestamp)
+                        _remove_artifacts(timestamp, from_db)
+                    else:
+                        shutil.rmtree(Path("results") / timestamp)
+    finally:
+        if database_url is not None:
+            os.environ["DATABASE_URL"] = database_url
+        clear_caches()
+    return pd.DataFrame(rows)
+
+
+def find_regressions(
+    report: pd.DataFrame, baseline: pd.DataFrame, tolerance: float
+) -> pd.DataFrame:
+    """Return the measurements more than ``tolerance`` times their baseline"""
+    keys = ["mode", "size", "operation"]
+    merged = report.merge(baseline, on=keys, suffixes=("", "_baseline"))
+    regressions = []
+    for column in TIMING_COLUMNS:
+        current = merged[column]
+        previous = merged[f"{column}_baseline"]
+        slower = (current > previous * tolerance) & (
+            current - previous > MIN_REGRESSION[column]
+        )
+        regressions.append(
+            merged.loc[slower, keys].assign(
+                metric=column, value=current[slower], baseline=previous[slower]
+            )
+        )
+    return pd.concat(regressions, ignore_index=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark data loading and aggregation on synthetic runs"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument(
+        "--markdown-chars",
+        type=int,
+        default=4000,
+        help="Approximate markdown size of each result",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--database",
+        action="store_true",
+        help="Also seed DATABASE_URL and benchmark database mode",
+    )
+    parser.add_argument(
+        "--workdir",
+        default=".bench",
+        help="Directory the synthetic runs and caches are written to",
+    )
+    parser.add_argument("--output", help="Write the report to a .json or .csv file")
+    parser.add_argument("--baseline", help="Compare with a previous .json report")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Ratio to the baseline reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    modes = ["folder"]
+    if args.database:
+        if not os.getenv("DATABASE_URL"):
+            parser.error("--database requires DATABASE_URL")
+        modes.append("database")
+
+    output = Path(args.output).resolve() if args.output else None
+    baseline = pd.read_json(args.baseline) if args.baseline else None
+
+    workdir = Path(args.workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(workdir)
+
+    report = run_benchmarks(args.sizes, args.markdown_chars, args.repeat, modes)
+    print(report.to_string(index=False, float_format="{:.4f}".format))
+
+    if output and output.suffix == ".csv":
+        report.to_csv(output, index=False)
+    elif output:
+        report.to_json(output, orient="records", indent=2)
+
+    if baseline is not None:
+        regressions = find_regressions(report, baseline, args.tolerance)
+        if not regressions.empty:
+            print("\nRegressions:")
+            print(regressions.to_string(index=False, float_format="{:.4f}".format))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
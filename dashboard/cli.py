@@ -0,0 +1,85 @@
+"""Export a benchmark run's aggregated tables without starting Streamlit
+
+Reads the run from ``DATABASE_URL`` when set, otherwise from ``results/``,
+so run it from the repository root like the dashboard itself:
+
+    python dashboard/cli.py latest --format parquet --output-dir exports
+    python dashboard/cli.py 2025-01-01-00-00-00 --tables model_comparison latency
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+import pandas as pd
+
+from utils.analytics import ANALYTICS_TABLES, build_tables
+from utils.data_loader import load_run_list
+
+EXPORT_FORMATS = ("csv", "json", "parquet")
+
+
+def write_table(frame: pd.DataFrame, path: Path, fmt: str) -> None:
+    """Write a table as CSV, JSON records or Parquet"""
+    if fmt == "csv":
+        frame.to_csv(path, index=False)
+    elif fmt == "json":
+        frame.to_json(path, orient="records", indent=2)
+    else:
+        frame.to_parquet(path, index=False)
+
+
+def resolve_timestamp(run: str) -> str:
+    """Return the timestamp of ``run``, where ``latest`` is the newest completed run"""
+    if not os.getenv("DATABASE_URL") and not Path("results").is_dir():
+        raise SystemExit(
+            "No results/ directory found; run from the repository root or set "
+            "DATABASE_URL"
+        )
+    runs = load_run_list()
+    if run == "latest":
+        completed = [r["timestamp"] for r in runs if r["status"] == "completed"]
+        if not completed:
+            raise SystemExit("No completed benchmark runs found")
+        return max(completed)
+    if not any(r["timestamp"] == run for r in runs):
+        raise SystemExit(f"Benchmark run {run} not found")
+    return run
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Export aggregated tables of a benchmark run"
+    )
+    parser.add_argument(
+        "run", help="Run timestamp, e.g. 2025-01-01-00-00-00, or 'latest'"
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        choices=list(ANALYTICS_TABLES),
+        default=[name for name in ANALYTICS_TABLES if name != "results"],
+        help="Tables to export (default: every table except per-test results)",
+    )
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument(
+        "--output-dir",
+        default="exports",
+        help="Directory the tables are written to, as <run>/<table>.<format>",
+    )
+    args = parser.parse_args(argv)
+
+    timestamp = resolve_timestamp(args.run)
+    output_dir = Path(args.output_dir) / timestamp
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, frame in build_tables(timestamp, args.tables).items():
+        path = output_dir / f"{name}.{args.format}"
+        write_table(frame, path, args.format)
+        print(f"{path} ({len(frame)} rows)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,186 +3,410 @@ from datetime import datetime
 import plotly.express as px
 import pandas as pd
 
-from utils.data_loader import load_run_list, load_results_for_run
+from utils.analytics import (
+    create_accuracy_comparison_charts,
+    create_latency_percentile_table,
+    create_model_comparison_table,
+    create_results_table,
+)
+from utils.data_loader import (
+    load_run_list,
+    load_latency_stats,
+    load_metrics_table,
+    load_model_combinations,
+    load_model_stats,
+    load_results_page,
+)
+from utils.debug_panel import instrumented_fragment, instrumented_page
+from utils.instrumentation import span
+from utils.results_table import ERROR_FILTERS, RESULTS_PAGE_SIZES, RESULTS_SORT_COLUMNS
 from utils.style import SIDEBAR_STYLE
 
 st.set_page_config(page_title="Performance Metrics")
 st.markdown(SIDEBAR_STYLE, unsafe_allow_html=True)
 
+PAGE = "Performance Metrics"
 
-def create_results_table(results):
-    """Create a DataFrame from test results"""
-    rows = []
 
-    for test in results:  # Results is a list of test cases
-        row = {
-            "Image": test["fileUrl"],
-            "OCR Model": test["ocrModel"],
-            "Extraction Model": test["extractionModel"],
-            "Levenshtein Score": test.get("levenshteinDistance", 0),
-            "JSON Accuracy": test.get("jsonAccuracy", 0),
-            "Total Cost": test.get("usage", {}).get("totalCost", 0),
-            "Duration (ms)": test.get("usage", {}).get("duration", 0),
-            "Metadata": test.get("metadata", {}),
-        }
-        rows.append(row)
+@st.fragment
+@instrumented_fragment(PAGE, "Accuracy")
+def accuracy_section(timestamp):
+    """Display JSON accuracy and text similarity by model"""
+    model_stats = load_model_stats(timestamp)
 
-    return pd.DataFrame(rows)
+    st.header("Evaluation Metrics by Model")
+    with span("chart: JSON accuracy"):
+        json_df, text_df = create_accuracy_comparison_charts(model_stats)
+        fig1 = px.bar(
+            json_df.reset_index().sort_values("JSON Accuracy", ascending=False),
+            x="Model",
+            y="JSON Accuracy",
+            title="JSON Accuracy by Model",
+            height=600,
+            color_discrete_sequence=["#636EFA"],
+        )
+        fig1.update_layout(showlegend=False)
+        fig1.update_traces(texttemplate="%{y:.1%}", textposition="outside")
+        st.plotly_chart(fig1)
+
+    with span("chart: text similarity"):
+        fig2 = px.bar(
+            text_df.reset_index().sort_values("Text Similarity", ascending=False),
+            x="Model",
+            y="Text Similarity",
+            title="Text Similarity by Model",
+            height=600,
+            color_discrete_sequence=["#636EFA"],
+        )
+        fig2.update_layout(showlegend=False)
+        fig2.update_traces(texttemplate="%{y:.1%}", textposition="outside")
+        st.plotly_chart(fig2)
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Model statistics")
+def model_statistics_section(timestamp):
+    """Display the model performance statistics table"""
+    model_stats = load_model_stats(timestamp)
+
+    st.header("Model Performance Statistics")
+    st.dataframe(
+        create_model_comparison_table(model_stats).style.format(
+            {
+                "json_accuracy": "{:.2%}",
+                "text_accuracy": "{:.2%}",
+                "avg_latency": "{:.2f} s",
+                "total_cost": "${:.4f}",
+                "count": "{:.0f}",
+            }
+        )
+    )
 
 
-def create_model_comparison_table(results):
-    """Create a DataFrame comparing different model combinations"""
-    model_stats = {}
+@st.fragment
+@instrumented_fragment(PAGE, "Cost")
+def cost_section(timestamp):
+    """Display cost per page and its OCR/extraction breakdown"""
+    model_stats = load_model_stats(timestamp)
 
-    for test in results:
-        if "error" in test and test["error"]:
-            continue
+    st.header("Cost Analysis")
 
-        model_key = (
-            f"{test['extractionModel']} (IMG2JSON)"
-            if test.get("directImageExtraction", False)
-            else f"{test['ocrModel']} → {test['extractionModel']}"
+    # Cost per document chart
+    with span("chart: cost"):
+        cost_df = pd.DataFrame(model_stats["total_cost"] * 1000).reset_index()
+        cost_df.columns = ["Model", "Cost per 1,000 Pages"]
+        fig4 = px.bar(
+            cost_df.sort_values("Cost per 1,000 Pages", ascending=True),
+            x="Model",
+            y="Cost per 1,000 Pages",
+            title="Cost per 1,000 Pages by Model Combination",
+            height=600,
+            color_discrete_sequence=["#EE553B"],
         )
-        if model_key not in model_stats:
-            model_stats[model_key] = {
-                "count": 0,
-                "json_accuracy": 0,
-                "text_accuracy": 0,
-                "total_cost": 0.0,
-                "ocr_cost": 0.0,
-                "extraction_cost": 0.0,
-                "ocr_latency": 0,
-                "extraction_latency": 0,
-                "extraction_count": 0,
-                "ocr_input_tokens": 0,
-                "ocr_output_tokens": 0,
-                "extraction_input_tokens": 0,
-                "extraction_output_tokens": 0,
+        fig4.update_layout(showlegend=False)
+        fig4.update_traces(texttemplate="$%{y:.2f}", textposition="outside")
+        st.plotly_chart(fig4)
+
+    # Create stacked bar chart for cost breakdown per document
+    with span("chart: cost breakdown"):
+        cost_breakdown_df = pd.DataFrame(
+            {
+                "Model": model_stats.index,
+                "OCR": model_stats["ocr_cost"] * 1000,
+                "Extraction": model_stats["extraction_cost"] * 1000,
             }
+        )
 
-        stats = model_stats[model_key]
-        stats["count"] += 1
-        stats["text_accuracy"] += test.get("levenshteinDistance", 0) or 0
-        # Ensure None values are converted to 0.0
-        totalCost = test.get("usage", {}).get("totalCost")
-        stats["total_cost"] += 0.0 if totalCost is None else totalCost
-        usage = test.get("usage", {})
-
-        # Handle possible None values in ocr cost
-        ocrCost = usage.get("ocr", {}).get("totalCost")
-        stats["ocr_cost"] += 0.0 if ocrCost is None else ocrCost
-
-        stats["ocr_latency"] += usage.get("ocr", {}).get("duration", 0) / 1000
-        stats["ocr_input_tokens"] += usage.get("ocr", {}).get("inputTokens", 0)
-        stats["ocr_output_tokens"] += usage.get("ocr", {}).get("outputTokens", 0)
-
-        # Add token counting
-        if usage.get("extraction"):
-            stats["extraction_input_tokens"] += usage.get("extraction", {}).get(
-                "inputTokens", 0
-            )
-            stats["extraction_output_tokens"] += usage.get("extraction", {}).get(
-                "outputTokens", 0
-            )
-
-        # Only add JSON accuracy and extraction stats if extraction was performed
-        if "jsonAccuracy" in test and usage.get("extraction"):
-            stats["extraction_count"] += 1
-            stats["json_accuracy"] += test["jsonAccuracy"]
-            # Handle possible None values in extraction cost
-            extractionCost = usage.get("extraction", {}).get("totalCost")
-            stats["extraction_cost"] += (
-                0.0 if extractionCost is None else extractionCost
-            )
-            stats["extraction_latency"] += (
-                usage.get("extraction", {}).get("duration", 0) / 1000
-            )
-
-    # Calculate averages
-    for stats in model_stats.values():
-        stats["text_accuracy"] /= stats["count"]
-        stats["ocr_latency"] /= stats["count"]
-        stats["ocr_cost"] /= stats["count"]
-        stats["total_cost"] /= stats["count"]
-        stats["ocr_input_tokens"] /= stats["count"]
-        stats["ocr_output_tokens"] /= stats["count"]
-
-        # Calculate extraction-related averages only if there were extractions
-        if stats["extraction_count"] > 0:
-            stats["json_accuracy"] /= stats["extraction_count"]
-            stats["extraction_latency"] /= stats["extraction_count"]
-            stats["extraction_cost"] /= stats["extraction_count"]
-            stats["extraction_input_tokens"] /= stats["extraction_count"]
-            stats["extraction_output_tokens"] /= stats["extraction_count"]
-
-    # Convert to DataFrame
-    df = pd.DataFrame.from_dict(model_stats, orient="index")
-    df.index.name = "Model Combination"
-    return df
-
-
-def create_accuracy_comparison_charts(results):
-    """Create separate DataFrames for JSON and Text accuracy comparisons"""
-    model_accuracies = {}
-
-    for test in results:
-        if "error" in test and test["error"]:
-            continue
-
-        model_key = (
-            f"{test['extractionModel']} (IMG2JSON)"
-            if test.get("directImageExtraction", False)
-            else f"{test['ocrModel']} → {test['extractionModel']}"
+        # Calculate cost per 1k documents for sorting
+        cost_breakdown_df["Total"] = (
+            cost_breakdown_df["OCR"] + cost_breakdown_df["Extraction"]
+        )
+        fig_cost = px.bar(
+            cost_breakdown_df.sort_values("Total", ascending=True),
+            x="Model",
+            y=["OCR", "Extraction"],
+            title="Cost per 1,000 Pages Breakdown by Model Combination (OCR + Extraction)",
+            height=600,
+            color_discrete_sequence=["#636EFA", "#EF553B"],
+        )
+        fig_cost.update_layout(
+            barmode="stack",
+            showlegend=True,
+            legend_title="Phase",
+            yaxis=dict(
+                title="Cost per 1,000 Pages (USD)",
+                range=[
+                    0,
+                    cost_breakdown_df["Total"].max() * 1.2,
+                ],
+            ),
         )
-        if model_key not in model_accuracies:
-            model_accuracies[model_key] = {
-                "count": 0,
-                "json_accuracy": 0,
-                "text_similarity": 0,
-                "total_matched_items": 0,
-                "total_items": 0,
-                "extraction_count": 0,
+        fig_cost.update_traces(texttemplate="$%{y:.2f}", textposition="inside")
+        st.plotly_chart(fig_cost)
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Latency")
+def latency_section(timestamp):
+    """Display average OCR and extraction latency"""
+    model_stats = load_model_stats(timestamp)
+
+    st.header("Latency Analysis")
+
+    # Create stacked bar chart for latency
+    with span("chart: latency"):
+        latency_df = pd.DataFrame(
+            {
+                "Model": model_stats.index,
+                "OCR": model_stats["ocr_latency"],
+                "Extraction": model_stats["extraction_latency"],
             }
+        )
 
-        stats = model_accuracies[model_key]
-        stats["count"] += 1
-        stats["text_similarity"] += test.get("levenshteinDistance", 0) or 0
-
-        # Handle JSON accuracy if present
-        if "jsonAccuracy" in test:
-            stats["extraction_count"] += 1
-            stats["json_accuracy"] += test["jsonAccuracy"] or 0
-
-    # Calculate final averages
-    for stats in model_accuracies.values():
-        stats["text_similarity"] /= stats["count"]
-
-        # Calculate JSON accuracy only if there were extractions
-        if stats["extraction_count"] > 0:
-            stats["json_accuracy"] /= stats["extraction_count"]
-        else:
-            stats["json_accuracy"] = 0
-
-    # Create DataFrames
-    json_df = pd.DataFrame(
-        {
-            "Model": model_accuracies.keys(),
-            "JSON Accuracy": [
-                stats["json_accuracy"] for stats in model_accuracies.values()
-            ],
-        }
-    ).set_index("Model")
-
-    text_df = pd.DataFrame(
-        {
-            "Model": model_accuracies.keys(),
-            "Text Similarity": [
-                stats["text_similarity"] for stats in model_accuracies.values()
+        # Calculate total latency for labels
+        latency_df["Total"] = latency_df.get("OCR", 0) + latency_df.get("Extraction", 0)
+        fig5 = px.bar(
+            latency_df.sort_values("Total", ascending=True),
+            x="Model",
+            y=["OCR", "Extraction"],
+            title="Latency by Model Combination (OCR + Extraction)",
+            height=600,
+            color_discrete_sequence=["#636EFA", "#EF553B"],
+        )
+        fig5.update_layout(
+            barmode="stack",
+            showlegend=True,
+            legend_title="Phase",
+            yaxis=dict(
+                range=[
+                    0,
+                    latency_df["Total"].max() * 1.2,
+                ]  # Set y-axis range to 120% of max value
+            ),
+        )
+        fig5.update_traces(texttemplate="%{y:.2f}s", textposition="inside")
+        st.plotly_chart(fig5)
+
+    # Total latency chart
+    with span("chart: total latency"):
+        total_latency_df = pd.DataFrame(
+            {
+                "Model": model_stats.index,
+                "Total Latency": model_stats["ocr_latency"]
+                + model_stats["extraction_latency"],
+            }
+        )
+        fig6 = px.bar(
+            total_latency_df.sort_values("Total Latency", ascending=True),
+            x="Model",
+            y="Total Latency",
+            title="Total Latency by Model Combination",
+            height=600,
+            color_discrete_sequence=["#636EFA"],
+        )
+        fig6.update_layout(showlegend=False)
+        fig6.update_traces(texttemplate="%{y:.2f}s", textposition="outside")
+        st.plotly_chart(fig6)
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Latency distribution")
+def latency_distribution_section(timestamp):
+    """Display latency percentiles and histograms for a phase"""
+    st.header("Latency Distribution")
+    latency_stats, latency_histogram = load_latency_stats(timestamp)
+    phase = st.radio("Phase", ["OCR", "Extraction"], horizontal=True)
+
+    with span("chart: latency percentiles"):
+        percentile_df = create_latency_percentile_table(latency_stats, phase)
+        fig7 = px.bar(
+            percentile_df.sort_values("p99", ascending=True),
+            x="Model",
+            y=["p50", "p90", "p95", "p99"],
+            barmode="group",
+            title=f"{phase} Latency Percentiles by Model Combination",
+            height=600,
+            color_discrete_sequence=["#636EFA", "#7B83FB", "#F76D57", "#EF553B"],
+        )
+        fig7.update_layout(legend_title="Percentile", yaxis_title="Latency (s)")
+        fig7.update_traces(texttemplate="%{y:.2f}s", textposition="outside")
+        st.plotly_chart(fig7)
+
+    with span("chart: latency histogram"):
+        fig8 = px.histogram(
+            latency_histogram[latency_histogram["phase"] == phase],
+            x="latency",
+            y="count",
+            color="Model Combination",
+            histfunc="sum",
+            nbins=50,
+            barmode="overlay",
+            opacity=0.6,
+            title=f"{phase} Latency Distribution by Model Combination",
+            height=600,
+        )
+        fig8.update_layout(xaxis_title="Latency (s)", yaxis_title="Pages")
+        st.plotly_chart(fig8)
+
+    st.dataframe(
+        latency_stats.style.format(
+            {
+                "count": "{:.0f}",
+                "p50": "{:.2f} s",
+                "p90": "{:.2f} s",
+                "p95": "{:.2f} s",
+                "p99": "{:.2f} s",
+            }
+        )
+    )
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Token usage")
+def token_usage_section(timestamp):
+    """Display average token usage per page"""
+    model_stats = load_model_stats(timestamp)
+
+    st.header("Token Usage Analysis")
+    with span("chart: token usage"):
+        token_df = pd.DataFrame(
+            {
+                "Model": model_stats.index,
+                "Input Tokens": model_stats["ocr_input_tokens"],
+                "Output Tokens": model_stats["ocr_output_tokens"],
+                "Extraction Input Tokens": model_stats["extraction_input_tokens"],
+                "Extraction Output Tokens": model_stats["extraction_output_tokens"],
+            }
+        )
+
+        # Calculate total tokens for sorting
+        token_df["Total"] = (
+            token_df["Input Tokens"]
+            + token_df["Output Tokens"]
+            + token_df["Extraction Input Tokens"]
+            + token_df["Extraction Output Tokens"]
+        )
+
+        fig_tokens = px.bar(
+            token_df.sort_values("Total", ascending=True),
+            x="Model",
+            y=[
+                "Input Tokens",
+                "Output Tokens",
+                "Extraction Input Tokens",
+                "Extraction Output Tokens",
             ],
-        }
-    ).set_index("Model")
+            title="Average Token Usage per Page by Model Combination",
+            height=600,
+            color_discrete_sequence=["#636EFA", "#EF553B", "#7B83FB", "#F76D57"],
+        )
 
-    return json_df, text_df
+        fig_tokens.update_layout(
+            barmode="stack",
+            showlegend=True,
+            legend_title="Token Type",
+            yaxis=dict(
+                title="Number of Tokens",
+                range=[0, token_df["Total"].max() * 1.2],
+            ),
+        )
+        fig_tokens.update_traces(texttemplate="%{y:.0f}", textposition="inside")
+        st.plotly_chart(fig_tokens)
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Test results")
+def test_results_section(timestamp):
+    """Display one page of the run's tests, sorted and filtered server-side"""
+    st.header("Test Results")
+    model_labels = [model["label"] for model in load_model_combinations(timestamp)]
+
+    filter_cols = st.columns([2, 1])
+    with filter_cols[0]:
+        model_filter = st.multiselect("Model Combinations", model_labels)
+    with filter_cols[1]:
+        error_filter = st.selectbox("Errors", list(ERROR_FILTERS.keys()))
+    score_cols = st.columns(2)
+    with score_cols[0]:
+        json_accuracy_range = st.slider("JSON Accuracy", 0.0, 1.0, (0.0, 1.0))
+    with score_cols[1]:
+        levenshtein_range = st.slider("Levenshtein Score", 0.0, 1.0, (0.0, 1.0))
+    sort_cols = st.columns([2, 1, 1])
+    with sort_cols[0]:
+        sort_by = st.selectbox("Sort by", list(RESULTS_SORT_COLUMNS.keys()))
+    with sort_cols[1]:
+        st.markdown('<div style="margin-top: 32px;">', unsafe_allow_html=True)
+        descending = st.checkbox("Descending")
+    with sort_cols[2]:
+        page_size = st.selectbox("Rows per page", RESULTS_PAGE_SIZES, index=2)
+
+    query = {
+        "sort_by": sort_by,
+        "ascending": not descending,
+        "model_combinations": model_filter,
+        "json_accuracy_range": json_accuracy_range,
+        "levenshtein_range": levenshtein_range,
+        "has_error": ERROR_FILTERS[error_filter],
+    }
+
+    # Go back to the first page whenever the run, sort or filters change
+    query_key = (
+        timestamp,
+        page_size,
+        sort_by,
+        descending,
+        tuple(model_filter),
+        json_accuracy_range,
+        levenshtein_range,
+        error_filter,
+    )
+    if st.session_state.get("results_query_key") != query_key:
+        st.session_state.results_query_key = query_key
+        st.session_state.results_page = 1
+
+    # Only the requested page is converted and sent to the browser
+    results = load_results_page(
+        timestamp,
+        page=st.session_state.results_page,
+        page_size=page_size,
+        **query,
+    )
+    if not results["total"]:
+        st.warning("No test results match the selected filters.")
+        return
+    # The page is clamped when the run shrank, e.g. while it is still running
+    st.session_state.results_page = results["page"]
+
+    st.dataframe(
+        create_results_table(results["rows"], flatten_metadata=True),
+        hide_index=True,
+    )
+
+    first = (results["page"] - 1) * page_size + 1
+    last = first + len(results["rows"]) - 1
+    nav_cols = st.columns([3, 1])
+    with nav_cols[0]:
+        st.caption(f"Showing {first:,}–{last:,} of {results['total']:,} results")
+    with nav_cols[1]:
+        st.number_input(
+            f"Page (of {results['page_count']:,})",
+            min_value=1,
+            max_value=results["page_count"],
+            key="results_page",
+        )
+
+
+# Page sections in display order; only the selected ones are computed
+SECTIONS = {
+    "Accuracy": accuracy_section,
+    "Model statistics": model_statistics_section,
+    "Cost": cost_section,
+    "Latency": latency_section,
+    "Latency distribution": latency_distribution_section,
+    "Token usage": token_usage_section,
+    "Test results": test_results_section,
+}
+DEFAULT_SECTIONS = ["Accuracy", "Model statistics", "Test results"]
 
 
 def main():
@@ -208,8 +432,7 @@ def main():
             ),
         )
 
-    # Load the detailed results only when a run is selected
-    run_data = load_results_for_run(selected_timestamp)
+    run_data = next(run for run in runs if run["timestamp"] == selected_timestamp)
 
     with col2:
         st.markdown('<div style="margin-top: 24px;">', unsafe_allow_html=True)
@@ -218,213 +441,30 @@ def main():
                 st.markdown(f"**Run By:** {run_data['run_by']}")
             if run_data.get("description"):
                 st.markdown(f"**Description:** {run_data['description']}")
-            st.markdown(f"**Total # of documents:** {run_data['total_documents']}")
+            total_documents = run_data.get("total_documents")
+            if total_documents is None:
+                total_documents = len(load_metrics_table(selected_timestamp))
+            st.markdown(f"**Total # of documents:** {total_documents}")
             st.markdown(f"**Status:** {run_data['status'].title()}")
             st.markdown(f"**Created:** {run_data['created_at']}")
             if run_data.get("completed_at"):
                 st.markdown(f"**Completed:** {run_data['completed_at']}")
 
-    results = run_data["results"]
-
-    st.header("Evaluation Metrics by Model")
-    json_df, text_df = create_accuracy_comparison_charts(results)
-    fig1 = px.bar(
-        json_df.reset_index().sort_values("JSON Accuracy", ascending=False),
-        x="Model",
-        y="JSON Accuracy",
-        title="JSON Accuracy by Model",
-        height=600,
-        color_discrete_sequence=["#636EFA"],
-    )
-    fig1.update_layout(showlegend=False)
-    fig1.update_traces(texttemplate="%{y:.1%}", textposition="outside")
-    st.plotly_chart(fig1)
-
-    fig2 = px.bar(
-        text_df.reset_index().sort_values("Text Similarity", ascending=False),
-        x="Model",
-        y="Text Similarity",
-        title="Text Similarity by Model",
-        height=600,
-        color_discrete_sequence=["#636EFA"],
-    )
-    fig2.update_layout(showlegend=False)
-    fig2.update_traces(texttemplate="%{y:.1%}", textposition="outside")
-    st.plotly_chart(fig2)
-
-    # Model Statistics Table
-    st.header("Model Performance Statistics")
-    model_stats = create_model_comparison_table(results)
-    st.dataframe(
-        model_stats.style.format(
-            {
-                "json_accuracy": "{:.2%}",
-                "text_accuracy": "{:.2%}",
-                "avg_latency": "{:.2f} s",
-                "total_cost": "${:.4f}",
-                "count": "{:.0f}",
-            }
-        )
-    )
-
-    # Cost and Latency Charts
-    st.header("Cost and Latency Analysis")
-
-    # Cost per document chart
-    cost_df = pd.DataFrame(model_stats["total_cost"] * 1000).reset_index()
-    cost_df.columns = ["Model", "Cost per 1,000 Pages"]
-    fig4 = px.bar(
-        cost_df.sort_values("Cost per 1,000 Pages", ascending=True),
-        x="Model",
-        y="Cost per 1,000 Pages",
-        title="Cost per 1,000 Pages by Model Combination",
-        height=600,
-        color_discrete_sequence=["#EE553B"],
-    )
-    fig4.update_layout(showlegend=False)
-    fig4.update_traces(texttemplate="$%{y:.2f}", textposition="outside")
-    st.plotly_chart(fig4)
-
-    # Create stacked bar chart for cost breakdown per document
-    cost_breakdown_df = pd.DataFrame(
-        {
-            "Model": model_stats.index,
-            "OCR": model_stats["ocr_cost"] * 1000,
-            "Extraction": model_stats["extraction_cost"] * 1000,
-        }
-    )
-
-    # Calculate cost per 1k documents for sorting
-    cost_breakdown_df["Total"] = (
-        cost_breakdown_df["OCR"] + cost_breakdown_df["Extraction"]
-    )
-    fig_cost = px.bar(
-        cost_breakdown_df.sort_values("Total", ascending=True),
-        x="Model",
-        y=["OCR", "Extraction"],
-        title="Cost per 1,000 Pages Breakdown by Model Combination (OCR + Extraction)",
-        height=600,
-        color_discrete_sequence=["#636EFA", "#EF553B"],
-    )
-    fig_cost.update_layout(
-        barmode="stack",
-        showlegend=True,
-        legend_title="Phase",
-        yaxis=dict(
-            title="Cost per 1,000 Pages (USD)",
-            range=[
-                0,
-                cost_breakdown_df["Total"].max() * 1.2,
-            ],
-        ),
-    )
-    fig_cost.update_traces(texttemplate="$%{y:.2f}", textposition="inside")
-    st.plotly_chart(fig_cost)
-
-    # Create stacked bar chart for latency
-    latency_df = pd.DataFrame(
-        {
-            "Model": model_stats.index,
-            "OCR": model_stats["ocr_latency"],
-            "Extraction": model_stats["extraction_latency"],
-        }
-    )
-
-    # Calculate total latency for labels
-    latency_df["Total"] = latency_df.get("OCR", 0) + latency_df.get("Extraction", 0)
-    fig5 = px.bar(
-        latency_df.sort_values("Total", ascending=True),
-        x="Model",
-        y=["OCR", "Extraction"],
-        title="Latency by Model Combination (OCR + Extraction)",
-        height=600,
-        color_discrete_sequence=["#636EFA", "#EF553B"],
-    )
-    fig5.update_layout(
-        barmode="stack",
-        showlegend=True,
-        legend_title="Phase",
-        yaxis=dict(
-            range=[
-                0,
-                latency_df["Total"].max() * 1.2,
-            ]  # Set y-axis range to 120% of max value
-        ),
+    # Sections are fragments: their controls only rerun the section itself
+    sections = st.segmented_control(
+        "Sections",
+        list(SECTIONS),
+        selection_mode="multi",
+        default=DEFAULT_SECTIONS,
+        key="metrics_sections",
     )
-    fig5.update_traces(texttemplate="%{y:.2f}s", textposition="inside")
-    st.plotly_chart(fig5)
-
-    # Total latency chart
-    total_latency_df = pd.DataFrame(
-        {
-            "Model": model_stats.index,
-            "Total Latency": model_stats["ocr_latency"]
-            + model_stats["extraction_latency"],
-        }
-    )
-    fig6 = px.bar(
-        total_latency_df.sort_values("Total Latency", ascending=True),
-        x="Model",
-        y="Total Latency",
-        title="Total Latency by Model Combination",
-        height=600,
-        color_discrete_sequence=["#636EFA"],
-    )
-    fig6.update_layout(showlegend=False)
-    fig6.update_traces(texttemplate="%{y:.2f}s", textposition="outside")
-    st.plotly_chart(fig6)
-
-    # Add new token usage chart at the bottom
-    st.header("Token Usage Analysis")
-    token_df = pd.DataFrame(
-        {
-            "Model": model_stats.index,
-            "Input Tokens": model_stats["ocr_input_tokens"],
-            "Output Tokens": model_stats["ocr_output_tokens"],
-            "Extraction Input Tokens": model_stats["extraction_input_tokens"],
-            "Extraction Output Tokens": model_stats["extraction_output_tokens"],
-        }
-    )
-
-    # Calculate total tokens for sorting
-    token_df["Total"] = (
-        token_df["Input Tokens"]
-        + token_df["Output Tokens"]
-        + token_df["Extraction Input Tokens"]
-        + token_df["Extraction Output Tokens"]
-    )
-
-    fig_tokens = px.bar(
-        token_df.sort_values("Total", ascending=True),
-        x="Model",
-        y=[
-            "Input Tokens",
-            "Output Tokens",
-            "Extraction Input Tokens",
-            "Extraction Output Tokens",
-        ],
-        title="Average Token Usage per Page by Model Combination",
-        height=600,
-        color_discrete_sequence=["#636EFA", "#EF553B", "#7B83FB", "#F76D57"],
-    )
-
-    fig_tokens.update_layout(
-        barmode="stack",
-        showlegend=True,
-        legend_title="Token Type",
-        yaxis=dict(
-            title="Number of Tokens",
-            range=[0, token_df["Total"].max() * 1.2],
-        ),
-    )
-    fig_tokens.update_traces(texttemplate="%{y:.0f}", textposition="inside")
-    st.plotly_chart(fig_tokens)
-
-    # Detailed Results Table
-    st.header("Test Results")
-    df = create_results_table(results)
-    st.dataframe(df)
+    if not sections:
+        st.info("Select the sections to display.")
+    for name in SECTIONS:
+        if name in sections:
+            SECTIONS[name](selected_timestamp)
 
 
 if __name__ == "__main__":
-    main()
+    with instrumented_page(PAGE):
+        main()
@@ -1,13 +1,22 @@
-import base64
-import requests
 import streamlit as st
-from difflib import HtmlDiff
 from utils.data_loader import (
     load_run_list,
-    load_results_for_run,
     format_timestamp,
     load_one_result,
+    load_adjacent_result_id,
+    load_model_combinations,
+    load_result_ids_page,
 )
+from utils.asset_cache import fetch_asset
+from utils.markdown_diff import get_markdown_diff
+from utils.pdf_preview import (
+    PDF_PREVIEW_WIDTH,
+    get_pdf_page_count,
+    render_pdf_page,
+)
+from utils.prefetch import PREFETCH_DEPTH, ResultPrefetcher
+from utils.debug_panel import instrumented_page
+from utils.results_table import ERROR_FILTERS
 from utils.style import SIDEBAR_STYLE
 
 
@@ -94,11 +103,18 @@ def display_file_preview(test_case, container):
     def show_pdf(url):
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            base64_pdf = base64.b64encode(response.content).decode("utf-8")
-            pdf_display = f'<iframe src="data:application/pdf;base64,{base64_pdf}" width="520" height="1000" type="application/pdf"></iframe>'
-            st.markdown(pdf_display, unsafe_allow_html=True)
+            # Only the visible page is rasterized and sent to the browser
+            page_count = get_pdf_page_count(url)
+            page_number = 1
+            if page_count > 1:
+                page_number = st.number_input(
+                    f"Page (of {page_count})",
+                    min_value=1,
+                    max_value=page_count,
+                    value=1,
+                    key=f"pdf_page_{url}",
+                )
+            st.image(render_pdf_page(url, page_number - 1), width=PDF_PREVIEW_WIDTH)
         except Exception as e:
             st.error(f"Failed to load PDF: {str(e)}")
             st.markdown(f"You can [view the PDF directly]({url}) in a new tab.")
@@ -110,25 +126,20 @@ def display_file_preview(test_case, container):
             with container:
                 show_pdf(file_url)
         else:
-            container.image(file_url, width=700)
+            try:
+                container.image(fetch_asset(file_url), width=700)
+            except Exception as e:
+                container.error(f"Failed to load image: {str(e)}")
+                container.markdown(f"You can [view the image directly]({file_url}).")
     else:
         container.warning("No file preview available")
 
 
-def display_markdown_diff(test_case):
+def display_markdown_diff(test_case, timestamp):
     """Display markdown differences in a side-by-side view"""
     if "trueMarkdown" in test_case and "predictedMarkdown" in test_case:
         st.subheader("Markdown Differences")
 
-        # Create HTML diff
-        differ = HtmlDiff()
-        diff_html = differ.make_file(
-            test_case["trueMarkdown"].splitlines(),
-            test_case["predictedMarkdown"].splitlines(),
-            fromdesc="True Markdown",
-            todesc="Predicted Markdown",
-        )
-
         # Display side-by-side view
         st.markdown("### Side by Side Comparison")
         cols = st.columns(2)
@@ -141,9 +152,21 @@ def display_markdown_diff(test_case):
                 "", test_case["predictedMarkdown"], height=400, key="predicted_markdown"
             )
 
-        # Display HTML diff (optional, behind expander)
-        with st.expander("View HTML Diff"):
-            st.components.v1.html(diff_html, height=600, scrolling=True)
+        # Display line diff (optional, only computed when toggled on)
+        if st.toggle("Show line diff", key="show_markdown_diff"):
+            diff = get_markdown_diff(
+                timestamp,
+                test_case["id"],
+                test_case["trueMarkdown"],
+                test_case["predictedMarkdown"],
+            )
+            st.caption(f"{diff['removed']} lines removed, {diff['added']} lines added")
+            if diff["truncated"]:
+                st.warning(
+                    "The documents differ too much to align within the diff budget; "
+                    "the differing region is shown as a single block."
+                )
+            st.components.v1.html(diff["html"], height=600, scrolling=True)
 
 
 def main():
@@ -165,36 +188,44 @@ def main():
             format_func=format_timestamp,
         )
 
-    # Load minimal results for the selected run (just for the dropdown)
-    run_data = load_results_for_run(selected_timestamp, include_metrics_only=True)
-
-    # Get all test cases
-    all_test_cases = run_data.get("results", [])
+    # 2. Filter which test cases to browse
+    model_combinations = load_model_combinations(selected_timestamp)
+    models_by_label = {model["label"]: model for model in model_combinations}
+    filter_cols = st.columns([2, 1, 1])
+    with filter_cols[0]:
+        model_label = st.selectbox(
+            "Model Combination", ["All"] + list(models_by_label.keys())
+        )
+    with filter_cols[1]:
+        error_filter = st.selectbox("Errors", list(ERROR_FILTERS.keys()))
+    with filter_cols[2]:
+        st.markdown('<div style="margin-top: 32px;">', unsafe_allow_html=True)
+        only_with_diffs = st.checkbox("Only cases with differences", value=True)
+
+    filters = {
+        "only_with_diffs": only_with_diffs,
+        "has_error": ERROR_FILTERS[error_filter],
+        "model_combination": models_by_label.get(model_label),
+    }
 
-    # Filter out None values and then filter for diffs
-    all_test_cases = [test for test in all_test_cases if test is not None]
+    # Reset pagination whenever the run or the filters change
+    filter_key = (selected_timestamp, model_label, error_filter, only_with_diffs)
+    if st.session_state.get("test_filter_key") != filter_key:
+        st.session_state.test_filter_key = filter_key
+        st.session_state.test_page_anchor = {}
+        st.session_state.selected_result_id = None
 
-    # 2. Filter test cases for ones that have a non-empty JSON diff
-    results_with_diffs = [
-        test
-        for test in all_test_cases
-        if isinstance(test, dict)
-        and isinstance(test.get("jsonDiffStats"), dict)
-        and test["jsonDiffStats"].get("total", 0) > 0
-    ]
+    # 3. Fetch only the current page of matching test case ids
+    page_ids = load_result_ids_page(
+        selected_timestamp, **st.session_state.test_page_anchor, **filters
+    )
 
-    if not results_with_diffs:
-        st.warning("No test cases have JSON differences for this run.")
+    if not page_ids:
+        st.warning("No test cases match the selected filters for this run.")
         return
 
-    # 3. Build the dropdown items from only those filtered test cases
-    test_case_labels = {
-        f"{test['id']}": idx for idx, test in enumerate(results_with_diffs)
-    }
-
-    # Initialize session state for selected index if it doesn't exist
-    if "selected_test_idx" not in st.session_state:
-        st.session_state.selected_test_idx = 0
+    if st.session_state.selected_result_id not in page_ids:
+        st.session_state.selected_result_id = page_ids[0]
 
     with col2:
         # Create a row for the dropdown and navigation buttons
@@ -202,23 +233,35 @@ def main():
 
         with dropdown_col:
             # Update session state when dropdown changes
-            selected_test_id = st.selectbox(
-                "Select Test Case (Only Cases with Differences)",
-                options=list(test_case_labels.keys()),
+            selected_result_id = st.selectbox(
+                "Select Test Case",
+                options=page_ids,
                 format_func=lambda x: f"{x}",
-                index=st.session_state.selected_test_idx,
+                index=page_ids.index(st.session_state.selected_result_id),
             )
-            st.session_state.selected_test_idx = test_case_labels[selected_test_id]
+            st.session_state.selected_result_id = selected_result_id
+
+        position = page_ids.index(selected_result_id)
 
         with nav_col_1:
             st.write(
                 '<div style="display: flex; justify-content: center; align-items: center;">',
                 unsafe_allow_html=True,
             )
-            # Add navigation buttons
+            # Neighbors outside the current page are fetched on demand
             if st.button("←"):
-                if st.session_state.selected_test_idx > 0:
-                    st.session_state.selected_test_idx -= 1
+                if position > 0:
+                    previous_id = page_ids[position - 1]
+                else:
+                    previous_id = load_adjacent_result_id(
+                        selected_timestamp, selected_result_id, False, **filters
+                    )
+                    if previous_id is not None:
+                        st.session_state.test_page_anchor = {
+                            "before_id": selected_result_id
+                        }
+                if previous_id is not None:
+                    st.session_state.selected_result_id = previous_id
                     st.rerun()
 
         with nav_col_2:
@@ -227,13 +270,31 @@ def main():
                 unsafe_allow_html=True,
             )
             if st.button("→"):
-                if st.session_state.selected_test_idx < len(results_with_diffs) - 1:
-                    st.session_state.selected_test_idx += 1
+                if position < len(page_ids) - 1:
+                    next_id = page_ids[position + 1]
+                else:
+                    next_id = load_adjacent_result_id(
+                        selected_timestamp, selected_result_id, True, **filters
+                    )
+                    if next_id is not None:
+                        st.session_state.test_page_anchor = {
+                            "after_id": selected_result_id
+                        }
+                if next_id is not None:
+                    st.session_state.selected_result_id = next_id
                     st.rerun()
 
-    # 4. Load only the selected test case
-    selected_result_id = results_with_diffs[st.session_state.selected_test_idx]["id"]
-    detailed_data = load_one_result(selected_timestamp, selected_result_id)
+    # 4. Load only the selected test case, then warm its neighbours
+    if "result_prefetcher" not in st.session_state:
+        st.session_state.result_prefetcher = ResultPrefetcher(load_one_result)
+    prefetcher = st.session_state.result_prefetcher
+
+    detailed_data = prefetcher.get(selected_timestamp, selected_result_id)
+    prefetcher.prefetch(
+        selected_timestamp,
+        page_ids[position + 1 : position + 1 + PREFETCH_DEPTH]
+        + page_ids[max(position - PREFETCH_DEPTH, 0) : position][::-1],
+    )
     test_case = detailed_data["result"]
 
     # Display run metadata if available
@@ -268,8 +329,9 @@ def main():
 
     # Display markdown diff at the bottom
     st.markdown("---")  # Add a separator
-    display_markdown_diff(test_case)
+    display_markdown_diff(test_case, selected_timestamp)
 
 
 if __name__ == "__main__":
-    main()
+    with instrumented_page("Test Results"):
+        main()
@@ -0,0 +1,112 @@
+import streamlit as st
+import plotly.express as px
+import pandas as pd
+
+from utils.debug_panel import instrumented_page
+from utils.rollups import load_rollups
+from utils.style import SIDEBAR_STYLE
+
+st.set_page_config(page_title="Trends", layout="wide")
+st.markdown(SIDEBAR_STYLE, unsafe_allow_html=True)
+
+# Trend metrics mapped to their rollup column, scale and axis/table formats
+TREND_METRICS = {
+    "JSON Accuracy": ("json_accuracy_all", 1, ".1%", "{:.2%}"),
+    "Text Similarity": ("text_accuracy", 1, ".1%", "{:.2%}"),
+    "Cost per 1,000 Pages": ("total_cost", 1000, "$.2f", "${:.2f}"),
+    "OCR Latency (s)": ("ocr_latency", 1, ".2f", "{:.2f} s"),
+    "Extraction Latency (s)": ("extraction_latency", 1, ".2f", "{:.2f} s"),
+}
+
+
+def create_trend_table(rollups, metric):
+    """Create a DataFrame of one metric per run (rows) and model (columns)"""
+    column, scale, _, _ = TREND_METRICS[metric]
+    return (
+        rollups.pivot_table(
+            index="run_time", columns="model", values=column, aggfunc="last"
+        )
+        * scale
+    )
+
+
+def create_latest_change_table(trend_df):
+    """Create a DataFrame with each model's latest value and change since its previous run"""
+    rows = []
+    for model in trend_df.columns:
+        values = trend_df[model].dropna()
+        if values.empty:
+            continue
+        rows.append(
+            {
+                "Model": model,
+                "Runs": len(values),
+                "Latest Run": values.index[-1],
+                "Latest": values.iloc[-1],
+                "Change": (
+                    values.iloc[-1] - values.iloc[-2] if len(values) > 1 else None
+                ),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def main():
+    st.title("Trends")
+
+    with st.spinner("Updating run rollups..."):
+        rollups = load_rollups()
+
+    if rollups.empty:
+        st.warning("No completed benchmark runs found.")
+        return
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        metric = st.selectbox("Metric", list(TREND_METRICS.keys()))
+    with col2:
+        models = sorted(rollups["model"].unique())
+        latest_models = rollups.loc[
+            rollups["run_time"] == rollups["run_time"].max(), "model"
+        ].tolist()
+        selected_models = st.multiselect(
+            "Model Combinations", models, default=latest_models
+        )
+
+    if not selected_models:
+        st.info("Select at least one model combination.")
+        return
+
+    trend_df = create_trend_table(
+        rollups[rollups["model"].isin(selected_models)], metric
+    )
+    _, _, tick_format, value_format = TREND_METRICS[metric]
+
+    fig = px.line(
+        trend_df.reset_index()
+        .melt(id_vars="run_time", var_name="Model", value_name=metric)
+        .dropna(),
+        x="run_time",
+        y=metric,
+        color="Model",
+        markers=True,
+        title=f"{metric} by Run",
+        height=600,
+    )
+    fig.update_layout(xaxis_title="Run", yaxis_tickformat=tick_format)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.header("Latest Results")
+    change_df = create_latest_change_table(trend_df)
+    st.dataframe(
+        change_df.style.format(
+            {"Latest": value_format, "Change": value_format}, na_rep=""
+        ),
+        hide_index=True,
+    )
+    st.caption(f"{rollups['timestamp'].nunique()} completed runs")
+
+
+if __name__ == "__main__":
+    with instrumented_page("Trends"):
+        main()
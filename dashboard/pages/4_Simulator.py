@@ -0,0 +1,131 @@
+import streamlit as st
+import plotly.express as px
+from datetime import datetime
+
+from utils.aggregation import model_combination_labels
+from utils.data_loader import load_run_list, load_metrics_table
+from utils.debug_panel import instrumented_page
+from utils.simulation import concurrency_sweep, simulate_run
+from utils.style import SIDEBAR_STYLE
+
+st.set_page_config(page_title="Throughput Simulator", layout="wide")
+st.markdown(SIDEBAR_STYLE, unsafe_allow_html=True)
+
+# Concurrency levels plotted by the sweep chart
+SWEEP_LEVELS = [1, 2, 5, 10, 20, 30, 50, 75, 100]
+
+
+def create_simulation_table(simulation):
+    """Create a display DataFrame from the simulation results"""
+    return simulation.rename(
+        columns={
+            "concurrency": "Concurrency",
+            "documents": "Documents",
+            "makespan": "Total Time (s)",
+            "throughput": "Docs / min",
+            "queue_delay_mean": "Mean Queue Delay (s)",
+            "queue_delay_p95": "P95 Queue Delay (s)",
+            "utilization": "Utilization",
+            "cost_per_hour": "Cost / hour ($)",
+        }
+    )
+
+
+def main():
+    st.title("Throughput Simulator")
+    st.markdown(
+        "Replays the recorded OCR and extraction durations of a run through a "
+        "concurrency and rate limit to estimate throughput, queueing delay and "
+        "cost per hour of each model combination."
+    )
+
+    runs = load_run_list()
+    if not runs:
+        st.warning("No benchmark runs found.")
+        return
+
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        selected_timestamp = st.selectbox(
+            "Select Test Run",
+            [run["timestamp"] for run in runs],
+            format_func=lambda x: datetime.strptime(x, "%Y-%m-%d-%H-%M-%S").strftime(
+                "%Y-%m-%d %H:%M:%S"
+            ),
+        )
+    with col2:
+        concurrency = st.number_input(
+            "Concurrency (0 = benchmark limits)", min_value=0, value=0, step=1
+        )
+    with col3:
+        rate_limit = st.number_input(
+            "Rate limit (requests/min, 0 = none)", min_value=0, value=0, step=10
+        )
+    with col4:
+        arrival_rate = st.number_input(
+            "Arrival rate (docs/min, 0 = all at once)", min_value=0, value=0, step=10
+        )
+
+    metrics = load_metrics_table(selected_timestamp)
+    simulation = simulate_run(metrics, int(concurrency), arrival_rate, rate_limit)
+    if simulation.empty:
+        st.warning("No successful tests with recorded durations in this run.")
+        return
+
+    fig = px.bar(
+        simulation["throughput"].sort_values().reset_index(),
+        x="Model Combination",
+        y="throughput",
+        title="Simulated Throughput by Model Combination",
+        height=600,
+    )
+    fig.update_layout(yaxis_title="Documents per minute")
+    fig.update_traces(texttemplate="%{y:.1f}", textposition="outside")
+    st.plotly_chart(fig)
+
+    st.dataframe(
+        create_simulation_table(simulation).style.format(
+            {
+                "Total Time (s)": "{:.1f}",
+                "Docs / min": "{:.1f}",
+                "Mean Queue Delay (s)": "{:.2f}",
+                "P95 Queue Delay (s)": "{:.2f}",
+                "Utilization": "{:.0%}",
+                "Cost / hour ($)": "${:.2f}",
+            }
+        )
+    )
+
+    st.header("Concurrency Sweep")
+    selected_models = st.multiselect(
+        "Model Combinations",
+        simulation.index.tolist(),
+        default=simulation.index.tolist()[:5],
+    )
+    if selected_models:
+        selected_metrics = metrics[
+            model_combination_labels(metrics).isin(selected_models)
+        ]
+        sweep = concurrency_sweep(
+            selected_metrics, SWEEP_LEVELS, arrival_rate, rate_limit
+        )
+        metric = st.radio(
+            "Metric", ["Docs / min", "Mean Queue Delay (s)"], horizontal=True
+        )
+        column = "throughput" if metric == "Docs / min" else "queue_delay_mean"
+        fig = px.line(
+            sweep,
+            x="concurrency",
+            y=column,
+            color="Model Combination",
+            markers=True,
+            title=f"{metric} by Concurrency",
+            height=600,
+        )
+        fig.update_layout(xaxis_title="Concurrency", yaxis_title=metric)
+        st.plotly_chart(fig)
+
+
+if __name__ == "__main__":
+    with instrumented_page("Throughput Simulator"):
+        main()
@@ -0,0 +1,131 @@
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
+from datetime import datetime
+
+from utils.data_loader import load_run_list, load_metrics_table
+from utils.debug_panel import instrumented_page
+from utils.style import SIDEBAR_STYLE
+from utils.timeline import (
+    achieved_concurrency,
+    concurrency_over_time,
+    gantt_segments,
+    request_timeline,
+)
+
+st.set_page_config(page_title="Timeline", layout="wide")
+st.markdown(SIDEBAR_STYLE, unsafe_allow_html=True)
+
+PHASE_COLORS = {"OCR": "#636EFA", "Extraction": "#EF553B"}
+
+
+def create_gantt_chart(segments, title):
+    """Create a Gantt chart with one line per request phase and one row per pool slot"""
+    fig = go.Figure()
+    for phase, color in PHASE_COLORS.items():
+        rows = segments[segments["phase"] == phase]
+        if rows.empty:
+            continue
+        # One trace per phase: segments are separated by gaps (NaN)
+        x = np.column_stack(
+            [rows["start"], rows["end"], np.full(len(rows), np.nan)]
+        ).ravel()
+        y = np.repeat(rows["lane"].to_numpy(dtype=float), 3)
+        y[2::3] = np.nan
+        fig.add_trace(
+            go.Scattergl(
+                x=x, y=y, mode="lines", name=phase, line=dict(color=color, width=4)
+            )
+        )
+    fig.update_layout(
+        title=title,
+        xaxis_title="Seconds since run start",
+        yaxis_title="Pool slot",
+        height=600,
+    )
+    return fig
+
+
+def main():
+    st.title("Timeline")
+
+    runs = load_run_list()
+    if not runs:
+        st.warning("No benchmark runs found.")
+        return
+
+    selected_timestamp = st.selectbox(
+        "Select Test Run",
+        [run["timestamp"] for run in runs],
+        format_func=lambda x: datetime.strptime(x, "%Y-%m-%d-%H-%M-%S").strftime(
+            "%Y-%m-%d %H:%M:%S"
+        ),
+    )
+
+    timeline = request_timeline(load_metrics_table(selected_timestamp))
+    if timeline.empty:
+        st.warning(
+            "This run has no recorded request start and end times. They are "
+            "recorded by benchmark runs from this version on."
+        )
+        return
+
+    # Achieved vs configured concurrency
+    st.header("Achieved Concurrency")
+    achieved = achieved_concurrency(timeline)
+    st.dataframe(
+        achieved.rename(
+            columns={
+                "requests": "Requests",
+                "configured": "Configured",
+                "mean": "Mean In Flight",
+                "peak": "Peak In Flight",
+                "saturation": "Saturation",
+                "wall_time": "Wall Time (s)",
+            }
+        ).style.format(
+            {
+                "Mean In Flight": "{:.1f}",
+                "Saturation": "{:.0%}",
+                "Wall Time (s)": "{:.1f}",
+            }
+        )
+    )
+
+    # Concurrency over time, downsampled to a fixed number of buckets
+    profile = concurrency_over_time(timeline)
+    statistic = st.radio("Concurrency", ["Mean", "Peak"], horizontal=True)
+    fig = px.line(
+        profile,
+        x="time",
+        y=statistic.lower(),
+        color="Model Combination",
+        line_shape="hv",
+        title=f"{statistic} Requests In Flight Over Time",
+        height=600,
+    )
+    fig.update_layout(
+        xaxis_title="Seconds since run start", yaxis_title="Requests in flight"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Per-request Gantt chart of one model combination
+    st.header("Requests")
+    model = st.selectbox("Model Combination", achieved.index.tolist())
+    requests = timeline[timeline["Model Combination"] == model]
+    segments, step = gantt_segments(requests)
+    st.plotly_chart(
+        create_gantt_chart(segments, f"{model} Requests by Pool Slot"),
+        use_container_width=True,
+    )
+    if step > 1:
+        st.caption(
+            f"Showing 1 in {step} of {len(requests):,} requests; "
+            "the concurrency chart above covers all of them."
+        )
+
+
+if __name__ == "__main__":
+    with instrumented_page("Timeline"):
+        main()
@@ -0,0 +1,175 @@
+import streamlit as st
+import plotly.express as px
+
+from utils.comparison import (
+    COMPARISON_METRICS,
+    DOCUMENT_METRICS,
+    compare_model_stats,
+    document_changes,
+    document_regressions,
+    summarize_document_changes,
+)
+from utils.data_loader import (
+    format_timestamp,
+    load_document_comparison,
+    load_model_stats,
+    load_run_list,
+)
+from utils.debug_panel import instrumented_fragment, instrumented_page
+from utils.style import SIDEBAR_STYLE
+
+PAGE = "Compare Runs"
+
+st.set_page_config(page_title=PAGE, layout="wide")
+st.markdown(SIDEBAR_STYLE, unsafe_allow_html=True)
+
+# Table formats of the compared metrics
+METRIC_FORMATS = {
+    "JSON Accuracy": "{:.2%}",
+    "Text Similarity": "{:.2%}",
+    "Cost per 1,000 Pages": "${:.2f}",
+    "OCR Latency (s)": "{:.2f} s",
+    "Extraction Latency (s)": "{:.2f} s",
+    "Tokens per Page": "{:,.0f}",
+    "Total Cost": "${:.4f}",
+    "Duration (ms)": "{:,.0f}",
+}
+
+# Regressed documents listed at most
+MAX_REGRESSIONS = 500
+
+
+def create_delta_table(comparison, metric):
+    """Create a DataFrame of one metric's baseline, value and delta per run and model"""
+    return (
+        comparison[comparison["Metric"] == metric]
+        .drop(columns="Metric")
+        .sort_values(["Run", "Delta"])
+    )
+
+
+@st.fragment
+@instrumented_fragment(PAGE, "Document regressions")
+def document_regressions_section(baseline, timestamps):
+    """Display documents that got worse between the baseline and a compared run"""
+    st.header("Document Regressions")
+    cols = st.columns([2, 2, 1])
+    with cols[0]:
+        timestamp = st.selectbox(
+            "Compared Run", timestamps, format_func=format_timestamp
+        )
+    with cols[1]:
+        metric = st.selectbox("Document Metric", list(DOCUMENT_METRICS.keys()))
+    _, higher_is_better, default_threshold, step = DOCUMENT_METRICS[metric]
+    with cols[2]:
+        # Keyed per metric, as each metric has its own units
+        threshold = st.number_input(
+            "Threshold",
+            min_value=0.0,
+            value=default_threshold,
+            step=step,
+            format="%g",
+            key=f"threshold_{metric}",
+        )
+
+    joined = load_document_comparison(baseline, timestamp)
+    if joined.empty:
+        st.warning("The runs have no documents tested with the same models.")
+        return
+
+    changes = document_changes(joined, metric, threshold)
+    st.dataframe(
+        summarize_document_changes(changes).style.format(
+            {"Mean Delta": METRIC_FORMATS[metric]}
+        )
+    )
+
+    regressions = document_regressions(changes, higher_is_better, MAX_REGRESSIONS)
+    regressed = int(changes["Regressed"].sum())
+    caption = f"{regressed:,} of {len(changes):,} matched documents regressed"
+    if regressed > MAX_REGRESSIONS:
+        caption += f", showing the worst {MAX_REGRESSIONS:,}"
+    st.caption(caption)
+    st.dataframe(
+        regressions.style.format(
+            {
+                "Baseline": METRIC_FORMATS[metric],
+                "Value": METRIC_FORMATS[metric],
+                "Delta": METRIC_FORMATS[metric],
+            },
+            na_rep="",
+        ),
+        hide_index=True,
+    )
+
+
+def main():
+    st.title(PAGE)
+
+    runs = load_run_list()
+    timestamps = [run["timestamp"] for run in runs]
+    completed = sorted(
+        (run["timestamp"] for run in runs if run["status"] == "completed"),
+        reverse=True,
+    )
+    if len(timestamps) < 2:
+        st.warning("At least two benchmark runs are needed for a comparison.")
+        return
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected = st.multiselect(
+            "Runs",
+            timestamps,
+            default=completed[:2] if len(completed) >= 2 else timestamps[:2],
+            format_func=format_timestamp,
+        )
+    if len(selected) < 2:
+        st.info("Select at least two runs.")
+        return
+    selected = sorted(selected)
+    with col2:
+        baseline = st.selectbox("Baseline", selected, format_func=format_timestamp)
+    others = [timestamp for timestamp in selected if timestamp != baseline]
+
+    # Per-model deltas from each run's cached aggregates
+    st.header("Model Deltas")
+    comparison = compare_model_stats(
+        {timestamp: load_model_stats(timestamp) for timestamp in selected}, baseline
+    )
+    metric = st.selectbox("Metric", list(COMPARISON_METRICS.keys()))
+    delta_df = create_delta_table(comparison, metric)
+    delta_df["Run"] = delta_df["Run"].map(format_timestamp)
+
+    fig = px.bar(
+        delta_df.dropna(subset=["Delta"]),
+        x="Model",
+        y="Delta",
+        color="Run",
+        barmode="group",
+        title=f"{metric} Change vs. {format_timestamp(baseline)}",
+        height=600,
+    )
+    fig.update_layout(yaxis_title=f"{metric} Delta")
+    st.plotly_chart(fig)
+
+    value_format = METRIC_FORMATS[metric]
+    st.dataframe(
+        delta_df.style.format(
+            {
+                "Baseline": value_format,
+                "Value": value_format,
+                "Delta": value_format,
+                "Change": "{:+.1%}",
+            },
+            na_rep="",
+        ),
+        hide_index=True,
+    )
+
+    document_regressions_section(baseline, others)
+
+
+if __name__ == "__main__":
+    with instrumented_page(PAGE):
+        main()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Dashboard modules are imported as ``utils.*``, as when Streamlit runs a page
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
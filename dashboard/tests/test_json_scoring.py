@@ -0,0 +1,161 @@
+import pytest
+
+from utils.json_scoring import (
+    calculate_json_accuracy,
+    count_changes,
+    count_total_fields,
+    json_diff,
+)
+
+# Cases mirrored from tests/evaluation/json.test.ts
+
+
+@pytest.mark.parametrize(
+    "obj, expected",
+    [
+        # Counts fields in nested objects including array elements
+        ({"a": 1, "b": {"c": 2, "d": [3, {"e": 4}]}}, 4),
+        # Counts array elements as individual fields
+        ({"a": [1, 2, 3], "b": "test", "c": True}, 5),
+        # Counts nested objects within arrays
+        ({"a": [{"b": 1}, {"c": 2}], "d": "test", "e": True}, 4),
+        # Includes null values in field count
+        ({"a": None, "b": {"c": None}, "d": "test"}, 3),
+        # Excludes fields with __diff metadata suffixes
+        ({"a": 1, "b__deleted": True, "c__added": "test", "d": {"e": 2}}, 2),
+    ],
+)
+def test_count_total_fields(obj, expected):
+    assert count_total_fields(obj) == expected
+
+
+@pytest.mark.parametrize(
+    "actual, predicted, expected",
+    [
+        # Half of the fields match
+        ({"a": 1, "b": 2}, {"a": 1, "b": 3}, 0.5),
+        # Nested objects
+        (
+            {"a": 1, "b": {"c": 2, "d": 4, "e": 4}},
+            {"a": 1, "b": {"c": 2, "d": 4, "e": 5}},
+            0.75,
+        ),
+        # Nested arrays and objects
+        (
+            {"a": 1, "b": [{"c": 2, "d": 4, "e": 4, "f": [2, 9]}]},
+            {"a": 1, "b": [{"c": 2, "d": 4, "e": 5, "f": [2, 3]}]},
+            0.5,
+        ),
+        # Array elements match regardless of order
+        (
+            {"a": 1, "b": [{"c": 1, "d": 2}, {"c": 3, "d": 4}]},
+            {"a": 1, "b": [{"c": 3, "d": 4}, {"c": 1, "d": 2}]},
+            1,
+        ),
+        # Every array element is unmatched when the predicted array is null
+        ({"a": 1, "b": [1, 2, 3]}, {"a": 1, "b": None}, 0.25),
+        (
+            {"a": 1, "b": [{"c": 1, "d": 1}, {"c": 2}, {"c": 3, "e": 4}]},
+            {"a": 1, "b": None},
+            round(1 / 6, 4),
+        ),
+        # Null fields in the predicted object are partial matches
+        (
+            {"a": 1, "b": {"c": 1, "d": {"e": 1, "f": 2}}},
+            {"a": 1, "b": {"c": 1, "d": None}},
+            0.5,
+        ),
+        # Null value comparisons
+        ({"a": [{"b": 1, "c": None}]}, {"a": [{"b": 1, "c": 2}]}, 0.5),
+        (
+            {"a": [{"b": 1, "c": None, "f": 4}]},
+            {"a": [{"b": 1, "c": {"d": 2}, "f": 4}]},
+            0.6667,
+        ),
+        (
+            {"a": [{"b": 1, "c": None, "f": 4}]},
+            {"a": [{"b": 1, "c": {"d": 2, "e": 3}, "f": 4}]},
+            0.3333,
+        ),
+        (
+            {"a": [{"b": 1, "c": None, "f": 4}]},
+            {"a": [{"b": 1, "c": [3], "f": 4}]},
+            0.6667,
+        ),
+        ({"a": [{"b": 1, "c": 2}]}, {"a": [{"b": 1, "c": None}]}, 0.5),
+        ({"a": [{"b": 1, "c": {"d": 2}}]}, {"a": [{"b": 1, "c": None}]}, 0.5),
+        (
+            {"a": [{"b": 1, "c": {"d": 2, "e": 3}}]},
+            {"a": [{"b": 1, "c": None}]},
+            0.3333,
+        ),
+        ({"a": [{"b": 1, "c": [3, 2]}]}, {"a": [{"b": 1, "c": None}]}, 0.3333),
+    ],
+)
+def test_calculate_json_accuracy(actual, predicted, expected):
+    assert calculate_json_accuracy(actual, predicted)["score"] == expected
+
+
+@pytest.mark.parametrize(
+    "diff, expected",
+    [
+        # Additions and deletions of scalars and objects
+        ({"b__added": 2, "c__deleted": {"x": 1, "y": 2}}, (1, 2, 0)),
+        # A modified scalar
+        ({"a": {"__old": 1, "__new": 2}}, (0, 0, 1)),
+        # Null replaced by an object counts the new object's fields
+        ({"a": {"__old": None, "__new": {"x": 1, "y": 2}}}, (0, 0, 2)),
+        # Nested arrays: unchanged, deleted, added and modified elements
+        (
+            {
+                "a": [
+                    [" "],
+                    ["-", 2],
+                    ["+", {"x": 1, "y": 1}],
+                    ["~", {"z": {"__old": 1, "__new": 2}}],
+                ]
+            },
+            (2, 1, 1),
+        ),
+    ],
+)
+def test_count_changes(diff, expected):
+    changes = count_changes(diff)
+    assert (
+        changes["additions"],
+        changes["deletions"],
+        changes["modifications"],
+    ) == expected
+    assert changes["total"] == sum(expected)
+
+
+def test_json_diff_formats():
+    assert json_diff({"a": 1}, {"a": 1}) is None
+    assert json_diff({"a": 1}, {"a": 2}) == {"a": {"__old": 1, "__new": 2}}
+    assert json_diff({"a": 1}, {"a": 1, "b": 2}) == {"b__added": 2}
+    assert json_diff({"a": 1, "b": {"x": 1}}, {"a": 1}) == {"b__deleted": {"x": 1}}
+    assert json_diff([1, 2], [1, 3]) == [[" "], ["-", 2], ["+", 3]]
+
+
+def test_calculate_json_accuracy_result():
+    result = calculate_json_accuracy({"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 3]})
+    assert result["totalFields"] == 3
+    assert result["jsonDiffStats"] == {
+        "additions": 1,
+        "deletions": 1,
+        "modifications": 0,
+        "total": 2,
+    }
+    assert result["score"] == 0.3333
+
+    identical = calculate_json_accuracy({"a": 1}, {"a": 1})
+    assert identical["score"] == 1
+    assert identical["jsonDiff"] == {}
+    assert identical["totalFields"] == 1
+
+
+def test_calculate_json_accuracy_ignore_cases():
+    assert calculate_json_accuracy({"a": "x"}, {"a": "X"})["score"] == 0
+    assert (
+        calculate_json_accuracy({"a": "x"}, {"a": "X"}, ignore_cases=True)["score"] == 1
+    )
@@ -0,0 +1,89 @@
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from utils.markdown_diff import diff_lines
+
+
+def apply_opcodes(a, b, opcodes):
+    """Rebuild b from a and the opcodes, checking they cover both sides"""
+    i = j = 0
+    rebuilt = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j)
+        assert (i1 < i2, j1 < j2) == {
+            "equal": (True, True),
+            "replace": (True, True),
+            "delete": (True, False),
+            "insert": (False, True),
+        }[tag]
+        if tag == "equal":
+            assert a[i1:i2] == b[j1:j2]
+        rebuilt += b[j1:j2]
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b))
+    return rebuilt
+
+
+def matched_lines(opcodes):
+    return sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        ([], []),
+        ([], ["x"]),
+        (["x"], []),
+        (["a", "b", "c"], ["a", "b", "c"]),
+        (["a", "b", "c"], ["a", "x", "c"]),
+        (["a", "b", "c", "d"], ["a", "c", "d", "e"]),
+        (["a", "b"], ["x", "y"]),
+    ],
+)
+def test_diff_lines_matches_difflib(a, b):
+    opcodes, truncated = diff_lines(a, b)
+    assert not truncated
+    assert opcodes == SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+
+
+def test_diff_lines_random():
+    rng = random.Random(0)
+    for _ in range(500):
+        a = [rng.choice("abcde") for _ in range(rng.randint(0, 30))]
+        b = [rng.choice("abcde") for _ in range(rng.randint(0, 30))]
+        opcodes, truncated = diff_lines(a, b)
+        assert not truncated
+        assert apply_opcodes(a, b, opcodes) == b
+        # A shortest edit script keeps at least as many lines as difflib
+        reference = SequenceMatcher(None, a, b, autojunk=False).get_opcodes()
+        assert matched_lines(opcodes) >= matched_lines(reference)
+
+
+def test_diff_lines_truncated_on_max_edits():
+    # One shared line in the middle needs 100 edits to align
+    a = ["head"] + [f"a{i}" for i in range(50)] + ["shared"] + ["a"] + ["tail"]
+    b = ["head"] + [f"b{i}" for i in range(50)] + ["shared"] + ["b"] + ["tail"]
+    opcodes, truncated = diff_lines(a, b, max_edits=10)
+    assert truncated
+    assert opcodes == [
+        ("equal", 0, 1, 0, 1),
+        ("replace", 1, 53, 1, 53),
+        ("equal", 53, 54, 53, 54),
+    ]
+
+    opcodes, truncated = diff_lines(a, b)
+    assert not truncated
+    assert apply_opcodes(a, b, opcodes) == b
+    assert matched_lines(opcodes) == 3
+
+
+def test_diff_lines_truncated_on_timeout_and_max_lines():
+    a = ["x", "a", "shared", "b", "y"]
+    b = ["x", "c", "shared", "d", "y"]
+    for kwargs in ({"timeout": -1}, {"max_lines": 2}):
+        opcodes, truncated = diff_lines(a, b, **kwargs)
+        assert truncated
+        assert apply_opcodes(a, b, opcodes) == b
+        assert matched_lines(opcodes) == 2
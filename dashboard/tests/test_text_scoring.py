@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from utils.text_scoring import error_rate, levenshtein, text_similarity
+
+
+def naive_levenshtein(a, b):
+    """Textbook dynamic programming edit distance"""
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y))
+            )
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ("", "", 0),
+        ("", "abc", 3),
+        ("abc", "", 3),
+        ("abc", "abc", 0),
+        ("kitten", "sitting", 3),
+        ("flaw", "lawn", 2),
+        (["the", "cat"], ["the", "hat"], 1),
+    ],
+)
+def test_levenshtein(a, b, expected):
+    assert levenshtein(a, b) == expected
+
+
+@pytest.mark.parametrize("max_length", [10, 64, 200])
+def test_levenshtein_matches_naive(max_length):
+    # Lengths around and above 64 cover bit vectors wider than a machine word
+    rng = random.Random(max_length)
+    for _ in range(200):
+        a = "".join(rng.choice("abcd") for _ in range(rng.randint(0, max_length)))
+        b = "".join(rng.choice("abcd") for _ in range(rng.randint(0, max_length)))
+        assert levenshtein(a, b) == naive_levenshtein(a, b)
+
+
+def test_levenshtein_long_strings():
+    rng = random.Random(0)
+    a = "".join(rng.choice("ab \n") for _ in range(1000))
+    b = "".join(rng.choice("ab \n") for _ in range(700)) + a[:200]
+    assert levenshtein(a, b) == naive_levenshtein(a, b)
+
+
+def test_text_similarity():
+    assert text_similarity("same", "same") == 1.0
+    assert text_similarity("", "text") == 0.0
+    assert text_similarity("text", "") == 0.0
+    # Compared lowercased and stripped
+    assert text_similarity(" Text ", "text") == 1.0
+    assert text_similarity("kitten", "sitting") == round(1 - 3 / 7, 4)
+
+
+def test_error_rate():
+    assert error_rate("", "") == 0.0
+    assert error_rate("", "a") == 1.0
+    assert error_rate("abcd", "abed") == 0.25
+    assert error_rate("a b c".split(), "a c".split()) == pytest.approx(1 / 3)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from utils.instrumentation import instrumented
+
+# Columns of create_model_comparison_table, in display order
+MODEL_COMPARISON_COLUMNS = [
+    "count",
+    "json_accuracy",
+    "text_accuracy",
+    "total_cost",
+    "ocr_cost",
+    "extraction_cost",
+    "ocr_latency",
+    "extraction_latency",
+    "extraction_count",
+    "ocr_input_tokens",
+    "ocr_output_tokens",
+    "extraction_input_tokens",
+    "extraction_output_tokens",
+]
+
+# Averaged over every successful test of a model combination
+_PER_TEST_COLUMNS = [
+    "text_accuracy",
+    "total_cost",
+    "ocr_cost",
+    "ocr_latency",
+    "ocr_input_tokens",
+    "ocr_output_tokens",
+]
+
+# Averaged over tests that ran an extraction and produced a JSON accuracy
+_PER_EXTRACTION_COLUMNS = [
+    "json_accuracy",
+    "extraction_cost",
+    "extraction_latency",
+    "extraction_input_tokens",
+    "extraction_output_tokens",
+]
+
+
+def model_combination_label(
+    ocr_model: str, extraction_model: str, direct_image_extraction: bool
+) -> str:
+    """Return the display label of a single model combination"""
+    if direct_image_extraction:
+        return f"{extraction_model} (IMG2JSON)"
+    return f"{ocr_model} → {extraction_model}"
+
+
+def model_combination_labels(metrics: pd.DataFrame) -> pd.Series:
+    """Return the display label of each row's model combination"""
+    ocr_model = metrics["ocr_model"].astype(object).fillna("None").astype(str)
+    extraction_model = (
+        metrics["extraction_model"].astype(object).fillna("None").astype(str)
+    )
+    labels = np.where(
+        metrics["direct_image_extraction"].to_numpy(dtype=bool),
+        extraction_model + " (IMG2JSON)",
+        ocr_model + " → " + extraction_model,
+    )
+    return pd.Series(labels, index=metrics.index, name="Model Combination")
+
+
+@instrumented
+def compute_model_stats(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Compute every per-model-combination statistic in one grouped pass
+
+    Takes the flattened metrics table and returns one row per model
+    combination (in order of first appearance) with the columns of
+    ``MODEL_COMPARISON_COLUMNS`` plus ``json_count`` and
+    ``json_accuracy_all``, the JSON accuracy over every test that reported
+    one, used by the accuracy charts. Errored tests are skipped.
+    """
+    valid = metrics[~metrics["has_error"].to_numpy(dtype=bool)]
+    has_extraction = valid["has_extraction"].to_numpy(dtype=bool)
+    has_json = valid["has_json_accuracy"].to_numpy(dtype=bool)
+    scored = has_json & has_extraction
+    json_accuracy = valid["json_accuracy"].fillna(0)
+
+    def masked(column, mask):
+        return valid[column].fillna(0).where(mask, 0)
+
+    work = pd.DataFrame(
+        {
+            "count": 1,
+            "text_accuracy": valid["levenshtein_distance"].fillna(0),
+            "total_cost": valid["total_cost"].fillna(0),
+            "ocr_cost": valid["ocr_cost"].fillna(0),
+            "ocr_latency": valid["ocr_duration"].fillna(0) / 1000,
+            "ocr_input_tokens": valid["ocr_input_tokens"].fillna(0),
+            "ocr_output_tokens": valid["ocr_output_tokens"].fillna(0),
+            "extraction_count": scored.astype(int),
+            "json_accuracy": json_accuracy.where(scored, 0),
+            "extraction_cost": masked("extraction_cost", scored),
+            "extraction_latency": masked("extraction_duration", scored) / 1000,
+            "extraction_input_tokens": masked(
+                "extraction_input_tokens", has_extraction
+            ),
+            "extraction_output_tokens": masked(
+                "extraction_output_tokens", has_extraction
+            ),
+            "json_count": has_json.astype(int),
+            "json_accuracy_all": json_accuracy.where(has_json, 0),
+        },
+        index=valid.index,
+    )
+
+    stats = work.groupby(model_combination_labels(valid), sort=False).sum()
+    stats[_PER_TEST_COLUMNS] = stats[_PER_TEST_COLUMNS].div(stats["count"], axis=0)
+    # Sums are left as-is for combinations without any extraction
+    extraction_count = stats["extraction_count"].where(
+        stats["extraction_count"] > 0, 1
+    )
+    stats[_PER_EXTRACTION_COLUMNS] = stats[_PER_EXTRACTION_COLUMNS].div(
+        extraction_count, axis=0
+    )
+    json_count = stats["json_count"].where(stats["json_count"] > 0, 1)
+    stats["json_accuracy_all"] = stats["json_accuracy_all"] / json_count
+
+    stats.index.name = "Model Combination"
+    return stats[MODEL_COMPARISON_COLUMNS + ["json_count", "json_accuracy_all"]]
@@ -0,0 +1,108 @@
+import json
+from typing import Callable, Dict, Iterable, Tuple
+
+import pandas as pd
+
+from utils.aggregation import MODEL_COMPARISON_COLUMNS
+from utils.data_loader import load_latency_stats, load_metrics_table, load_model_stats
+from utils.instrumentation import instrumented
+from utils.results_table import flatten_metadata_columns
+
+
+@instrumented
+def create_results_table(
+    metrics: pd.DataFrame, parse_metadata: bool = True, flatten_metadata: bool = False
+):
+    """Create a DataFrame from the run's metrics table
+
+    Metadata is parsed into dicts for display, or flattened into typed
+    columns with ``flatten_metadata`` (meant for a page of rows); exports
+    keep the JSON strings.
+    """
+    metadata = metrics["metadata"]
+    table = pd.DataFrame(
+        {
+            "Image": metrics["file_url"],
+            "OCR Model": metrics["ocr_model"],
+            "Extraction Model": metrics["extraction_model"],
+            "Levenshtein Score": metrics["levenshtein_distance"].fillna(0),
+            "JSON Accuracy": metrics["json_accuracy"].fillna(0),
+            "Total Cost": metrics["total_cost"].fillna(0),
+            "Duration (ms)": metrics["duration"].fillna(0),
+        }
+    )
+    if flatten_metadata:
+        return table.join(flatten_metadata_columns(metadata))
+    table["Metadata"] = metadata.map(json.loads) if parse_metadata else metadata
+    return table
+
+
+@instrumented
+def create_model_comparison_table(model_stats: pd.DataFrame) -> pd.DataFrame:
+    """Create a DataFrame comparing different model combinations"""
+    return model_stats[MODEL_COMPARISON_COLUMNS]
+
+
+@instrumented
+def create_accuracy_comparison_charts(
+    model_stats: pd.DataFrame,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Create separate DataFrames for JSON and Text accuracy comparisons"""
+    json_df = (
+        model_stats[["json_accuracy_all"]]
+        .rename(columns={"json_accuracy_all": "JSON Accuracy"})
+        .rename_axis("Model")
+    )
+    text_df = (
+        model_stats[["text_accuracy"]]
+        .rename(columns={"text_accuracy": "Text Similarity"})
+        .rename_axis("Model")
+    )
+    return json_df, text_df
+
+
+@instrumented
+def create_latency_percentile_table(
+    latency_stats: pd.DataFrame, phase: str
+) -> pd.DataFrame:
+    """Create a DataFrame of latency percentiles per model for one phase"""
+    if phase not in latency_stats.index.get_level_values("phase"):
+        return pd.DataFrame(columns=["Model", "p50", "p90", "p95", "p99"])
+    return (
+        latency_stats.xs(phase, level="phase")
+        .drop(columns="count")
+        .rename_axis("Model")
+        .reset_index()
+    )
+
+
+def _model_comparison_table(timestamp: str) -> pd.DataFrame:
+    return create_model_comparison_table(load_model_stats(timestamp)).reset_index()
+
+
+def _accuracy_table(timestamp: str) -> pd.DataFrame:
+    json_df, text_df = create_accuracy_comparison_charts(load_model_stats(timestamp))
+    return json_df.join(text_df).reset_index()
+
+
+def _latency_table(timestamp: str) -> pd.DataFrame:
+    latency_stats, _ = load_latency_stats(timestamp)
+    return latency_stats.reset_index()
+
+
+def _results_table(timestamp: str) -> pd.DataFrame:
+    return create_results_table(load_metrics_table(timestamp), parse_metadata=False)
+
+
+# Exportable tables of a run, each built from the cheapest source available
+ANALYTICS_TABLES: Dict[str, Callable[[str], pd.DataFrame]] = {
+    "model_comparison": _model_comparison_table,
+    "accuracy": _accuracy_table,
+    "latency": _latency_table,
+    "results": _results_table,
+}
+
+
+def build_tables(timestamp: str, names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+    """Return the named analytics tables of a run"""
+    return {name: ANALYTICS_TABLES[name](timestamp) for name in names}
@@ -0,0 +1,153 @@
+import os
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.parse import unquote, urlparse
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Cache settings, overridable through the environment
+ASSET_CACHE_DIR = os.getenv("ASSET_CACHE_DIR", ".cache/assets")
+ASSET_CACHE_MAX_BYTES = int(os.getenv("ASSET_CACHE_MAX_MB", "1024")) * 1024 * 1024
+ASSET_FETCH_TIMEOUT = float(os.getenv("ASSET_FETCH_TIMEOUT", "30"))  # seconds
+ASSET_CONNECT_TIMEOUT = float(os.getenv("ASSET_CONNECT_TIMEOUT", "5"))  # seconds
+# Optional local mirror laid out as <host>/<path>, e.g. created by `wget --mirror`
+ASSET_MIRROR_DIR = os.getenv("ASSET_MIRROR_DIR")
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_evict_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """Return the shared HTTP session used to fetch document assets"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504)
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=4, pool_maxsize=16, max_retries=retry
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def get_local_path(url: str) -> Optional[Path]:
+    """Return the filesystem path for file:// URLs and plain local paths"""
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return Path(url2pathname(unquote(parsed.path)))
+    # Single-letter schemes are Windows drive letters
+    if parsed.scheme == "" or len(parsed.scheme) == 1:
+        return Path(url)
+    return None
+
+
+def get_mirror_path(url: str) -> Optional[Path]:
+    """Return the path of a remote asset inside ``ASSET_MIRROR_DIR``, if set"""
+    if not ASSET_MIRROR_DIR:
+        return None
+    parsed = urlparse(url)
+    return Path(ASSET_MIRROR_DIR) / parsed.netloc / unquote(parsed.path).lstrip("/")
+
+
+def get_cache_path(url: str, variant: str = "") -> Path:
+    """Return the content-addressed cache path of an asset URL
+
+    ``variant`` names a file derived from the asset, such as a rendered
+    preview, stored next to it and evicted with the same size limit.
+    """
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    if variant:
+        return Path(ASSET_CACHE_DIR) / digest[:2] / f"{digest}_{variant}"
+    suffix = Path(urlparse(url).path).suffix.lower()
+    return Path(ASSET_CACHE_DIR) / digest[:2] / f"{digest}{suffix}"
+
+
+def _evict(keep: Path, max_bytes: int = ASSET_CACHE_MAX_BYTES) -> None:
+    """Delete least recently used assets until the cache fits ``max_bytes``"""
+    cache_dir = Path(ASSET_CACHE_DIR)
+    if not cache_dir.exists():
+        return
+    with _evict_lock:
+        files = []
+        total = 0
+        for path in cache_dir.glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        # Oldest access first; mtime is bumped on every cache hit
+        for _, size, path in sorted(files):
+            if total <= max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def read_cached(cache_path: Path) -> Optional[bytes]:
+    """Return a cached file's bytes, marking it as recently used, if present"""
+    try:
+        os.utime(cache_path)
+        return cache_path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def write_cached(cache_path: Path, data: bytes) -> None:
+    """Atomically store a file in the cache and evict to fit the size limit"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, cache_path)
+    _evict(keep=cache_path)
+
+
+def fetch_asset_path(url: str) -> Path:
+    """Return a local path holding the asset, fetching and caching it if needed
+
+    Local paths and file:// URLs are returned as-is, and remote assets
+    present in ``ASSET_MIRROR_DIR`` are read from the mirror. Other remote
+    assets are stored under ``ASSET_CACHE_DIR`` keyed by the SHA-256 of their
+    URL, so a revisited document is a disk read and works offline once cached.
+    """
+    local_path = get_local_path(url)
+    if local_path is not None:
+        if not local_path.exists():
+            raise FileNotFoundError(f"Asset not found: {local_path}")
+        return local_path
+
+    mirror_path = get_mirror_path(url)
+    if mirror_path is not None and mirror_path.is_file():
+        return mirror_path
+
+    cache_path = get_cache_path(url)
+    if cache_path.exists():
+        os.utime(cache_path)
+        return cache_path
+
+    response = get_http_session().get(
+        url, timeout=(ASSET_CONNECT_TIMEOUT, ASSET_FETCH_TIMEOUT)
+    )
+    response.raise_for_status()
+    write_cached(cache_path, response.content)
+    return cache_path
+
+
+def fetch_asset(url: str) -> bytes:
+    """Return the bytes of an asset, served from the local cache when possible"""
+    return fetch_asset_path(url).read_bytes()
@@ -0,0 +1,75 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL or a version change
+
+    Entries stored with ``ttl=None`` never expire on their own and are only
+    dropped by LRU eviction or when looked up with a different version.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (value, version, expires_at), least recently used first
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, version: Any = None, default: Any = None) -> Any:
+        """Return the cached value if it is fresh and matches ``version``"""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, entry_version, expires_at = entry
+                expired = expires_at is not None and expires_at <= time.monotonic()
+                if not expired and entry_version == version:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        version: Any = None,
+        ttl: Any = _MISSING,
+    ) -> None:
+        """Store a value, evicting the least recently used entries when full"""
+        ttl = self.ttl if ttl is _MISSING else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._data[key] = (value, version, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def keys(self) -> List[Hashable]:
+        """Return a snapshot of the cached keys, least recently used first"""
+        with self._lock:
+            return list(self._data)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
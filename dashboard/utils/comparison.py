@@ -0,0 +1,174 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import model_combination_labels
+from utils.instrumentation import instrumented
+
+# Per-model metrics compared between runs: model stats column(s), scale and
+# whether higher values are better
+COMPARISON_METRICS: Dict[str, Tuple[Tuple[str, ...], float, bool]] = {
+    "JSON Accuracy": (("json_accuracy_all",), 1, True),
+    "Text Similarity": (("text_accuracy",), 1, True),
+    "Cost per 1,000 Pages": (("total_cost",), 1000, False),
+    "OCR Latency (s)": (("ocr_latency",), 1, False),
+    "Extraction Latency (s)": (("extraction_latency",), 1, False),
+    "Tokens per Page": (
+        (
+            "ocr_input_tokens",
+            "ocr_output_tokens",
+            "extraction_input_tokens",
+            "extraction_output_tokens",
+        ),
+        1,
+        False,
+    ),
+}
+
+# Per-document scores compared between runs: metrics table column, whether
+# higher values are better, and the default regression threshold and its
+# step, in the metric's own units
+DOCUMENT_METRICS: Dict[str, Tuple[str, bool, float, float]] = {
+    "JSON Accuracy": ("json_accuracy", True, 0.05, 0.01),
+    "Text Similarity": ("levenshtein_distance", True, 0.05, 0.01),
+    "Total Cost": ("total_cost", False, 0.001, 0.0005),
+    "Duration (ms)": ("duration", False, 1000.0, 100.0),
+}
+
+DOCUMENT_KEYS = ["file_url", "Model Combination"]
+
+
+def comparison_values(model_stats: pd.DataFrame) -> pd.DataFrame:
+    """Return one column per comparison metric and one row per model combination"""
+    return pd.DataFrame(
+        {
+            metric: model_stats[list(columns)].sum(axis=1) * scale
+            for metric, (columns, scale, _) in COMPARISON_METRICS.items()
+        },
+        index=model_stats.index,
+    )
+
+
+@instrumented
+def compare_model_stats(
+    stats_by_run: Dict[str, pd.DataFrame], baseline: str
+) -> pd.DataFrame:
+    """Compare every run's per-model metrics with a baseline run
+
+    Returns one row per (run, model combination, metric) with the baseline
+    value, the run's value, the delta and the relative change. Models only
+    present in one of the runs keep a missing value on the other side.
+    """
+    baseline_values = comparison_values(stats_by_run[baseline]).stack()
+    frames = []
+    for timestamp, stats in stats_by_run.items():
+        if timestamp == baseline:
+            continue
+        values = comparison_values(stats).stack()
+        frame = pd.concat(
+            [baseline_values.rename("Baseline"), values.rename("Value")], axis=1
+        )
+        frame["Delta"] = frame["Value"] - frame["Baseline"]
+        frame["Change"] = frame["Delta"] / frame["Baseline"].where(
+            frame["Baseline"] != 0
+        )
+        frame.index.names = ["Model", "Metric"]
+        frames.append(frame.reset_index().assign(Run=timestamp))
+    if not frames:
+        return pd.DataFrame(
+            columns=["Run", "Model", "Metric", "Baseline", "Value", "Delta", "Change"]
+        )
+    comparison = pd.concat(frames, ignore_index=True)
+    return comparison[
+        ["Run", "Model", "Metric", "Baseline", "Value", "Delta", "Change"]
+    ]
+
+
+@instrumented
+def compute_document_scores(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Average each document's scores per model combination
+
+    Returns one row per (file_url, model combination) with the mean of every
+    ``DOCUMENT_METRICS`` column over the document's tests, their count and
+    whether any of them errored. Grouping hashes the keys, so it is linear in
+    the run size.
+    """
+    columns = [column for column, *_ in DOCUMENT_METRICS.values()]
+    work = metrics[columns].assign(
+        file_url=metrics["file_url"],
+        **{"Model Combination": model_combination_labels(metrics)},
+        has_error=metrics["has_error"].to_numpy(dtype=bool),
+        count=1,
+    )
+    return work.groupby(DOCUMENT_KEYS, sort=False, observed=True).agg(
+        **{column: (column, "mean") for column in columns},
+        has_error=("has_error", "any"),
+        count=("count", "sum"),
+    )
+
+
+@instrumented
+def join_document_scores(
+    baseline_scores: pd.DataFrame, scores: pd.DataFrame
+) -> pd.DataFrame:
+    """Join two runs' document scores on file URL and model combination
+
+    Only documents tested with the same model combination in both runs are
+    kept; baseline columns are suffixed with ``_baseline``.
+    """
+    return scores.join(baseline_scores, how="inner", rsuffix="_baseline")
+
+
+def document_changes(
+    joined: pd.DataFrame, metric: str, threshold: float = 0.0
+) -> pd.DataFrame:
+    """Return the per-document change of a metric and whether it regressed
+
+    A document regressed when its score got worse by more than ``threshold``
+    or when it errored in the run but not in the baseline; it improved in the
+    opposite cases.
+    """
+    column, higher_is_better, _, _ = DOCUMENT_METRICS[metric]
+    delta = joined[column] - joined[f"{column}_baseline"]
+    worse = -delta if higher_is_better else delta
+    new_error = joined["has_error"] & ~joined["has_error_baseline"]
+    fixed_error = ~joined["has_error"] & joined["has_error_baseline"]
+    return pd.DataFrame(
+        {
+            "Baseline": joined[f"{column}_baseline"],
+            "Value": joined[column],
+            "Delta": delta,
+            "New Error": new_error,
+            "Regressed": (worse > threshold).to_numpy() | new_error.to_numpy(),
+            "Improved": (worse < -threshold).to_numpy() | fixed_error.to_numpy(),
+        },
+        index=joined.index,
+    )
+
+
+def summarize_document_changes(changes: pd.DataFrame) -> pd.DataFrame:
+    """Count matched, regressed, improved and newly failing documents per model"""
+    models = changes.index.get_level_values("Model Combination")
+    summary = changes.groupby(models, sort=False).agg(
+        Documents=("Delta", "size"),
+        Regressed=("Regressed", "sum"),
+        Improved=("Improved", "sum"),
+        **{"New Errors": ("New Error", "sum"), "Mean Delta": ("Delta", "mean")},
+    )
+    return summary.sort_values("Regressed", ascending=False)
+
+
+def document_regressions(
+    changes: pd.DataFrame, higher_is_better: bool, limit: int
+) -> pd.DataFrame:
+    """Return up to ``limit`` regressed documents, new errors and worst deltas first"""
+    regressed = changes[changes["Regressed"].to_numpy()]
+    worse = -regressed["Delta"] if higher_is_better else regressed["Delta"]
+    order = np.lexsort((-worse.fillna(np.inf).to_numpy(), ~regressed["New Error"]))
+    return (
+        regressed.iloc[order[:limit]]
+        .drop(columns=["Regressed", "Improved"])
+        .rename_axis(["Image", "Model Combination"])
+        .reset_index()
+    )
@@ -1,15 +1,135 @@
 import os
-import json
+import math
+import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
 from sqlalchemy.sql import text
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
-from typing import Dict, Any, List, TypedDict, Optional
+from typing import (
+    Dict,
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Optional,
+)
+
+from utils.aggregation import (
+    MODEL_COMPARISON_COLUMNS,
+    compute_model_stats,
+    model_combination_label,
+)
+from utils.cache import TTLCache
+from utils.comparison import compute_document_scores, join_document_scores
+from utils.db import get_session
+from utils.instrumentation import instrumented
+from utils.latency import (
+    LATENCY_PERCENTILES,
+    QuantileSketch,
+    compute_latency_stats,
+    latency_histograms,
+    latency_stats_frame,
+    sketch_gamma,
+)
+from utils.metrics_table import (
+    flatten_results,
+    get_metrics_table_path,
+    read_metrics_table,
+    write_metrics_table,
+)
+from utils.results_store import (
+    clear_index_cache,
+    find_result_ids,
+    iter_results,
+    list_models,
+    read_result,
+)
+from utils.results_table import (
+    ResultsPage,
+    filter_positions,
+    results_page,
+    sort_positions,
+)
 
 load_dotenv()
 
+T = TypeVar("T")
+
+# Cache settings, overridable through the environment
+RUN_LIST_CACHE_TTL = float(os.getenv("RUN_LIST_CACHE_TTL", "30"))  # seconds
+RESULTS_CACHE_TTL = float(os.getenv("RESULTS_CACHE_TTL", "15"))  # in-progress runs
+RESULTS_CACHE_SIZE = int(os.getenv("RESULTS_CACHE_SIZE", "8"))
+
+_run_list_cache = TTLCache(maxsize=1, ttl=RUN_LIST_CACHE_TTL)
+_results_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+_metrics_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+_model_stats_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+_latency_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+# Sorted, filtered row positions of results tables, so paging is a slice
+_results_order_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE * 8, ttl=RESULTS_CACHE_TTL)
+_document_scores_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+_comparison_cache = TTLCache(maxsize=RESULTS_CACHE_SIZE, ttl=RESULTS_CACHE_TTL)
+
+# Id of the latest run with a timestamp; per-run loaders and aggregates read
+# only that run, the one get_run_version describes
+LATEST_RUN_ID_QUERY = """(
+    SELECT id
+    FROM benchmark_runs
+    WHERE timestamp = :timestamp
+    ORDER BY created_at DESC
+    LIMIT 1
+)"""
+
+# Number of result ids fetched per page on the Test Result page
+RESULT_PAGE_SIZE = int(os.getenv("RESULT_PAGE_SIZE", "100"))
+
+# Results streamed per database round trip by iter_results_for_run
+RESULT_BATCH_SIZE = int(os.getenv("RESULT_BATCH_SIZE", "500"))
+
+# Fields returned when only metrics are requested (no markdown/JSON payloads)
+METRICS_FIELDS = (
+    "id",
+    "fileUrl",
+    "ocrModel",
+    "extractionModel",
+    "directImageExtraction",
+    "levenshteinDistance",
+    "jsonAccuracy",
+    "jsonAccuracyResult",
+    "jsonDiffStats",
+    "metadata",
+    "usage",
+    "error",
+)
+
+# Result fields and the benchmark_results columns they are read from
+RESULT_COLUMNS = {
+    "id": "bres.id",
+    "fileUrl": "bres.file_url",
+    "ocrModel": "bres.ocr_model",
+    "extractionModel": "bres.extraction_model",
+    "directImageExtraction": "bres.direct_image_extraction",
+    "trueMarkdown": "bres.true_markdown",
+    "predictedMarkdown": "bres.predicted_markdown",
+    "trueJson": "bres.true_json",
+    "predictedJson": "bres.predicted_json",
+    "jsonDiff": "bres.json_diff",
+    "fullJsonDiff": "bres.full_json_diff",
+    "jsonDiffStats": "bres.json_diff_stats",
+    "levenshteinDistance": "bres.levenshtein_distance",
+    "jsonAccuracy": "bres.json_accuracy",
+    "jsonAccuracyResult": "bres.json_accuracy_result",
+    "jsonSchema": "bres.json_schema",
+    "metadata": "bres.metadata",
+    "usage": "bres.usage",
+    "error": "bres.error",
+}
+
 
 class BenchmarkRunMetadata(TypedDict):
     timestamp: str
@@ -21,6 +141,14 @@ class BenchmarkRunMetadata(TypedDict):
     completed_at: Optional[str]
 
 
+class ModelCombination(TypedDict):
+    label: str
+    ocr_model: str
+    extraction_model: Optional[str]
+    direct_image_extraction: bool
+
+
+@instrumented
 def load_run_list_from_folder(
     results_dir: str = "results",
 ) -> List[BenchmarkRunMetadata]:
@@ -48,12 +176,9 @@ def load_run_list_from_folder(
     return sorted(runs, key=lambda x: x["timestamp"], reverse=True)
 
 
+@instrumented
 def load_run_list_from_db() -> List[BenchmarkRunMetadata]:
     """Load list of benchmark runs from database"""
-    database_url = os.getenv("DATABASE_URL")
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
 
     query = text(
         """
@@ -70,7 +195,8 @@ def load_run_list_from_db() -> List[BenchmarkRunMetadata]:
     """
     )
 
-    rows = session.execute(query)
+    with get_session() as session:
+        rows = session.execute(query).all()
     runs = []
 
     for row in rows:
@@ -94,43 +220,49 @@ def load_run_list_from_db() -> List[BenchmarkRunMetadata]:
             }
         )
 
-    session.close()
     return runs
 
 
+def iter_results_for_run_from_folder(
+    timestamp: str,
+    fields: Optional[Iterable[str]] = None,
+    results_dir: str = "results",
+) -> Iterator[Dict[str, Any]]:
+    """Stream results for a specific run from folder, projected to ``fields``"""
+    results_path = Path(results_dir) / timestamp / "results.json"
+    if results_path.exists():
+        yield from iter_results(results_path, fields)
+
+
+@instrumented
 def load_results_for_run_from_folder(
-    timestamp: str, results_dir: str = "results"
+    timestamp: str, results_dir: str = "results", include_metrics_only: bool = True
 ) -> Dict[str, Any]:
     """Load results for a specific run from folder"""
     results_path = Path(results_dir) / timestamp / "results.json"
     if results_path.exists():
-        with open(results_path) as f:
-            results = json.load(f)
-            # Assign id to each result if not already present
-            for idx, result in enumerate(results):
-                if "id" not in result:
-                    result["id"] = idx
-            total_documents = len(results)
-            return {
-                "results": results,
-                "status": "completed",
-                "run_by": None,
-                "description": None,
-                "total_documents": total_documents,
-                "created_at": format_timestamp(timestamp),
-                "completed_at": format_timestamp(timestamp),
-            }
+        fields = METRICS_FIELDS if include_metrics_only else None
+        results = list(
+            iter_results_for_run_from_folder(timestamp, fields, results_dir)
+        )
+        total_documents = len(results)
+        return {
+            "results": results,
+            "status": "completed",
+            "run_by": None,
+            "description": None,
+            "total_documents": total_documents,
+            "created_at": format_timestamp(timestamp),
+            "completed_at": format_timestamp(timestamp),
+        }
     return {}
 
 
+@instrumented
 def load_results_for_run_from_db(
     timestamp: str, include_metrics_only: bool = True
 ) -> Dict[str, Any]:
     """Load results for a specific run from database"""
-    database_url = os.getenv("DATABASE_URL")
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
 
     if not include_metrics_only:
         output_string = """
@@ -182,8 +314,8 @@ def load_results_for_run_from_db(
     """
     )
 
-    row = session.execute(query, {"timestamp": timestamp}).first()
-    session.close()
+    with get_session() as session:
+        row = session.execute(query, {"timestamp": timestamp}).first()
 
     if row:
         return {
@@ -204,12 +336,195 @@ def load_results_for_run_from_db(
     return {}
 
 
+def iter_results_for_run_from_db(
+    timestamp: str,
+    fields: Optional[Iterable[str]] = None,
+    batch_size: int = RESULT_BATCH_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Stream results for a specific run from database, projected to ``fields``
+
+    Results are fetched ``batch_size`` at a time, keyset-paginated by id, so
+    memory stays bounded however large the run is.
+    """
+    fields = ["id"] + [f for f in (fields or RESULT_COLUMNS) if f != "id"]
+    columns = ", ".join(f"'{field}', {RESULT_COLUMNS[field]}" for field in fields)
+    query = text(
+        f"""
+        SELECT bres.id::text AS id, json_build_object({columns}) AS result
+        FROM benchmark_results bres
+        WHERE bres.benchmark_run_id = {LATEST_RUN_ID_QUERY}
+        AND (CAST(:after_id AS uuid) IS NULL OR bres.id > CAST(:after_id AS uuid))
+        ORDER BY bres.id
+        LIMIT :limit
+    """
+    )
+
+    after_id = None
+    while True:
+        with get_session() as session:
+            rows = session.execute(
+                query,
+                {"timestamp": timestamp, "after_id": after_id, "limit": batch_size},
+            ).all()
+        for row in rows:
+            yield row.result
+        if len(rows) < batch_size:
+            return
+        after_id = rows[-1].id
+
+
+@instrumented
+def load_model_stats_from_db(timestamp: str) -> pd.DataFrame:
+    """Compute per-model-combination stats for a run inside the database
+
+    Mirrors compute_model_stats, but aggregates with GROUP BY over the
+    ``usage`` JSON column so only one row per model combination is returned.
+    Every database result carries a ``jsonAccuracy`` key, so the extraction
+    averages and the chart JSON accuracy only differ by their filter.
+    """
+    query = text(
+        f"""
+        WITH run_results AS (
+            SELECT
+                CASE
+                    WHEN bres.direct_image_extraction
+                        THEN COALESCE(bres.extraction_model, 'None') || ' (IMG2JSON)'
+                    ELSE bres.ocr_model || ' → ' || COALESCE(bres.extraction_model, 'None')
+                END AS model_combination,
+                bres.created_at,
+                COALESCE(bres.levenshtein_distance, 0) AS text_accuracy,
+                COALESCE(bres.json_accuracy, 0) AS json_accuracy,
+                COALESCE((bres.usage->>'totalCost')::float, 0) AS total_cost,
+                COALESCE((bres.usage->'ocr'->>'totalCost')::float, 0) AS ocr_cost,
+                COALESCE((bres.usage->'ocr'->>'duration')::float, 0) / 1000 AS ocr_latency,
+                COALESCE((bres.usage->'ocr'->>'inputTokens')::float, 0) AS ocr_input_tokens,
+                COALESCE((bres.usage->'ocr'->>'outputTokens')::float, 0) AS ocr_output_tokens,
+                COALESCE(
+                    jsonb_typeof(bres.usage->'extraction') = 'object'
+                    AND bres.usage->'extraction' <> '{{}}'::jsonb,
+                    false
+                ) AS has_extraction,
+                COALESCE((bres.usage->'extraction'->>'totalCost')::float, 0) AS extraction_cost,
+                COALESCE((bres.usage->'extraction'->>'duration')::float, 0) / 1000 AS extraction_latency,
+                COALESCE((bres.usage->'extraction'->>'inputTokens')::float, 0) AS extraction_input_tokens,
+                COALESCE((bres.usage->'extraction'->>'outputTokens')::float, 0) AS extraction_output_tokens
+            FROM benchmark_results bres
+            WHERE bres.benchmark_run_id = {LATEST_RUN_ID_QUERY}
+              AND (bres.error IS NULL OR bres.error = '')
+        )
+        SELECT
+            model_combination,
+            COUNT(*) AS count,
+            COALESCE(AVG(json_accuracy) FILTER (WHERE has_extraction), 0) AS json_accuracy,
+            AVG(text_accuracy) AS text_accuracy,
+            AVG(total_cost) AS total_cost,
+            AVG(ocr_cost) AS ocr_cost,
+            COALESCE(AVG(extraction_cost) FILTER (WHERE has_extraction), 0) AS extraction_cost,
+            AVG(ocr_latency) AS ocr_latency,
+            COALESCE(AVG(extraction_latency) FILTER (WHERE has_extraction), 0) AS extraction_latency,
+            COUNT(*) FILTER (WHERE has_extraction) AS extraction_count,
+            AVG(ocr_input_tokens) AS ocr_input_tokens,
+            AVG(ocr_output_tokens) AS ocr_output_tokens,
+            COALESCE(AVG(extraction_input_tokens) FILTER (WHERE has_extraction), 0) AS extraction_input_tokens,
+            COALESCE(AVG(extraction_output_tokens) FILTER (WHERE has_extraction), 0) AS extraction_output_tokens,
+            COUNT(*) AS json_count,
+            AVG(json_accuracy) AS json_accuracy_all
+        FROM run_results
+        GROUP BY model_combination
+        ORDER BY MIN(created_at)
+    """
+    )
+
+    with get_session() as session:
+        rows = session.execute(query, {"timestamp": timestamp}).mappings().all()
+
+    columns = MODEL_COMPARISON_COLUMNS + ["json_count", "json_accuracy_all"]
+    stats = pd.DataFrame(
+        [dict(row) for row in rows], columns=["model_combination"] + columns
+    ).set_index("model_combination")
+    stats.index.name = "Model Combination"
+    return stats.astype({"count": int, "extraction_count": int, "json_count": int})
+
+
+@instrumented
+def load_latency_stats_from_db(timestamp: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Compute latency percentiles and histograms for a run inside the database
+
+    Percentiles are exact (``percentile_cont``); histograms use the
+    logarithmic buckets of ``QuantileSketch`` so only bucket counts are
+    transferred.
+    """
+    durations = f"""
+        WITH durations AS (
+            SELECT
+                CASE
+                    WHEN bres.direct_image_extraction
+                        THEN COALESCE(bres.extraction_model, 'None') || ' (IMG2JSON)'
+                    ELSE bres.ocr_model || ' → ' || COALESCE(bres.extraction_model, 'None')
+                END AS model_combination,
+                phase.name AS phase,
+                (bres.usage->phase.key->>'duration')::float / 1000 AS latency,
+                bres.created_at
+            FROM benchmark_results bres
+            CROSS JOIN (VALUES ('OCR', 'ocr'), ('Extraction', 'extraction')) AS phase(name, key)
+            WHERE bres.benchmark_run_id = {LATEST_RUN_ID_QUERY}
+              AND (bres.error IS NULL OR bres.error = '')
+              AND bres.usage->phase.key->>'duration' IS NOT NULL
+        )
+    """
+    percentiles_query = text(
+        f"""
+        {durations}
+        SELECT
+            model_combination,
+            phase,
+            COUNT(*) AS count,
+            percentile_cont(CAST(:percentiles AS float[]))
+                WITHIN GROUP (ORDER BY latency) AS percentiles
+        FROM durations
+        GROUP BY model_combination, phase
+        ORDER BY MIN(created_at), phase DESC
+    """
+    )
+    buckets_query = text(
+        f"""
+        {durations}
+        SELECT
+            model_combination,
+            phase,
+            CASE WHEN latency > 0 THEN CEIL(LN(latency) / :log_gamma)::int END AS bucket,
+            COUNT(*) AS count
+        FROM durations
+        GROUP BY model_combination, phase, bucket
+    """
+    )
+
+    gamma = sketch_gamma()
+    with get_session() as session:
+        percentile_rows = session.execute(
+            percentiles_query,
+            {"timestamp": timestamp, "percentiles": list(LATENCY_PERCENTILES)},
+        ).all()
+        bucket_rows = session.execute(
+            buckets_query, {"timestamp": timestamp, "log_gamma": math.log(gamma)}
+        ).all()
+
+    stats = latency_stats_frame(
+        [
+            [row.model_combination, row.phase, row.count, *row.percentiles]
+            for row in percentile_rows
+        ]
+    )
+
+    sketches = {key: QuantileSketch() for key in stats.index}
+    for row in bucket_rows:
+        sketches[(row.model_combination, row.phase)].add_bucket(row.bucket, row.count)
+    return stats, latency_histograms(sketches)
+
+
+@instrumented
 def load_one_result_from_db(timestamp: str, id: str) -> Dict[str, Any]:
     """Load one test case result from database for a specific run and file"""
-    database_url = os.getenv("DATABASE_URL")
-    engine = create_engine(database_url)
-    Session = sessionmaker(bind=engine)
-    session = Session()
 
     query = text(
         """
@@ -254,8 +569,8 @@ def load_one_result_from_db(timestamp: str, id: str) -> Dict[str, Any]:
     """
     )
 
-    row = session.execute(query, {"timestamp": timestamp, "id": id}).first()
-    session.close()
+    with get_session() as session:
+        row = session.execute(query, {"timestamp": timestamp, "id": id}).first()
 
     if row:
         return {
@@ -275,43 +590,484 @@ def load_one_result_from_db(timestamp: str, id: str) -> Dict[str, Any]:
     return {}
 
 
+@instrumented
 def load_one_result_from_folder(
     timestamp: str, id: str, results_dir: str = "results"
 ) -> Dict[str, Any]:
     """Load one test case result from folder for a specific run and file"""
     results_path = Path(results_dir) / timestamp / "results.json"
-    if results_path.exists():
-        with open(results_path) as f:
-            results = json.load(f)
-            for idx, result in enumerate(results):
-                if idx == id:
-                    return {
-                        "result": result,
-                        "status": "completed",
-                        "run_by": None,
-                        "description": None,
-                        "created_at": format_timestamp(timestamp),
-                        "completed_at": format_timestamp(timestamp),
-                    }
+    result = read_result(results_path, id)
+    if result is not None:
+        return {
+            "result": result,
+            "status": "completed",
+            "run_by": None,
+            "description": None,
+            "created_at": format_timestamp(timestamp),
+            "completed_at": format_timestamp(timestamp),
+        }
     return {}
 
 
+def get_run_version_from_db(timestamp: str) -> Optional[tuple]:
+    """Return the (status, completed_at) pair used to invalidate cached runs"""
+    query = text(
+        """
+        SELECT status, completed_at
+        FROM benchmark_runs
+        WHERE timestamp = :timestamp
+        ORDER BY created_at DESC
+        LIMIT 1
+    """
+    )
+
+    with get_session() as session:
+        row = session.execute(query, {"timestamp": timestamp}).first()
+
+    if row:
+        return (row.status, row.completed_at)
+    return None
+
+
+def get_run_version_from_folder(
+    timestamp: str, results_dir: str = "results"
+) -> Optional[tuple]:
+    """Return the (status, mtime, size) triple used to invalidate cached runs"""
+    results_path = Path(results_dir) / timestamp / "results.json"
+    try:
+        stat = results_path.stat()
+    except FileNotFoundError:
+        return None
+    return ("completed", stat.st_mtime_ns, stat.st_size)
+
+
+@instrumented
+def get_run_version(timestamp: str) -> Optional[tuple]:
+    """Return a version token for a run from either database or local files"""
+    if os.getenv("DATABASE_URL"):
+        return get_run_version_from_db(timestamp)
+    return get_run_version_from_folder(timestamp)
+
+
+def _cached(
+    cache: TTLCache, key: Hashable, load: Callable[[], T], *versions: Optional[tuple]
+) -> T:
+    """Return ``load()``, cached under ``key`` until a run of ``versions`` changes
+
+    Values derived from completed runs stay cached until evicted; those of
+    in-progress runs expire after ``RESULTS_CACHE_TTL`` seconds. Nothing is
+    cached for runs without a version, e.g. missing ones.
+    """
+    value = cache.get(key, versions)
+    if value is not None:
+        return value
+
+    value = load()
+    if None not in versions:
+        completed = all(version[0] == "completed" for version in versions)
+        ttl = None if completed else RESULTS_CACHE_TTL
+        cache.set(key, value, versions, ttl=ttl)
+    return value
+
+
+@instrumented
+def load_result_ids_page_from_folder(
+    timestamp: str,
+    after_id: Optional[str] = None,
+    before_id: Optional[str] = None,
+    limit: int = RESULT_PAGE_SIZE,
+    only_with_diffs: bool = False,
+    has_error: Optional[bool] = None,
+    model_combination: Optional[ModelCombination] = None,
+    results_dir: str = "results",
+) -> List[str]:
+    """Load one page of filtered result ids from the folder index"""
+    results_path = Path(results_dir) / timestamp / "results.json"
+    model = None
+    if model_combination is not None:
+        model = (
+            model_combination["ocr_model"],
+            model_combination["extraction_model"],
+            model_combination["direct_image_extraction"],
+        )
+    return find_result_ids(
+        results_path,
+        after_id=after_id,
+        before_id=before_id,
+        limit=limit,
+        only_with_diffs=only_with_diffs,
+        has_error=has_error,
+        model=model,
+    )
+
+
+@instrumented
+def load_result_ids_page_from_db(
+    timestamp: str,
+    after_id: Optional[str] = None,
+    before_id: Optional[str] = None,
+    limit: int = RESULT_PAGE_SIZE,
+    only_with_diffs: bool = False,
+    has_error: Optional[bool] = None,
+    model_combination: Optional[ModelCombination] = None,
+) -> List[str]:
+    """Load one page of filtered result ids from database, keyset-paginated by id"""
+    conditions = []
+    params = {"timestamp": timestamp, "limit": limit}
+
+    if after_id is not None:
+        conditions.append("AND bres.id > :after_id")
+        params["after_id"] = after_id
+    if before_id is not None:
+        conditions.append("AND bres.id < :before_id")
+        params["before_id"] = before_id
+    if only_with_diffs:
+        conditions.append("AND ((bres.json_diff_stats->>'total')::int) > 0")
+    if has_error is True:
+        conditions.append("AND bres.error IS NOT NULL AND bres.error <> ''")
+    elif has_error is False:
+        conditions.append("AND (bres.error IS NULL OR bres.error = '')")
+    if model_combination is not None:
+        conditions.append(
+            """
+            AND bres.ocr_model = :ocr_model
+            AND bres.extraction_model IS NOT DISTINCT FROM :extraction_model
+            AND bres.direct_image_extraction = :direct_image_extraction
+            """
+        )
+        params["ocr_model"] = model_combination["ocr_model"]
+        params["extraction_model"] = model_combination["extraction_model"]
+        params["direct_image_extraction"] = model_combination["direct_image_extraction"]
+
+    # Walk backwards from before_id, then restore ascending order below
+    order = "DESC" if before_id is not None else "ASC"
+    query = text(
+        f"""
+        SELECT bres.id::text AS id
+        FROM benchmark_results bres
+        WHERE bres.benchmark_run_id = {LATEST_RUN_ID_QUERY}
+        {" ".join(conditions)}
+        ORDER BY bres.id {order}
+        LIMIT :limit
+    """
+    )
+
+    with get_session() as session:
+        ids = [row.id for row in session.execute(query, params)]
+    return ids[::-1] if before_id is not None else ids
+
+
+@instrumented
+def load_model_combinations_from_db(timestamp: str) -> List[ModelCombination]:
+    """Load the distinct model combinations of a run from database"""
+    query = text(
+        f"""
+        SELECT DISTINCT
+            bres.ocr_model,
+            bres.extraction_model,
+            bres.direct_image_extraction
+        FROM benchmark_results bres
+        WHERE bres.benchmark_run_id = {LATEST_RUN_ID_QUERY}
+        ORDER BY bres.ocr_model, bres.extraction_model, bres.direct_image_extraction
+    """
+    )
+
+    with get_session() as session:
+        rows = session.execute(query, {"timestamp": timestamp}).all()
+    return [
+        {
+            "label": model_combination_label(*row),
+            "ocr_model": row.ocr_model,
+            "extraction_model": row.extraction_model,
+            "direct_image_extraction": row.direct_image_extraction,
+        }
+        for row in rows
+    ]
+
+
+@instrumented
+def load_model_combinations_from_folder(
+    timestamp: str, results_dir: str = "results"
+) -> List[ModelCombination]:
+    """Load the distinct model combinations of a run from the folder index"""
+    results_path = Path(results_dir) / timestamp / "results.json"
+    return [
+        {
+            "label": model_combination_label(*model),
+            "ocr_model": model[0],
+            "extraction_model": model[1],
+            "direct_image_extraction": model[2],
+        }
+        for model in list_models(results_path)
+    ]
+
+
+@instrumented
 def load_run_list() -> List[BenchmarkRunMetadata]:
-    """Load list of benchmark runs from either database or local files"""
+    """Load list of benchmark runs from either database or local files
+
+    The list is cached for ``RUN_LIST_CACHE_TTL`` seconds.
+    """
+    runs = _run_list_cache.get("runs")
+    if runs is not None:
+        return runs
+
     if os.getenv("DATABASE_URL"):
-        return load_run_list_from_db()
-    return load_run_list_from_folder()
+        runs = load_run_list_from_db()
+    else:
+        runs = load_run_list_from_folder()
+    _run_list_cache.set("runs", runs)
+    return runs
 
 
+@instrumented
 def load_results_for_run(
     timestamp: str, include_metrics_only: bool = True
 ) -> Dict[str, Any]:
-    """Load results for a specific run from either database or local files"""
+    """Load results for a specific run from either database or local files
+
+    Results are cached per run and invalidated when the run's status or
+    completion time (database) or the file's mtime/size (folder) changes.
+    Completed runs stay cached until evicted; in-progress runs are refreshed
+    after ``RESULTS_CACHE_TTL`` seconds. The returned dict is shared between
+    callers and must not be mutated.
+    """
+
+    def load():
+        if os.getenv("DATABASE_URL"):
+            return load_results_for_run_from_db(timestamp, include_metrics_only)
+        return load_results_for_run_from_folder(
+            timestamp, include_metrics_only=include_metrics_only
+        )
+
+    key = (timestamp, include_metrics_only)
+    return _cached(_results_cache, key, load, get_run_version(timestamp))
+
+
+def iter_results_for_run(
+    timestamp: str, fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Stream results for a specific run from either database or local files
+
+    Unlike ``load_results_for_run`` nothing is cached, so whole runs,
+    markdown included, can be processed without holding them in memory.
+    """
+    if os.getenv("DATABASE_URL"):
+        return iter_results_for_run_from_db(timestamp, fields)
+    return iter_results_for_run_from_folder(timestamp, fields)
+
+
+@instrumented
+def load_result_ids_page(
+    timestamp: str,
+    after_id: Optional[str] = None,
+    before_id: Optional[str] = None,
+    limit: int = RESULT_PAGE_SIZE,
+    only_with_diffs: bool = False,
+    has_error: Optional[bool] = None,
+    model_combination: Optional[ModelCombination] = None,
+) -> List[str]:
+    """Load one page of filtered result ids from either database or local files
+
+    Pages are keyset-paginated: pass the last id of the current page as
+    ``after_id`` for the next page, or its first id as ``before_id`` for the
+    previous one. Ids are always returned in ascending order.
+    """
+    if os.getenv("DATABASE_URL"):
+        load_page = load_result_ids_page_from_db
+    else:
+        load_page = load_result_ids_page_from_folder
+    return load_page(
+        timestamp,
+        after_id=after_id,
+        before_id=before_id,
+        limit=limit,
+        only_with_diffs=only_with_diffs,
+        has_error=has_error,
+        model_combination=model_combination,
+    )
+
+
+@instrumented
+def load_adjacent_result_id(
+    timestamp: str,
+    id: str,
+    forward: bool = True,
+    only_with_diffs: bool = False,
+    has_error: Optional[bool] = None,
+    model_combination: Optional[ModelCombination] = None,
+) -> Optional[str]:
+    """Return the id of the next (or previous) matching result, if any"""
+    ids = load_result_ids_page(
+        timestamp,
+        after_id=id if forward else None,
+        before_id=None if forward else id,
+        limit=1,
+        only_with_diffs=only_with_diffs,
+        has_error=has_error,
+        model_combination=model_combination,
+    )
+    return ids[0] if ids else None
+
+
+@instrumented
+def load_model_combinations(timestamp: str) -> List[ModelCombination]:
+    """Load the distinct model combinations of a run from either database or local files"""
     if os.getenv("DATABASE_URL"):
-        return load_results_for_run_from_db(timestamp, include_metrics_only)
-    return load_results_for_run_from_folder(timestamp)
+        return load_model_combinations_from_db(timestamp)
+    return load_model_combinations_from_folder(timestamp)
+
+
+@instrumented
+def load_metrics_table(timestamp: str) -> pd.DataFrame:
+    """Load the columnar metrics table for a run from either database or local files
+
+    Completed runs are persisted as Parquet (next to results.json, or under
+    METRICS_CACHE_DIR in database mode) so reopening a run is a single
+    memory-mapped read. In-progress runs are rebuilt once their cache expires.
+    """
+    from_db = bool(os.getenv("DATABASE_URL"))
+    version = get_run_version(timestamp)
+
+    def load():
+        completed = version is not None and version[0] == "completed"
+        path = get_metrics_table_path(timestamp, from_db=from_db)
+        if completed:
+            frame = read_metrics_table(path, version)
+            if frame is not None:
+                return frame
+
+        if from_db:
+            results = load_results_for_run_from_db(timestamp).get("results") or []
+        else:
+            results = iter_results_for_run_from_folder(timestamp, METRICS_FIELDS)
+        frame = flatten_results(results)
+        if completed:
+            write_metrics_table(path, frame, version)
+        return frame
+
+    return _cached(_metrics_cache, timestamp, load, version)
+
+
+@instrumented
+def load_model_stats(timestamp: str) -> pd.DataFrame:
+    """Load per-model-combination stats for a run from either database or local files
+
+    In database mode the aggregation runs server-side, so only one row per
+    model combination is transferred; folder runs aggregate the metrics table.
+    Either way the result is cached, so page sections can share it.
+    """
+
+    def load():
+        if os.getenv("DATABASE_URL"):
+            return load_model_stats_from_db(timestamp)
+        return compute_model_stats(load_metrics_table(timestamp))
+
+    return _cached(_model_stats_cache, timestamp, load, get_run_version(timestamp))
+
+
+@instrumented
+def load_latency_stats(timestamp: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Load latency percentiles and histograms for a run from either database or local files
+
+    Returns a frame of count and p50/p90/p95/p99 latencies in seconds per
+    (model combination, phase), and a frame of histogram bucket counts.
+    Folder runs sketch the metrics table; database runs aggregate in SQL.
+    """
+
+    def load():
+        if os.getenv("DATABASE_URL"):
+            return load_latency_stats_from_db(timestamp)
+        return compute_latency_stats(load_metrics_table(timestamp))
+
+    return _cached(_latency_cache, timestamp, load, get_run_version(timestamp))
+
+
+@instrumented(size=lambda page: len(page["rows"]))
+def load_results_page(
+    timestamp: str,
+    page: int = 1,
+    page_size: int = 100,
+    sort_by: str = "Image",
+    ascending: bool = True,
+    model_combinations: Optional[List[str]] = None,
+    json_accuracy_range: Optional[Tuple[float, float]] = None,
+    levenshtein_range: Optional[Tuple[float, float]] = None,
+    has_error: Optional[bool] = None,
+) -> ResultsPage:
+    """Load one sorted, filtered page of a run's metrics table
+
+    Filtering and sorting run on the cached metrics table and their row order
+    is cached per run version, so turning pages only slices ``page_size`` rows.
+    """
+    metrics = load_metrics_table(timestamp)
+    key = (
+        timestamp,
+        sort_by,
+        ascending,
+        tuple(sorted(model_combinations or ())),
+        json_accuracy_range,
+        levenshtein_range,
+        has_error,
+    )
+
+    def load():
+        positions = filter_positions(
+            metrics,
+            model_combinations=model_combinations,
+            json_accuracy_range=json_accuracy_range,
+            levenshtein_range=levenshtein_range,
+            has_error=has_error,
+        )
+        return sort_positions(metrics, positions, sort_by, ascending)
+
+    positions = _cached(_results_order_cache, key, load, get_run_version(timestamp))
+    return results_page(metrics, positions, page, page_size)
+
+
+@instrumented
+def load_document_scores(timestamp: str) -> pd.DataFrame:
+    """Load per-document scores of a run, one row per file URL and model combination"""
+    return _cached(
+        _document_scores_cache,
+        timestamp,
+        lambda: compute_document_scores(load_metrics_table(timestamp)),
+        get_run_version(timestamp),
+    )
+
+
+@instrumented
+def load_document_comparison(baseline: str, timestamp: str) -> pd.DataFrame:
+    """Load the document scores of two runs joined on file URL and model combination
+
+    The join is cached until either run changes, so switching the compared
+    metric or threshold does not redo it.
+    """
+    return _cached(
+        _comparison_cache,
+        (baseline, timestamp),
+        lambda: join_document_scores(
+            load_document_scores(baseline), load_document_scores(timestamp)
+        ),
+        get_run_version(baseline),
+        get_run_version(timestamp),
+    )
+
+
+def clear_caches() -> None:
+    """Drop all in-memory run lists, results, metrics tables, stats and indexes"""
+    _run_list_cache.clear()
+    _results_cache.clear()
+    _metrics_cache.clear()
+    _model_stats_cache.clear()
+    _latency_cache.clear()
+    _results_order_cache.clear()
+    _document_scores_cache.clear()
+    _comparison_cache.clear()
+    clear_index_cache()
 
 
+@instrumented
 def load_one_result(timestamp: str, id: str) -> Dict[str, Any]:
     """Load one test case result from either database or local files"""
     if os.getenv("DATABASE_URL"):
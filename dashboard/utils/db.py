@@ -0,0 +1,206 @@
+import os
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from utils.instrumentation import span
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Pool settings, overridable through the environment
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_CHECK_INDEXES = os.getenv("DB_CHECK_INDEXES", "true").lower() in ("1", "true", "yes")
+
+# Indexes the dashboard queries rely on, created by prisma/dashboard_indexes.sql
+EXPECTED_INDEXES = {
+    "benchmark_runs": [
+        "benchmark_runs_timestamp_idx",
+        "benchmark_runs_created_at_idx",
+    ],
+    "benchmark_results": [
+        "benchmark_results_benchmark_run_id_id_idx",
+        "benchmark_results_benchmark_run_id_diff_total_idx",
+        "benchmark_results_benchmark_run_id_id_with_diffs_idx",
+    ],
+}
+
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_engine_lock = threading.Lock()
+
+_stats_lock = threading.Lock()
+_stats = {
+    "connects": 0,
+    "connect_time_total_ms": 0.0,
+    "connect_time_max_ms": 0.0,
+    "checkouts": 0,
+    "checkins": 0,
+}
+_connect_started = threading.local()
+
+
+def _register_pool_listeners(engine: Engine) -> None:
+    """Attach event listeners that feed the connection counters and SQL spans"""
+
+    @event.listens_for(engine, "do_connect")
+    def on_do_connect(dialect, conn_rec, cargs, cparams):
+        _connect_started.value = time.perf_counter()
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        started = getattr(_connect_started, "value", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        _connect_started.value = None
+        with _stats_lock:
+            _stats["connects"] += 1
+            _stats["connect_time_total_ms"] += elapsed_ms
+            _stats["connect_time_max_ms"] = max(
+                _stats["connect_time_max_ms"], elapsed_ms
+            )
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        sql_span = span("sql")
+        conn.info.setdefault("sql_spans", []).append((sql_span, sql_span.__enter__()))
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def on_after_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        sql_span, current = conn.info["sql_spans"].pop()
+        current.items = cursor.rowcount if cursor.rowcount >= 0 else None
+        sql_span.__exit__(None, None, None)
+
+    @event.listens_for(engine, "handle_error")
+    def on_handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("sql_spans"):
+            sql_span, _ = conn.info["sql_spans"].pop()
+            error = exception_context.original_exception
+            sql_span.__exit__(type(error), error, error.__traceback__)
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        with _stats_lock:
+            _stats["checkouts"] += 1
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        with _stats_lock:
+            _stats["checkins"] += 1
+
+
+def get_engine() -> Engine:
+    """Return the process-wide engine, creating it on first use"""
+    global _engine, _session_factory
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = create_engine(
+                    os.getenv("DATABASE_URL"),
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_timeout=DB_POOL_TIMEOUT,
+                    pool_recycle=DB_POOL_RECYCLE,
+                    pool_pre_ping=DB_POOL_PRE_PING,
+                )
+                _register_pool_listeners(engine)
+                _session_factory = sessionmaker(bind=engine)
+                _engine = engine
+                if DB_CHECK_INDEXES:
+                    warn_missing_indexes(engine)
+    return _engine
+
+
+def find_missing_indexes(engine: Engine) -> List[str]:
+    """Return the expected dashboard indexes that do not exist in the database"""
+    query = text(
+        """
+        SELECT indexname
+        FROM pg_indexes
+        WHERE schemaname = current_schema()
+          AND tablename IN :tables
+    """
+    ).bindparams(bindparam("tables", expanding=True))
+
+    with engine.connect() as connection:
+        rows = connection.execute(query, {"tables": list(EXPECTED_INDEXES)})
+        existing = {row.indexname for row in rows}
+
+    return [
+        index
+        for indexes in EXPECTED_INDEXES.values()
+        for index in indexes
+        if index not in existing
+    ]
+
+
+def warn_missing_indexes(engine: Engine) -> None:
+    """Log a warning when the dashboard indexes have not been created"""
+    try:
+        missing = find_missing_indexes(engine)
+    except SQLAlchemyError as e:
+        logger.warning("Could not check database indexes: %s", e)
+        return
+    if missing:
+        logger.warning(
+            "Missing database indexes %s; dashboard queries will scan whole "
+            "tables. Apply prisma/dashboard_indexes.sql (e.g. `npx prisma db "
+            "execute --file prisma/dashboard_indexes.sql --schema "
+            "prisma/schema.prisma`).",
+            ", ".join(missing),
+        )
+
+
+@contextmanager
+def get_session() -> Iterator[Session]:
+    """Yield a session bound to the shared engine and always close it"""
+    get_engine()
+    session = _session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_pool_stats() -> Dict[str, float]:
+    """Return connection pool counters for the shared engine"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["connect_time_avg_ms"] = (
+        stats["connect_time_total_ms"] / stats["connects"] if stats["connects"] else 0.0
+    )
+    if _engine is not None:
+        pool = _engine.pool
+        stats["pool_size"] = pool.size()
+        stats["checked_out"] = pool.checkedout()
+        stats["overflow"] = pool.overflow()
+    return stats
+
+
+def dispose_engine() -> None:
+    """Close all pooled connections and drop the shared engine"""
+    global _engine, _session_factory
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _session_factory = None
@@ -0,0 +1,104 @@
+import os
+import functools
+from contextlib import contextmanager
+from typing import Callable, Iterator, List
+
+import pandas as pd
+import streamlit as st
+
+from utils.db import get_pool_stats
+from utils.instrumentation import (
+    DASHBOARD_DEBUG,
+    SpanRecord,
+    finish_rerun,
+    prometheus_text,
+    rerun_active,
+    span,
+    start_rerun,
+)
+
+
+def debug_enabled() -> bool:
+    """Return whether the timing panel is shown (DASHBOARD_DEBUG or ?debug=1)"""
+    return DASHBOARD_DEBUG or st.query_params.get("debug") == "1"
+
+
+def create_span_table(spans: List[SpanRecord]) -> pd.DataFrame:
+    """Create a DataFrame of spans in start order, indented by nesting depth"""
+    spans = sorted(spans, key=lambda span: span["start_ms"])
+    return pd.DataFrame(
+        {
+            "Span": [" " * span["depth"] + span["name"] for span in spans],
+            "ms": [span["duration_ms"] for span in spans],
+            "Items": [span["items"] for span in spans],
+        }
+    )
+
+
+def render_debug_panel(
+    spans: List[SpanRecord], total_ms: float, container=None, key: str = "debug"
+) -> None:
+    """Show the rerun's span timings, in the sidebar unless a container is given"""
+    container = st.sidebar if container is None else container
+    with container.expander("Timings", expanded=container is st.sidebar):
+        st.caption(f"Rerun: {total_ms:.0f} ms, {len(spans)} spans")
+        st.dataframe(
+            create_span_table(spans).style.format(
+                {"ms": "{:.1f}", "Items": "{:,.0f}"}, na_rep=""
+            ),
+            hide_index=True,
+        )
+        if os.getenv("DATABASE_URL"):
+            st.json(get_pool_stats(), expanded=False)
+        st.download_button(
+            "Prometheus metrics",
+            prometheus_text(),
+            file_name="dashboard_metrics.prom",
+            mime="text/plain",
+            key=f"{key}_prometheus",
+        )
+
+
+@contextmanager
+def instrumented_page(page: str) -> Iterator[None]:
+    """Record the spans of a page rerun and show them when debugging is enabled"""
+    start_rerun(page)
+    try:
+        yield
+    finally:
+        spans, total_ms = finish_rerun()
+    if debug_enabled():
+        render_debug_panel(spans, total_ms)
+
+
+def instrumented_fragment(page: str, section: str) -> Callable:
+    """Decorator recording a page section that is an ``st.fragment``
+
+    Within a full page rerun the section is a span of that rerun. When the
+    fragment reruns on its own, it is recorded as a rerun of its own and its
+    timings are shown inside the section, as fragments cannot write to the
+    sidebar.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if rerun_active():
+                with span(f"section: {section}"):
+                    return func(*args, **kwargs)
+
+            start_rerun(f"{page}: {section}")
+            try:
+                with span(f"section: {section}"):
+                    result = func(*args, **kwargs)
+            finally:
+                spans, total_ms = finish_rerun()
+            if debug_enabled():
+                render_debug_panel(
+                    spans, total_ms, container=st, key=f"debug_{section}"
+                )
+            return result
+
+        return wrapper
+
+    return decorate
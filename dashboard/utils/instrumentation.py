@@ -0,0 +1,226 @@
+import os
+import json
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypedDict
+
+import pandas as pd
+
+# Shows the timing panel in the sidebar (also enabled with ?debug=1)
+DASHBOARD_DEBUG = os.getenv("DASHBOARD_DEBUG", "false").lower() in ("1", "true", "yes")
+# Appends every rerun's spans as JSON lines to this file
+INSTRUMENTATION_LOG_PATH = os.getenv("INSTRUMENTATION_LOG_PATH")
+# Rewrites cumulative span metrics in Prometheus text format to this file
+INSTRUMENTATION_PROMETHEUS_PATH = os.getenv("INSTRUMENTATION_PROMETHEUS_PATH")
+
+
+class SpanRecord(TypedDict):
+    name: str
+    depth: int
+    start_ms: float
+    duration_ms: float
+    items: Optional[int]
+    error: bool
+
+
+class Span:
+    """A running span; set ``items`` to record the size of its payload"""
+
+    __slots__ = ("name", "items")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items: Optional[int] = None
+
+
+class _Trace(threading.local):
+    def __init__(self):
+        self.page: Optional[str] = None
+        self.started: Optional[float] = None
+        self.depth = 0
+        self.spans: List[SpanRecord] = []
+
+
+_trace = _Trace()
+
+# Cumulative count, total seconds, max seconds and items per span name
+_totals_lock = threading.Lock()
+_totals: Dict[str, Dict[str, float]] = {}
+
+
+def payload_size(value: Any) -> Optional[int]:
+    """Return the number of rows or items of a loaded value, if it has one"""
+    if isinstance(value, dict) and isinstance(value.get("results"), list):
+        return len(value["results"])
+    if isinstance(value, tuple) and value:
+        return payload_size(value[0])
+    if isinstance(value, (pd.DataFrame, pd.Series, list, dict, str, bytes)):
+        return len(value)
+    return None
+
+
+def _record(name: str, started: float, depth: int, items, error: bool) -> None:
+    elapsed = time.perf_counter() - started
+    with _totals_lock:
+        totals = _totals.setdefault(
+            name, {"count": 0, "seconds": 0.0, "max_seconds": 0.0, "items": 0}
+        )
+        totals["count"] += 1
+        totals["seconds"] += elapsed
+        totals["max_seconds"] = max(totals["max_seconds"], elapsed)
+        totals["items"] += items or 0
+
+    # Spans outside a rerun (e.g. prefetch threads) only count towards totals
+    if _trace.started is not None:
+        _trace.spans.append(
+            {
+                "name": name,
+                "depth": depth,
+                "start_ms": (started - _trace.started) * 1000,
+                "duration_ms": elapsed * 1000,
+                "items": items,
+                "error": error,
+            }
+        )
+
+
+@contextmanager
+def span(name: str) -> Iterator[Span]:
+    """Time a block of code as a span of the current rerun"""
+    current = Span(name)
+    depth = _trace.depth
+    _trace.depth += 1
+    started = time.perf_counter()
+    error = False
+    try:
+        yield current
+    except BaseException:
+        error = True
+        raise
+    finally:
+        _trace.depth = depth
+        _record(name, started, depth, current.items, error)
+
+
+def instrumented(
+    func: Optional[Callable] = None,
+    *,
+    name: Optional[str] = None,
+    size: Callable[[Any], Optional[int]] = payload_size,
+):
+    """Decorator recording each call as a span named after the function
+
+    The span's ``items`` is ``size(result)``, by default the number of rows
+    or items returned.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name) as current:
+                result = func(*args, **kwargs)
+                current.items = size(result)
+                return result
+
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def start_rerun(page: str) -> None:
+    """Start collecting the spans of a script rerun on the current thread"""
+    _trace.page = page
+    _trace.started = time.perf_counter()
+    _trace.depth = 0
+    _trace.spans = []
+
+
+def rerun_active() -> bool:
+    """Return whether spans are being collected for a rerun on this thread"""
+    return _trace.started is not None
+
+
+def get_rerun_spans() -> List[SpanRecord]:
+    """Return the spans recorded so far in the current rerun, in completion order"""
+    return list(_trace.spans)
+
+
+def finish_rerun() -> Tuple[List[SpanRecord], float]:
+    """Stop collecting spans, export them if configured
+
+    Returns the rerun's spans and its total duration in ms.
+    """
+    spans = get_rerun_spans()
+    total_ms = 0.0
+    if _trace.started is not None:
+        total_ms = (time.perf_counter() - _trace.started) * 1000
+        if INSTRUMENTATION_LOG_PATH:
+            write_log(INSTRUMENTATION_LOG_PATH, _trace.page, total_ms, spans)
+        if INSTRUMENTATION_PROMETHEUS_PATH:
+            write_prometheus(INSTRUMENTATION_PROMETHEUS_PATH)
+    _trace.started = None
+    return spans, total_ms
+
+
+def write_log(
+    path: str, page: Optional[str], total_ms: float, spans: List[SpanRecord]
+) -> None:
+    """Append a rerun as one JSON line"""
+    line = json.dumps(
+        {"time": time.time(), "page": page, "total_ms": total_ms, "spans": spans}
+    )
+    try:
+        with open(path, "a") as f:
+            f.write(line + "\n")
+    except OSError:
+        # An unwritable log must not break the page
+        pass
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    """Return the cumulative span metrics in Prometheus text exposition format"""
+    with _totals_lock:
+        totals = {name: dict(values) for name, values in _totals.items()}
+
+    metrics = [
+        ("dashboard_span_seconds_total", "counter", "Time spent in spans", "seconds"),
+        ("dashboard_span_calls_total", "counter", "Number of span calls", "count"),
+        ("dashboard_span_items_total", "counter", "Rows or items loaded", "items"),
+        ("dashboard_span_max_seconds", "gauge", "Slowest span call", "max_seconds"),
+    ]
+    lines = []
+    for metric, kind, help_text, key in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        for name in sorted(totals):
+            value = totals[name][key]
+            lines.append(f'{metric}{{span="{_escape_label(name)}"}} {value:g}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    """Atomically rewrite a Prometheus textfile-collector file"""
+    target = Path(path)
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(prometheus_text())
+        os.replace(tmp_path, target)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def reset_totals() -> None:
+    """Drop the cumulative span metrics"""
+    with _totals_lock:
+        _totals.clear()
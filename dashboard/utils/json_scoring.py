@@ -0,0 +1,522 @@
+import os
+import json
+import argparse
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypedDict
+
+import pandas as pd
+
+from utils.data_loader import iter_results_for_run
+from utils.parallel import SCORING_CHUNK_SIZE, SCORING_WORKERS, process_map
+
+JSON_SCORES_NAME = "json_scores.jsonl"
+JSON_SCORES_DIR = os.getenv("JSON_SCORES_DIR", ".cache/json_scores")
+
+_MISSING = object()
+
+
+class DiffStats(TypedDict):
+    additions: int
+    deletions: int
+    modifications: int
+    total: int
+
+
+class AccuracyResult(TypedDict):
+    score: float
+    jsonDiff: Dict[str, Any]
+    fullJsonDiff: Dict[str, Any]
+    jsonDiffStats: DiffStats
+    totalFields: int
+
+
+def _type_of(value: Any) -> str:
+    """Return the JavaScript type name json-diff compares values by"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def _is_scalar(value: Any) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _js_string(value: Any) -> str:
+    """Return ``String(value)`` as JavaScript would, for array sorting"""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        if float(value).is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        mantissa, _, exponent = repr(float(value)).partition("e")
+        if not exponent or not -7 < int(exponent) < 21:
+            return mantissa + (f"e{int(exponent):+d}" if exponent else "")
+        # Between 1e-7 and 1e21 JavaScript writes plain decimals
+        sign = "-" if mantissa.startswith("-") else ""
+        digits = mantissa.lstrip("-").replace(".", "")
+        return f"{sign}0.{'0' * (-int(exponent) - 1)}{digits}"
+    return str(value)
+
+
+def _sort_key(token: Tuple[str, Any]) -> bytes:
+    # JavaScript's default sort compares UTF-16 code units of String(value)
+    tag, value = token
+    text = value if tag == "key" else _js_string(value)
+    return text.encode("utf-16-be", "surrogatepass")
+
+
+class _JsonDiff:
+    """Port of the structural diff of the json-diff npm package (v1)
+
+    Array items are aligned with difflib's SequenceMatcher, like the
+    package's own difflib port. Objects inside arrays are replaced by
+    placeholder keys, and each object of the second array reuses the key of
+    its most similar object in the first, so moved objects are matched.
+    """
+
+    def __init__(self, full: bool = False, sort: bool = True):
+        self.full = full
+        self.sort = sort
+
+    def diff(self, obj1: Any, obj2: Any) -> Tuple[float, Any, bool]:
+        """Return (similarity score, diff result, equal) of two JSON values"""
+        type1, type2 = _type_of(obj1), _type_of(obj2)
+        if type1 == type2 == "object":
+            return self.object_diff(obj1, obj2)
+        if type1 == type2 == "array":
+            return self.array_diff(obj1, obj2)
+
+        if type1 == type2 and obj1 == obj2:
+            return 100, obj1 if self.full else _MISSING, True
+        return 0, {"__old": obj1, "__new": obj2}, False
+
+    def object_diff(self, obj1: Dict, obj2: Dict) -> Tuple[float, Any, bool]:
+        result = {}
+        score = 0.0
+        equal = True
+
+        for key, value in obj1.items():
+            if key not in obj2:
+                result[f"{key}__deleted"] = value
+                score -= 30
+                equal = False
+
+        for key, value in obj2.items():
+            if key not in obj1:
+                result[f"{key}__added"] = value
+                score -= 30
+                equal = False
+
+        for key, value1 in obj1.items():
+            if key not in obj2:
+                continue
+            score += 20
+            change_score, change, change_equal = self.diff(value1, obj2[key])
+            if not change_equal:
+                result[key] = change
+                equal = False
+            elif self.full:
+                result[key] = value1
+            score += min(20, max(-10, change_score / 5))
+
+        if equal:
+            score = 100 * max(len(obj1), 0.5)
+            if not self.full:
+                result = _MISSING
+        else:
+            score = max(0, score)
+        return score, result, equal
+
+    def _find_matching_object(
+        self, item: Any, index: int, fuzzy_originals: Dict[str, Tuple[Any, int]]
+    ) -> Optional[Tuple[float, str]]:
+        best = None
+        for key, (candidate, match_index) in fuzzy_originals.items():
+            if _type_of(item) != _type_of(candidate):
+                continue
+            score = self.diff(item, candidate)[0]
+            distance = abs(match_index - index)
+            if (
+                best is None
+                or score > best[0]
+                or (score == best[0] and distance < best[2])
+            ):
+                best = (score, key, distance)
+        if best is None:
+            return None
+        return best[0], best[1]
+
+    def _scalarize(
+        self,
+        array: List[Any],
+        originals: Dict[str, Tuple[Any, int]],
+        counter: List[int],
+        fuzzy_originals: Optional[Dict[str, Tuple[Any, int]]] = None,
+    ) -> List[Tuple[str, Any]]:
+        fuzzy_matches: Dict[int, str] = {}
+        if fuzzy_originals is not None:
+            # Each original object goes to the item that resembles it most
+            key_scores: Dict[str, Tuple[float, int]] = {}
+            for index, item in enumerate(array):
+                if _is_scalar(item):
+                    continue
+                match = self._find_matching_object(item, index, fuzzy_originals)
+                if match and (
+                    match[1] not in key_scores or match[0] > key_scores[match[1]][0]
+                ):
+                    key_scores[match[1]] = (match[0], index)
+            for key, (_, index) in key_scores.items():
+                fuzzy_matches[index] = key
+
+        sequence = []
+        for index, item in enumerate(array):
+            if _is_scalar(item):
+                # Tagged so that e.g. true and 1 stay distinct, as in JavaScript
+                sequence.append((_type_of(item), item))
+            else:
+                key = fuzzy_matches.get(index)
+                if key is None:
+                    key = f"__$!SCALAR{counter[0]}"
+                    counter[0] += 1
+                originals[key] = (item, index)
+                sequence.append(("key", key))
+        return sequence
+
+    def array_diff(self, obj1: List, obj2: List) -> Tuple[float, Any, bool]:
+        counter = [1]
+        originals1: Dict[str, Tuple[Any, int]] = {}
+        seq1 = self._scalarize(obj1, originals1, counter)
+        originals2: Dict[str, Tuple[Any, int]] = {}
+        seq2 = self._scalarize(obj2, originals2, counter, originals1)
+
+        if self.sort:
+            seq1.sort(key=_sort_key)
+            seq2.sort(key=_sort_key)
+
+        def descalarize(token, originals):
+            return originals[token[1]][0] if token[0] == "key" else token[1]
+
+        opcodes = SequenceMatcher(None, seq1, seq2).get_opcodes()
+        result = []
+        score = 0.0
+        all_equal = True
+
+        for op, i1, i2, j1, j2 in opcodes:
+            if op != "equal":
+                all_equal = False
+
+            if op == "equal":
+                for token in seq1[i1:i2]:
+                    if token[0] == "key":
+                        _, change, change_equal = self.diff(
+                            descalarize(token, originals1),
+                            descalarize(token, originals2),
+                        )
+                        if not change_equal:
+                            result.append(["~", change])
+                            all_equal = False
+                            score += 10
+                            continue
+                    if self.full:
+                        result.append([" ", descalarize(token, originals1)])
+                    else:
+                        result.append([" "])
+                    score += 10
+                continue
+
+            if op in ("delete", "replace"):
+                for token in seq1[i1:i2]:
+                    result.append(["-", descalarize(token, originals1)])
+                    score -= 5
+            if op in ("insert", "replace"):
+                for token in seq2[j1:j2]:
+                    result.append(["+", descalarize(token, originals2)])
+                    score -= 5
+
+        if all_equal or not opcodes:
+            return 100, obj1 if self.full else _MISSING, True
+        return max(0, score), result, False
+
+
+def json_diff(obj1: Any, obj2: Any, full: bool = False, sort: bool = True) -> Any:
+    """Return the json-diff of two JSON values, or None when they are equal"""
+    result = _JsonDiff(full=full, sort=sort).diff(obj1, obj2)[1]
+    return None if result is _MISSING else result
+
+
+def count_total_fields(obj: Any) -> int:
+    """Count primitive fields like ``countTotalFields`` in src/evaluation/json.ts"""
+    count = 0
+
+    def traverse(current: Any) -> None:
+        nonlocal count
+        if not current or _is_scalar(current):
+            return
+        if isinstance(current, list):
+            for item in current:
+                if isinstance(item, (dict, list)):
+                    traverse(item)
+                else:
+                    count += 1
+            return
+        for key, value in current.items():
+            # Skip diff metadata keys
+            if "__" in key:
+                continue
+            if _is_scalar(value):
+                count += 1
+            else:
+                traverse(value)
+
+    traverse(obj)
+    return count
+
+
+def count_changes(diff_result: Any) -> DiffStats:
+    """Count diff operations like ``countChanges`` in src/evaluation/json.ts"""
+    changes: DiffStats = {
+        "additions": 0,
+        "deletions": 0,
+        "modifications": 0,
+        "total": 0,
+    }
+
+    def traverse(obj: Any) -> None:
+        if not obj or _is_scalar(obj):
+            return
+        # for...in over an array visits its items
+        entries = obj.items() if isinstance(obj, dict) else enumerate(obj)
+        for key, value in entries:
+            if isinstance(value, list):
+                for item in value:
+                    if not isinstance(item, list) or len(item) != 2:
+                        continue
+                    operation, element = item
+                    if _is_scalar(element):
+                        if operation == "+":
+                            changes["additions"] += 1
+                        elif operation == "-":
+                            changes["deletions"] += 1
+                    elif operation == "+":
+                        changes["additions"] += count_total_fields(element)
+                    elif operation == "-":
+                        changes["deletions"] += count_total_fields(element)
+                    elif operation == "~":
+                        traverse(element)
+            elif str(key).endswith("__deleted"):
+                if _is_scalar(value):
+                    changes["deletions"] += 1
+                else:
+                    changes["deletions"] += count_total_fields(value)
+            elif str(key).endswith("__added"):
+                if _is_scalar(value):
+                    changes["additions"] += 1
+                else:
+                    changes["additions"] += count_total_fields(value)
+            elif isinstance(value, dict):
+                if "__old" in value and "__new" in value:
+                    if value["__old"] is None and value["__new"] is not None:
+                        changes["modifications"] += (
+                            count_total_fields(value["__new"]) or 1
+                        )
+                    else:
+                        changes["modifications"] += (
+                            count_total_fields(value["__old"]) or 1
+                        )
+                else:
+                    traverse(value)
+
+    traverse(diff_result)
+    changes["total"] = (
+        changes["additions"] + changes["deletions"] + changes["modifications"]
+    )
+    return changes
+
+
+def _to_uppercase(obj: Any) -> Any:
+    """Uppercase string values like ``convertStringsToUppercase``
+
+    As in the TypeScript version, strings directly inside arrays are kept.
+    """
+    if isinstance(obj, list):
+        return [_to_uppercase(item) for item in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {
+        key: value.upper() if isinstance(value, str) else _to_uppercase(value)
+        for key, value in obj.items()
+    }
+
+
+def calculate_json_accuracy(
+    actual: Dict[str, Any], predicted: Dict[str, Any], ignore_cases: bool = False
+) -> AccuracyResult:
+    """Return the accuracy of ``calculateJsonAccuracy`` in src/evaluation/json.ts
+
+    The score is 1 - (additions + deletions + modifications) / fields in
+    ``actual``, rounded to 4 decimals.
+    """
+    if ignore_cases:
+        actual = _to_uppercase(actual)
+        predicted = _to_uppercase(predicted)
+
+    diff_result = json_diff(actual, predicted)
+    total_fields = count_total_fields(actual)
+
+    if diff_result is None:
+        return {
+            "score": 1,
+            "jsonDiff": {},
+            "fullJsonDiff": {},
+            "jsonDiffStats": count_changes({}),
+            "totalFields": total_fields,
+        }
+
+    changes = count_changes(diff_result)
+    score = max(0, 1 - changes["total"] / total_fields) if total_fields else 0
+    return {
+        "score": round(score, 4),
+        "jsonDiff": diff_result,
+        "fullJsonDiff": json_diff(actual, predicted, full=True),
+        "jsonDiffStats": changes,
+        "totalFields": total_fields,
+    }
+
+
+def get_json_scores_path(
+    timestamp: str, results_dir: str = "results", from_db: bool = False
+) -> Path:
+    """Return where re-evaluated JSON scores of a run are written
+
+    Folder runs keep them next to results.json; database runs are keyed by
+    timestamp under ``JSON_SCORES_DIR``.
+    """
+    if from_db:
+        return Path(JSON_SCORES_DIR) / f"{timestamp}.jsonl"
+    return Path(results_dir) / timestamp / JSON_SCORES_NAME
+
+
+def _score_result(item: Tuple[str, Optional[float], Any, Any, bool]) -> Dict[str, Any]:
+    id, stored, true_json, predicted_json, ignore_cases = item
+    accuracy = calculate_json_accuracy(true_json, predicted_json, ignore_cases)
+    return {
+        "id": id,
+        "storedJsonAccuracy": stored,
+        "jsonAccuracy": accuracy["score"],
+        "jsonDiffStats": accuracy["jsonDiffStats"],
+        "totalFields": accuracy["totalFields"],
+        "jsonDiff": accuracy["jsonDiff"],
+    }
+
+
+def rescore_json_results(
+    results: Iterable[Dict[str, Any]],
+    ignore_cases: bool = False,
+    workers: int = SCORING_WORKERS,
+    chunk_size: int = SCORING_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """Yield re-evaluated JSON accuracy for results, computed across processes
+
+    Results without a predicted JSON are skipped, as during a benchmark run.
+    """
+    items = (
+        (
+            str(result.get("id")),
+            result.get("jsonAccuracy"),
+            result.get("trueJson") or {},
+            result["predictedJson"],
+            ignore_cases,
+        )
+        for result in results
+        if result.get("predictedJson")
+    )
+    return process_map(_score_result, items, workers, chunk_size)
+
+
+def rescore_json_run(
+    timestamp: str,
+    output_path: Optional[Path] = None,
+    ignore_cases: bool = False,
+    workers: int = SCORING_WORKERS,
+) -> Path:
+    """Re-evaluate the JSON accuracy of a stored run into a JSON Lines file
+
+    One line is written per result as scores come in, so memory stays
+    bounded for large runs. Returns the path of the file.
+    """
+    if output_path is None:
+        output_path = get_json_scores_path(
+            timestamp, from_db=bool(os.getenv("DATABASE_URL"))
+        )
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    results = iter_results_for_run(
+        timestamp, ["id", "jsonAccuracy", "trueJson", "predictedJson"]
+    )
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        for row in rescore_json_results(results, ignore_cases, workers):
+            f.write(json.dumps(row) + "\n")
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def read_json_scores(path: Path) -> pd.DataFrame:
+    """Read a JSON scores file into one row per result, without the diffs"""
+    rows = []
+    with open(path) as f:
+        for line in f:
+            row = json.loads(line)
+            stats = row["jsonDiffStats"]
+            rows.append(
+                {
+                    "id": row["id"],
+                    "stored_json_accuracy": row["storedJsonAccuracy"],
+                    "json_accuracy": row["jsonAccuracy"],
+                    "total_fields": row["totalFields"],
+                    "additions": stats["additions"],
+                    "deletions": stats["deletions"],
+                    "modifications": stats["modifications"],
+                    "json_diff_total": stats["total"],
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-evaluate JSON accuracy and diff stats for a stored run"
+    )
+    parser.add_argument("timestamp", help="Run timestamp, e.g. 2025-01-01-00-00-00")
+    parser.add_argument("--workers", type=int, default=SCORING_WORKERS)
+    parser.add_argument("--output", help="JSON Lines file to write")
+    parser.add_argument(
+        "--ignore-cases", action="store_true", help="Compare strings case-insensitively"
+    )
+    args = parser.parse_args()
+
+    path = rescore_json_run(
+        args.timestamp,
+        args.output,
+        ignore_cases=args.ignore_cases,
+        workers=args.workers,
+    )
+    scores = read_json_scores(path)
+    changed = 0
+    # Runs without extractions produce no scores (and no columns)
+    if not scores.empty:
+        stored = scores["stored_json_accuracy"]
+        changed = (stored.notna() & (scores["json_accuracy"] != stored)).sum()
+    print(f"Wrote {len(scores)} scores to {path} ({changed} differ from stored)")
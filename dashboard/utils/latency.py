@@ -0,0 +1,167 @@
+import os
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import model_combination_labels
+from utils.instrumentation import instrumented
+
+# Percentiles reported for every model combination and phase
+LATENCY_PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+LATENCY_STATS_COLUMNS = ["count"] + [f"p{round(q * 100)}" for q in LATENCY_PERCENTILES]
+# Relative error of sketched percentiles and width of histogram buckets
+LATENCY_SKETCH_ACCURACY = float(os.getenv("LATENCY_SKETCH_ACCURACY", "0.01"))
+
+# Metrics table duration column (in ms) of each phase
+LATENCY_PHASES = {"OCR": "ocr_duration", "Extraction": "extraction_duration"}
+
+
+def sketch_gamma(relative_accuracy: float = LATENCY_SKETCH_ACCURACY) -> float:
+    """Return the ratio between consecutive bucket bounds for an accuracy"""
+    return (1 + relative_accuracy) / (1 - relative_accuracy)
+
+
+def bucket_value(index: int, gamma: float) -> float:
+    """Return the representative value of bucket ``index``"""
+    return 2 * gamma**index / (gamma + 1)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch)
+
+    Positive values are counted in logarithmic buckets ``(gamma^(i-1),
+    gamma^i]``, so any quantile is within ``relative_accuracy`` of the exact
+    value while memory only grows with the log of the value range. Zero and
+    negative values share one bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = LATENCY_SKETCH_ACCURACY):
+        self.gamma = sketch_gamma(relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, values: Iterable[float]) -> None:
+        """Count values; NaN values are ignored"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        positive = values[values > 0]
+        self.zero_count += len(values) - len(positive)
+        self.count += len(values)
+
+        indexes, counts = np.unique(
+            np.ceil(np.log(positive) / self._log_gamma).astype(np.int64),
+            return_counts=True,
+        )
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def add_bucket(self, index: Optional[int], count: int) -> None:
+        """Count values already bucketed elsewhere; ``None`` is the zero bucket"""
+        if index is None:
+            self.zero_count += count
+        else:
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the counts of a sketch built with the same accuracy"""
+        if not math.isclose(other.gamma, self.gamma):
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate ``q`` quantile, or NaN if the sketch is empty"""
+        if self.count == 0:
+            return float("nan")
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return bucket_value(index, self.gamma)
+        return bucket_value(max(self.buckets), self.gamma)
+
+    def histogram(self) -> pd.DataFrame:
+        """Return the bucket values and their counts, in increasing order"""
+        indexes = sorted(self.buckets)
+        values = [bucket_value(index, self.gamma) for index in indexes]
+        counts = [self.buckets[index] for index in indexes]
+        if self.zero_count:
+            values.insert(0, 0.0)
+            counts.insert(0, self.zero_count)
+        return pd.DataFrame({"latency": values, "count": counts})
+
+
+def compute_latency_sketches(
+    metrics: pd.DataFrame,
+) -> Dict[Tuple[str, str], QuantileSketch]:
+    """Sketch latencies in seconds per (model combination, phase)
+
+    Errored tests and tests without a duration for a phase are skipped.
+    """
+    valid = metrics[~metrics["has_error"].to_numpy(dtype=bool)]
+    labels = model_combination_labels(valid)
+
+    sketches = {}
+    for phase, column in LATENCY_PHASES.items():
+        durations = valid[column] / 1000
+        if phase == "Extraction":
+            durations = durations.where(valid["has_extraction"].to_numpy(dtype=bool))
+        for label, values in durations.groupby(labels, sort=False):
+            values = values.dropna()
+            if values.empty:
+                continue
+            sketch = QuantileSketch()
+            sketch.add(values.to_numpy())
+            sketches[(label, phase)] = sketch
+    return sketches
+
+
+def summarize_latency_sketches(
+    sketches: Dict[Tuple[str, str], QuantileSketch],
+) -> pd.DataFrame:
+    """Return count and percentiles per (model combination, phase)"""
+    rows = [
+        [label, phase, sketch.count] + [sketch.quantile(q) for q in LATENCY_PERCENTILES]
+        for (label, phase), sketch in sketches.items()
+    ]
+    return latency_stats_frame(rows)
+
+
+def latency_histograms(
+    sketches: Dict[Tuple[str, str], QuantileSketch],
+) -> pd.DataFrame:
+    """Return the latency histogram of every (model combination, phase)"""
+    frames = []
+    for (label, phase), sketch in sketches.items():
+        histogram = sketch.histogram()
+        histogram.insert(0, "Model Combination", label)
+        histogram.insert(1, "phase", phase)
+        frames.append(histogram)
+    if not frames:
+        return pd.DataFrame(columns=["Model Combination", "phase", "latency", "count"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def latency_stats_frame(rows: List[list]) -> pd.DataFrame:
+    """Build the percentile frame from [label, phase, count, *percentiles] rows"""
+    stats = pd.DataFrame(
+        rows, columns=["Model Combination", "phase"] + LATENCY_STATS_COLUMNS
+    )
+    return stats.astype({"count": int}).set_index(["Model Combination", "phase"])
+
+
+@instrumented
+def compute_latency_stats(metrics: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return latency percentiles and histograms from a run's metrics table"""
+    sketches = compute_latency_sketches(metrics)
+    return summarize_latency_sketches(sketches), latency_histograms(sketches)
@@ -0,0 +1,296 @@
+import os
+import time
+from difflib import SequenceMatcher
+from html import escape
+from typing import Dict, List, Optional, Tuple, TypedDict
+
+from utils.cache import TTLCache
+
+# Diff budgets, overridable through the environment
+MARKDOWN_DIFF_MAX_LINES = int(os.getenv("MARKDOWN_DIFF_MAX_LINES", "20000"))
+MARKDOWN_DIFF_MAX_EDITS = int(os.getenv("MARKDOWN_DIFF_MAX_EDITS", "2000"))
+MARKDOWN_DIFF_TIMEOUT = float(os.getenv("MARKDOWN_DIFF_TIMEOUT", "1.0"))  # seconds
+MARKDOWN_DIFF_CONTEXT = int(os.getenv("MARKDOWN_DIFF_CONTEXT", "3"))  # lines
+MARKDOWN_DIFF_MAX_ROWS = int(os.getenv("MARKDOWN_DIFF_MAX_ROWS", "2000"))
+MARKDOWN_DIFF_CACHE_SIZE = int(os.getenv("MARKDOWN_DIFF_CACHE_SIZE", "64"))
+
+# Intra-line highlighting is skipped for longer lines
+_INLINE_DIFF_MAX_CHARS = 1000
+
+# (tag, i1, i2, j1, j2) as returned by difflib.SequenceMatcher.get_opcodes
+Opcode = Tuple[str, int, int, int, int]
+
+_diff_cache = TTLCache(maxsize=MARKDOWN_DIFF_CACHE_SIZE, ttl=None)
+
+
+class MarkdownDiff(TypedDict):
+    html: str
+    added: int
+    removed: int
+    truncated: bool
+
+
+def _myers_matches(
+    a: List[int], b: List[int], max_edits: int, deadline: float
+) -> Optional[List[Tuple[int, int, int]]]:
+    """Return the matching blocks of a shortest edit script between a and b
+
+    Greedy O((N+M)D) Myers diff. Returns None when more than ``max_edits``
+    edits are needed or ``deadline`` (a perf_counter value) has passed.
+    """
+    n, m = len(a), len(b)
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, max_edits) + 1):
+        if time.perf_counter() > deadline:
+            return None
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    return None
+
+
+def _backtrack(
+    trace: List[Dict[int, int]], n: int, m: int
+) -> List[Tuple[int, int, int]]:
+    """Walk the Myers trace back from (n, m) and collect the diagonal snakes"""
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if d == 0:
+            prev_x, prev_y = 0, 0
+        else:
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                prev_k = k + 1
+            else:
+                prev_k = k - 1
+            prev_x = v[prev_k]
+            prev_y = prev_x - prev_k
+        # The snake starts after the single edit made at this step
+        snake = min(x - prev_x, y - prev_y)
+        if snake > 0:
+            matches.append((x - snake, y - snake, snake))
+        x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+
+def _opcodes(matches: List[Tuple[int, int, int]], n: int, m: int) -> List[Opcode]:
+    """Turn matching blocks into difflib-style opcodes"""
+    opcodes = []
+    i = j = 0
+    for a_start, b_start, size in matches + [(n, m, 0)]:
+        if i < a_start and j < b_start:
+            opcodes.append(("replace", i, a_start, j, b_start))
+        elif i < a_start:
+            opcodes.append(("delete", i, a_start, j, j))
+        elif j < b_start:
+            opcodes.append(("insert", i, i, j, b_start))
+        if size:
+            opcodes.append(("equal", a_start, a_start + size, b_start, b_start + size))
+        i, j = a_start + size, b_start + size
+    return opcodes
+
+
+def diff_lines(
+    a: List[str],
+    b: List[str],
+    max_lines: int = MARKDOWN_DIFF_MAX_LINES,
+    max_edits: int = MARKDOWN_DIFF_MAX_EDITS,
+    timeout: float = MARKDOWN_DIFF_TIMEOUT,
+) -> Tuple[List[Opcode], bool]:
+    """Return line opcodes between a and b and whether the diff was truncated
+
+    Common leading and trailing lines are trimmed, the remaining lines are
+    hashed to integers and aligned with Myers' algorithm. When either side
+    exceeds ``max_lines`` or the alignment exceeds ``max_edits`` or
+    ``timeout`` seconds, the unaligned middle is reported as one replaced
+    block instead.
+    """
+    deadline = time.perf_counter() + timeout
+    n, m = len(a), len(b)
+
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < n - prefix
+        and suffix < m - prefix
+        and a[n - 1 - suffix] == b[m - 1 - suffix]
+    ):
+        suffix += 1
+
+    a_middle = a[prefix : n - suffix]
+    b_middle = b[prefix : m - suffix]
+
+    matches = None
+    if len(a_middle) <= max_lines and len(b_middle) <= max_lines:
+        line_ids: Dict[str, int] = {}
+        a_ids = [line_ids.setdefault(line, len(line_ids)) for line in a_middle]
+        b_ids = [line_ids.setdefault(line, len(line_ids)) for line in b_middle]
+        if set(a_ids).isdisjoint(b_ids):
+            # Nothing to align, e.g. one side is empty
+            matches = []
+        else:
+            matches = _myers_matches(a_ids, b_ids, max_edits, deadline)
+
+    truncated = matches is None
+    if truncated:
+        matches = []
+    blocks = [(0, 0, prefix)] if prefix else []
+    blocks += [(i + prefix, j + prefix, size) for i, j, size in matches]
+    if suffix:
+        blocks.append((n - suffix, m - suffix, suffix))
+    return _opcodes(blocks, n, m), truncated
+
+
+def _inline_diff(a_line: str, b_line: str) -> Tuple[str, str]:
+    """Return both lines as HTML with the changed characters highlighted"""
+    if len(a_line) > _INLINE_DIFF_MAX_CHARS or len(b_line) > _INLINE_DIFF_MAX_CHARS:
+        return escape(a_line), escape(b_line)
+    a_html, b_html = [], []
+    matcher = SequenceMatcher(None, a_line, b_line, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        a_part, b_part = escape(a_line[i1:i2]), escape(b_line[j1:j2])
+        if tag == "equal":
+            a_html.append(a_part)
+            b_html.append(b_part)
+            continue
+        if a_part:
+            a_html.append(f'<span class="chg">{a_part}</span>')
+        if b_part:
+            b_html.append(f'<span class="chg">{b_part}</span>')
+    return "".join(a_html), "".join(b_html)
+
+
+_HTML_STYLE = """
+<style>
+table.diff {font-family: monospace; font-size: 12px; border-collapse: collapse; width: 100%; table-layout: fixed;}
+table.diff td {padding: 0 4px; white-space: pre-wrap; word-break: break-all; vertical-align: top;}
+table.diff td.num {width: 3.5em; color: #888; text-align: right; user-select: none;}
+table.diff th {background: #f0f0f0; text-align: left; padding: 2px 4px;}
+td.del {background: #ffecec;}
+td.add {background: #eaffea;}
+span.chg {background: #ffcc80;}
+tr.skip td {background: #f6f8fa; color: #888; text-align: center;}
+</style>
+"""
+
+
+def render_side_by_side(
+    a: List[str],
+    b: List[str],
+    opcodes: List[Opcode],
+    context: int = MARKDOWN_DIFF_CONTEXT,
+    max_rows: int = MARKDOWN_DIFF_MAX_ROWS,
+    fromdesc: str = "",
+    todesc: str = "",
+) -> str:
+    """Render opcodes as a side-by-side HTML table
+
+    Unchanged lines further than ``context`` from a change are collapsed, and
+    output stops after ``max_rows`` rows.
+    """
+    rows = []
+
+    def row(i: Optional[int], j: Optional[int], a_cls: str = "", b_cls: str = ""):
+        a_html = escape(a[i]) if i is not None else ""
+        b_html = escape(b[j]) if j is not None else ""
+        if i is not None and j is not None and a_cls:
+            a_html, b_html = _inline_diff(a[i], b[j])
+        rows.append(
+            f'<tr><td class="num">{"" if i is None else i + 1}</td>'
+            f'<td class="{a_cls}">{a_html}</td>'
+            f'<td class="num">{"" if j is None else j + 1}</td>'
+            f'<td class="{b_cls}">{b_html}</td></tr>'
+        )
+
+    def skip(count: int):
+        rows.append(
+            f'<tr class="skip"><td colspan="4">⋯ {count} unchanged lines ⋯</td></tr>'
+        )
+
+    last = len(opcodes) - 1
+    clipped = False
+    for position, (tag, i1, i2, j1, j2) in enumerate(opcodes):
+        if len(rows) >= max_rows:
+            clipped = True
+            break
+        if tag == "equal":
+            head = 0 if position == 0 else context
+            tail = 0 if position == last else context
+            if i2 - i1 > head + tail + 1:
+                for offset in range(head):
+                    row(i1 + offset, j1 + offset)
+                skip(i2 - i1 - head - tail)
+                for offset in range(i2 - i1 - tail, i2 - i1):
+                    row(i1 + offset, j1 + offset)
+            else:
+                for offset in range(i2 - i1):
+                    row(i1 + offset, j1 + offset)
+            continue
+        count = max(i2 - i1, j2 - j1)
+        if count > max_rows - len(rows):
+            count = max_rows - len(rows)
+            clipped = True
+        for offset in range(count):
+            i = i1 + offset if i1 + offset < i2 else None
+            j = j1 + offset if j1 + offset < j2 else None
+            row(i, j, "del" if i is not None else "", "add" if j is not None else "")
+
+    if clipped:
+        del rows[max_rows:]
+        rows.append(
+            '<tr class="skip"><td colspan="4">⋯ remaining lines not shown ⋯</td></tr>'
+        )
+
+    header = (
+        f'<tr><th colspan="2">{escape(fromdesc)}</th>'
+        f'<th colspan="2">{escape(todesc)}</th></tr>'
+    )
+    return (
+        f'{_HTML_STYLE}<table class="diff"><colgroup><col style="width:3.5em"><col>'
+        f'<col style="width:3.5em"><col></colgroup>{header}{"".join(rows)}</table>'
+    )
+
+
+def get_markdown_diff(
+    timestamp: str, id: str, true_markdown: str, predicted_markdown: str
+) -> MarkdownDiff:
+    """Return the rendered line diff of a test case, cached per (run, result id)"""
+    key = (timestamp, str(id))
+    version = (hash(true_markdown), hash(predicted_markdown))
+    cached = _diff_cache.get(key, version)
+    if cached is not None:
+        return cached
+
+    a = true_markdown.splitlines()
+    b = predicted_markdown.splitlines()
+    opcodes, truncated = diff_lines(a, b)
+    diff: MarkdownDiff = {
+        "html": render_side_by_side(
+            a,
+            b,
+            opcodes,
+            fromdesc="True Markdown",
+            todesc="Predicted Markdown",
+        ),
+        "added": sum(j2 - j1 for tag, _, _, j1, j2 in opcodes if tag != "equal"),
+        "removed": sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag != "equal"),
+        "truncated": truncated,
+    }
+    _diff_cache.set(key, diff, version)
+    return diff
@@ -0,0 +1,159 @@
+import os
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.instrumentation import instrumented
+
+METRICS_TABLE_NAME = "metrics.parquet"
+METRICS_CACHE_DIR = os.getenv("METRICS_CACHE_DIR", ".cache/metrics")
+_VERSION_KEY = b"benchmark.run_version"
+
+# Flattened, typed columns of the per-run metrics table
+METRICS_COLUMNS = {
+    "id": "string",
+    "file_url": "string",
+    "ocr_model": "string",
+    "extraction_model": "string",
+    "direct_image_extraction": "bool",
+    "levenshtein_distance": "float64",
+    "json_accuracy": "float64",
+    "has_json_accuracy": "bool",
+    "json_diff_total": "float64",
+    "total_cost": "float64",
+    "duration": "float64",
+    "ocr_cost": "float64",
+    "ocr_duration": "float64",
+    "ocr_input_tokens": "float64",
+    "ocr_output_tokens": "float64",
+    "ocr_started_at": "float64",
+    "ocr_completed_at": "float64",
+    "has_extraction": "bool",
+    "extraction_cost": "float64",
+    "extraction_duration": "float64",
+    "extraction_input_tokens": "float64",
+    "extraction_output_tokens": "float64",
+    "extraction_started_at": "float64",
+    "extraction_completed_at": "float64",
+    "has_error": "bool",
+    "metadata": "string",
+}
+
+
+def _number(value: Any) -> float:
+    return float("nan") if value is None else value
+
+
+@instrumented
+def flatten_results(results: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Flatten result dicts into the typed columns of the metrics table
+
+    Missing or null numbers become NaN; ``has_json_accuracy`` and
+    ``has_extraction`` keep the key-presence checks the aggregations rely on.
+    """
+    columns = {name: [] for name in METRICS_COLUMNS}
+
+    for test in results:
+        if not isinstance(test, dict):
+            continue
+        usage = test.get("usage") or {}
+        ocr = usage.get("ocr") or {}
+        extraction = usage.get("extraction") or {}
+        diff_stats = test.get("jsonDiffStats") or {}
+
+        columns["id"].append(str(test.get("id")))
+        columns["file_url"].append(test.get("fileUrl"))
+        columns["ocr_model"].append(test.get("ocrModel"))
+        columns["extraction_model"].append(test.get("extractionModel"))
+        columns["direct_image_extraction"].append(
+            bool(test.get("directImageExtraction", False))
+        )
+        columns["levenshtein_distance"].append(
+            _number(test.get("levenshteinDistance"))
+        )
+        columns["json_accuracy"].append(_number(test.get("jsonAccuracy")))
+        columns["has_json_accuracy"].append("jsonAccuracy" in test)
+        columns["json_diff_total"].append(_number(diff_stats.get("total")))
+        columns["total_cost"].append(_number(usage.get("totalCost")))
+        columns["duration"].append(_number(usage.get("duration")))
+        columns["ocr_cost"].append(_number(ocr.get("totalCost")))
+        columns["ocr_duration"].append(_number(ocr.get("duration")))
+        columns["ocr_input_tokens"].append(_number(ocr.get("inputTokens")))
+        columns["ocr_output_tokens"].append(_number(ocr.get("outputTokens")))
+        columns["ocr_started_at"].append(_number(ocr.get("startedAt")))
+        columns["ocr_completed_at"].append(_number(ocr.get("completedAt")))
+        columns["has_extraction"].append(bool(extraction))
+        columns["extraction_cost"].append(_number(extraction.get("totalCost")))
+        columns["extraction_duration"].append(_number(extraction.get("duration")))
+        columns["extraction_input_tokens"].append(
+            _number(extraction.get("inputTokens"))
+        )
+        columns["extraction_output_tokens"].append(
+            _number(extraction.get("outputTokens"))
+        )
+        columns["extraction_started_at"].append(_number(extraction.get("startedAt")))
+        columns["extraction_completed_at"].append(
+            _number(extraction.get("completedAt"))
+        )
+        columns["has_error"].append(bool(test.get("error")))
+        columns["metadata"].append(json.dumps(test.get("metadata") or {}))
+
+    return pd.DataFrame(columns).astype(METRICS_COLUMNS)
+
+
+def get_metrics_table_path(
+    timestamp: str, results_dir: str = "results", from_db: bool = False
+) -> Path:
+    """Return where the metrics table of a run is persisted
+
+    Folder runs keep it next to results.json; database runs are keyed by
+    timestamp under ``METRICS_CACHE_DIR``.
+    """
+    if from_db:
+        return Path(METRICS_CACHE_DIR) / f"{timestamp}.parquet"
+    return Path(results_dir) / timestamp / METRICS_TABLE_NAME
+
+
+def _encode_version(version: Any) -> bytes:
+    return json.dumps(version, default=str).encode()
+
+
+@instrumented
+def read_metrics_table(path: Path, version: Any) -> Optional[pd.DataFrame]:
+    """Read a persisted metrics table if it was written for ``version``"""
+    if not path.exists():
+        return None
+    try:
+        schema = pq.read_schema(path)
+        if (schema.metadata or {}).get(_VERSION_KEY) != _encode_version(version):
+            return None
+        # Tables written before a column was added are rebuilt
+        if not set(METRICS_COLUMNS).issubset(schema.names):
+            return None
+        table = pq.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowException):
+        return None
+    return table.to_pandas().astype(METRICS_COLUMNS)
+
+
+@instrumented
+def write_metrics_table(path: Path, frame: pd.DataFrame, version: Any) -> None:
+    """Persist a metrics table tagged with the run version it was built from"""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_VERSION_KEY] = _encode_version(version)
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Read-only location: the table is rebuilt on the next cold load
+        if tmp_path.exists():
+            tmp_path.unlink()
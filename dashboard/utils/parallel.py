@@ -0,0 +1,40 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator
+
+# Batch settings, overridable through the environment
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", str(os.cpu_count() or 1)))
+SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "16"))
+
+
+def chunks(iterable: Iterable[Any], size: int) -> Iterator[list]:
+    """Yield consecutive lists of up to ``size`` items"""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def process_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = SCORING_WORKERS,
+    chunk_size: int = SCORING_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Yield ``func(item)`` for every item, in order, across a pool of processes
+
+    Items are consumed in bounded windows so streamed input is never fully
+    held in memory. ``func`` must be a module-level function. With one
+    worker everything runs in the calling process.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+
+    # Spawned rather than forked because the Streamlit server is multi-threaded
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for window in chunks(items, chunk_size * workers * 4):
+            yield from executor.map(func, window, chunksize=chunk_size)
@@ -0,0 +1,122 @@
+import io
+import os
+import hashlib
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import pypdfium2 as pdfium
+
+from utils.asset_cache import (
+    fetch_asset_path,
+    get_cache_path,
+    read_cached,
+    write_cached,
+)
+from utils.cache import TTLCache
+
+# Preview settings, overridable through the environment
+PDF_PREVIEW_WIDTH = int(os.getenv("PDF_PREVIEW_WIDTH", "700"))  # pixels
+PDF_PREVIEW_QUALITY = int(os.getenv("PDF_PREVIEW_QUALITY", "85"))  # JPEG quality
+PDF_PREVIEW_WORKERS = int(os.getenv("PDF_PREVIEW_WORKERS", "2"))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+_page_count_cache = TTLCache(maxsize=256, ttl=None)
+_digest_cache = TTLCache(maxsize=256, ttl=None)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the shared pool of rendering processes
+
+    PDFium is not thread-safe, so pages are rendered in separate processes.
+    They are spawned rather than forked because the Streamlit server is
+    multi-threaded.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=PDF_PREVIEW_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _count_pages(pdf_path: str) -> int:
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _render_page(pdf_path: str, page_index: int, width: int, quality: int) -> bytes:
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page = pdf[page_index]
+        scale = min(width / page.get_width(), 4.0)
+        image = page.render(scale=scale).to_pil().convert("RGB")
+    finally:
+        pdf.close()
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def get_pdf_page_count(url: str) -> int:
+    """Return the number of pages of a PDF document"""
+    pdf_path = fetch_asset_path(url)
+    stat = pdf_path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    page_count = _page_count_cache.get(str(pdf_path), version)
+    if page_count is None:
+        page_count = _get_executor().submit(_count_pages, str(pdf_path)).result()
+        _page_count_cache.set(str(pdf_path), page_count, version)
+    return page_count
+
+
+def _content_digest(path: Path) -> str:
+    """Return the SHA-256 of a file, rehashed only when its mtime or size changes"""
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    digest = _digest_cache.get(str(path), version)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _digest_cache.set(str(path), digest, version)
+    return digest
+
+
+def render_pdf_page(
+    url: str, page_index: int = 0, width: int = PDF_PREVIEW_WIDTH
+) -> bytes:
+    """Return one PDF page rasterized to a JPEG ``width`` pixels wide
+
+    Rendered pages are stored in the asset cache next to their document,
+    keyed by the PDF's content, so only the visible page is ever shipped to
+    the browser, and only rendered once per width and version of the
+    document. They share the cache's size limit and LRU eviction.
+    """
+    pdf_path = fetch_asset_path(url)
+    cache_path = get_cache_path(
+        url, f"{_content_digest(pdf_path)[:16]}_{page_index}_{width}.jpg"
+    )
+    image = read_cached(cache_path)
+    if image is not None:
+        return image
+
+    image = (
+        _get_executor()
+        .submit(_render_page, str(pdf_path), page_index, width, PDF_PREVIEW_QUALITY)
+        .result()
+    )
+    write_cached(cache_path, image)
+    return image
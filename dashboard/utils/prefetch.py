@@ -0,0 +1,108 @@
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from utils.cache import TTLCache
+
+# Number of test cases warmed on each side of the one being displayed
+PREFETCH_DEPTH = int(os.getenv("PREFETCH_DEPTH", "3"))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "2"))
+PREFETCH_CACHE_SIZE = int(os.getenv("PREFETCH_CACHE_SIZE", "32"))
+
+# Shared by the prefetchers of every session, so the number of threads stays
+# bounded however many sessions the server has seen
+_executor = ThreadPoolExecutor(
+    max_workers=PREFETCH_WORKERS, thread_name_prefix="result-prefetch"
+)
+
+
+class ResultPrefetcher:
+    """Load test cases on a background thread pool into a bounded cache
+
+    ``loader`` is called as ``loader(timestamp, id)``, e.g. ``load_one_result``.
+    Loads run on a thread pool shared by every prefetcher. Prefetching a
+    different run cancels pending loads of the previous one and drops its
+    cached results.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, Any], Dict[str, Any]],
+        cache_size: int = PREFETCH_CACHE_SIZE,
+    ):
+        self._loader = loader
+        self._cache = TTLCache(maxsize=cache_size, ttl=None)
+        self._futures: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._timestamp: Optional[str] = None
+
+    def get(self, timestamp: str, id: Any) -> Dict[str, Any]:
+        """Return a test case, waiting for an in-flight prefetch if there is one"""
+        key = (timestamp, str(id))
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        with self._lock:
+            future = self._futures.get(key)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:
+                # Cancelled or failed in the background: load directly below
+                pass
+
+        result = self._loader(timestamp, id)
+        self._cache.set(key, result)
+        return result
+
+    def prefetch(self, timestamp: str, ids: Iterable[Any]) -> None:
+        """Schedule background loads for test cases that are not cached yet"""
+        if timestamp != self._timestamp:
+            self._switch_run(timestamp)
+
+        with self._lock:
+            for id in ids:
+                key = (timestamp, str(id))
+                if key in self._cache or key in self._futures:
+                    continue
+                self._futures[key] = _executor.submit(self._load, key, id)
+
+    def cancel(self) -> None:
+        """Cancel pending loads and drop every cached test case"""
+        with self._lock:
+            for future in self._futures.values():
+                future.cancel()
+            self._futures.clear()
+            self._cache.clear()
+            self._timestamp = None
+
+    def _switch_run(self, timestamp: str) -> None:
+        """Cancel pending loads and drop cached results of every other run
+
+        Results of ``timestamp`` are kept, such as the one ``get()`` has just
+        loaded before prefetching its neighbours.
+        """
+        with self._lock:
+            for key, future in list(self._futures.items()):
+                if key[0] != timestamp:
+                    future.cancel()
+                    del self._futures[key]
+            for key in self._cache.keys():
+                if key[0] != timestamp:
+                    self._cache.invalidate(key)
+            self._timestamp = timestamp
+
+    def _load(self, key: Tuple[str, str], id: Any) -> Dict[str, Any]:
+        try:
+            result = self._loader(key[0], id)
+            # Cache before dropping the future, so get() always finds one of
+            # them; results of a run that was switched away from are not kept
+            with self._lock:
+                if key[0] == self._timestamp:
+                    self._cache.set(key, result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
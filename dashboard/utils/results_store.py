@@ -0,0 +1,345 @@
+import os
+import re
+import json
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from utils.cache import TTLCache
+from utils.instrumentation import instrumented
+
+INDEX_VERSION = 3
+INDEX_SUFFIX = ".index.json"
+CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Bytes that change the nesting or string state of a JSON document, and the
+# separator between array elements
+_TOKEN_RE = re.compile(rb'["\\{}\[\],]')
+_QUOTE, _BACKSLASH, _COMMA = 0x22, 0x5C, 0x2C
+_OPENERS = (0x7B, 0x5B)
+_CLOSERS = (0x7D, 0x5D)
+
+_index_cache = TTLCache(maxsize=16, ttl=None)
+
+
+class ResultsIndex:
+    """Byte offsets of every result in a results.json file, keyed by result id
+
+    Each entry also carries the fields the Test Result page filters on
+    (diff total, error flag and model combination) so pages of ids can be
+    served without reading the results themselves.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], models: List[List[Any]]):
+        self.entries = entries
+        self.models = models
+        self.positions = {entry["id"]: pos for pos, entry in enumerate(entries)}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, id: Any) -> Optional[Dict[str, Any]]:
+        pos = self.positions.get(str(id))
+        return None if pos is None else self.entries[pos]
+
+
+def iter_json_array_items(
+    f: BinaryIO, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, bytes]]:
+    """Yield (byte offset, raw bytes) for each element of a top-level JSON array
+
+    Scalar elements are yielded too, so positions match ``json.load``. The
+    file is read in fixed-size chunks, so memory stays bounded by the chunk
+    size plus the largest single element.
+    """
+    offset = 0
+    depth = 0
+    in_string = False
+    escaped = False
+    # Absolute offset of the element being read, or None between elements;
+    # at depth 1 it marks a possible scalar ending at the next comma
+    start = None
+    segment_start = 0
+    pending = bytearray()
+
+    def scalar(end_chunk: bytes, end: int) -> Iterator[Tuple[int, bytes]]:
+        raw = bytes(pending + end_chunk[segment_start:end])
+        stripped = raw.lstrip()
+        if stripped:
+            yield start + len(raw) - len(stripped), stripped.rstrip()
+
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+
+        pos = 0
+        if escaped:
+            # The first byte of this chunk is escaped by a trailing backslash
+            pos = 1
+            escaped = False
+        skip_until = pos
+
+        for match in _TOKEN_RE.finditer(chunk, pos):
+            i = match.start()
+            if i < skip_until:
+                continue
+            c = chunk[i]
+            if in_string:
+                if c == _BACKSLASH:
+                    if i + 1 >= len(chunk):
+                        escaped = True
+                    else:
+                        skip_until = i + 2
+                elif c == _QUOTE:
+                    in_string = False
+                continue
+
+            if c == _QUOTE:
+                in_string = True
+            elif c == _COMMA:
+                if depth == 1:
+                    if start is not None:
+                        yield from scalar(chunk, i)
+                    pending.clear()
+                    start = offset + i + 1
+                    segment_start = i + 1
+            elif c in _OPENERS:
+                depth += 1
+                if depth == 1:
+                    start = offset + i + 1
+                    segment_start = i + 1
+                elif depth == 2:
+                    pending.clear()
+                    start = offset + i
+                    segment_start = i
+            elif c in _CLOSERS:
+                depth -= 1
+                if depth == 0 and start is not None:
+                    yield from scalar(chunk, i)
+                    pending.clear()
+                    start = None
+                elif depth == 1 and start is not None:
+                    pending += chunk[segment_start : i + 1]
+                    yield start, bytes(pending)
+                    pending.clear()
+                    start = None
+
+        if start is not None:
+            pending += chunk[segment_start:]
+            segment_start = 0
+        offset += len(chunk)
+
+
+def get_index_path(results_path: Path) -> Path:
+    """Return the sidecar index path for a results.json file"""
+    return results_path.with_name(results_path.name + INDEX_SUFFIX)
+
+
+@instrumented
+def build_index(results_path: Path) -> Dict[str, Any]:
+    """Scan a results.json file and return its serializable index"""
+    stat = results_path.stat()
+    entries = []
+    models = []
+    model_positions = {}
+    with open(results_path, "rb") as f:
+        for position, (offset, raw) in enumerate(iter_json_array_items(f)):
+            result = json.loads(raw)
+            if not isinstance(result, dict):
+                # Malformed entries are still indexed, by position
+                result = {}
+            model = (
+                result.get("ocrModel"),
+                result.get("extractionModel"),
+                bool(result.get("directImageExtraction", False)),
+            )
+            if model not in model_positions:
+                model_positions[model] = len(models)
+                models.append(list(model))
+            diff_stats = result.get("jsonDiffStats") or {}
+            entries.append(
+                {
+                    "id": str(result.get("id", position)),
+                    "offset": offset,
+                    "length": len(raw),
+                    "model": model_positions[model],
+                    "diff_total": diff_stats.get("total") or 0,
+                    "error": bool(result.get("error")),
+                }
+            )
+    return {
+        "version": INDEX_VERSION,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "source_size": stat.st_size,
+        "models": models,
+        "entries": entries,
+    }
+
+
+def _is_fresh(index: Dict[str, Any], stat: os.stat_result) -> bool:
+    return (
+        index.get("version") == INDEX_VERSION
+        and index.get("source_mtime_ns") == stat.st_mtime_ns
+        and index.get("source_size") == stat.st_size
+    )
+
+
+def _write_index(index_path: Path, index: Dict[str, Any]) -> None:
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp_path, index_path)
+    except OSError:
+        # Read-only results folder: keep the index in memory only
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+@instrumented
+def load_index(results_path: Path) -> Optional[ResultsIndex]:
+    """Load the sidecar index for a results.json file, rebuilding it if stale"""
+    try:
+        stat = results_path.stat()
+    except FileNotFoundError:
+        return None
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    index = _index_cache.get(str(results_path), version)
+    if index is not None:
+        return index
+
+    index_path = get_index_path(results_path)
+    raw_index = None
+    if index_path.exists():
+        try:
+            with open(index_path) as f:
+                raw_index = json.load(f)
+        except (OSError, ValueError):
+            raw_index = None
+
+    if raw_index is None or not _is_fresh(raw_index, stat):
+        raw_index = build_index(results_path)
+        _write_index(index_path, raw_index)
+
+    index = ResultsIndex(raw_index["entries"], raw_index["models"])
+    _index_cache.set(str(results_path), index, version)
+    return index
+
+
+def clear_index_cache() -> None:
+    """Drop the in-memory results indexes; sidecar files are kept"""
+    _index_cache.clear()
+
+
+@instrumented
+def read_result(results_path: Path, id: Any) -> Optional[Dict[str, Any]]:
+    """Read a single result by id with one seek instead of parsing the whole file"""
+    index = load_index(results_path)
+    if index is None:
+        return None
+    entry = index.get(id)
+    if entry is None:
+        return None
+
+    with open(results_path, "rb") as f:
+        f.seek(entry["offset"])
+        result = json.loads(f.read(entry["length"]))
+    if not isinstance(result, dict):
+        result = {}
+    if "id" not in result:
+        result["id"] = index.positions[entry["id"]]
+    return result
+
+
+@instrumented
+def find_result_ids(
+    results_path: Path,
+    after_id: Any = None,
+    before_id: Any = None,
+    limit: int = 100,
+    only_with_diffs: bool = False,
+    has_error: Optional[bool] = None,
+    model: Optional[Tuple[str, Optional[str], bool]] = None,
+) -> List[str]:
+    """Return up to ``limit`` matching result ids after or before a given id
+
+    Ids are ordered by their position in results.json. With ``before_id``
+    the ids preceding it are returned, still in ascending order.
+    """
+    index = load_index(results_path)
+    if index is None:
+        return []
+
+    model_position = None
+    if model is not None:
+        if list(model) not in index.models:
+            return []
+        model_position = index.models.index(list(model))
+
+    def matches(entry):
+        if only_with_diffs and entry["diff_total"] <= 0:
+            return False
+        if has_error is not None and entry["error"] != has_error:
+            return False
+        if model_position is not None and entry["model"] != model_position:
+            return False
+        return True
+
+    if before_id is not None:
+        end = index.positions.get(str(before_id), len(index))
+        positions = range(end - 1, -1, -1)
+    elif after_id is not None:
+        positions = range(index.positions.get(str(after_id), -1) + 1, len(index))
+    else:
+        positions = range(len(index))
+
+    ids = []
+    for position in positions:
+        entry = index.entries[position]
+        if matches(entry):
+            ids.append(entry["id"])
+            if len(ids) >= limit:
+                break
+    return ids[::-1] if before_id is not None else ids
+
+
+def list_models(results_path: Path) -> List[Tuple[str, Optional[str], bool]]:
+    """Return the distinct (ocr, extraction, direct) combinations of a run"""
+    index = load_index(results_path)
+    if index is None:
+        return []
+    return [tuple(model) for model in index.models]
+
+
+def iter_results(
+    results_path: Path, fields: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """Yield results one by one, optionally projected to ``fields``
+
+    Only one result is decoded at a time, so peak memory is bounded by the
+    largest single result rather than the whole file. Results without an id
+    get their position in the array, matching the full-file loader.
+    """
+    if fields is not None:
+        fields = ["id"] + [key for key in fields if key != "id"]
+    with open(results_path, "rb") as f:
+        for position, (_, raw) in enumerate(iter_json_array_items(f)):
+            result = json.loads(raw)
+            if not isinstance(result, dict):
+                # Malformed entries are still yielded, by position
+                result = {}
+            if "id" not in result:
+                result["id"] = position
+            if fields is not None:
+                result = {key: result[key] for key in fields if key in result}
+            yield result
@@ -0,0 +1,118 @@
+import json
+from typing import Optional, Sequence, Tuple, TypedDict
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import model_combination_labels
+
+RESULTS_PAGE_SIZES = [25, 50, 100, 250]
+
+# Error filter options and the has_error value they select
+ERROR_FILTERS = {"Include errors": None, "Exclude errors": False, "Only errors": True}
+
+# Sortable columns of the results table and the metrics columns behind them
+RESULTS_SORT_COLUMNS = {
+    "Image": "file_url",
+    "Model Combination": None,
+    "Levenshtein Score": "levenshtein_distance",
+    "JSON Accuracy": "json_accuracy",
+    "Total Cost": "total_cost",
+    "Duration (ms)": "duration",
+}
+
+# Columns whose missing values the results table displays as 0
+ZERO_FILLED_COLUMNS = {
+    "levenshtein_distance",
+    "json_accuracy",
+    "total_cost",
+    "duration",
+}
+
+
+class ResultsPage(TypedDict):
+    rows: pd.DataFrame
+    total: int
+    page: int
+    page_count: int
+
+
+def filter_positions(
+    metrics: pd.DataFrame,
+    model_combinations: Optional[Sequence[str]] = None,
+    json_accuracy_range: Optional[Tuple[float, float]] = None,
+    levenshtein_range: Optional[Tuple[float, float]] = None,
+    has_error: Optional[bool] = None,
+) -> np.ndarray:
+    """Return the row positions of the metrics table matching the filters
+
+    Missing scores count as 0, as they are displayed in the results table.
+    """
+    mask = np.ones(len(metrics), dtype=bool)
+    if model_combinations:
+        labels = model_combination_labels(metrics)
+        mask &= labels.isin(model_combinations).to_numpy()
+    for column, score_range in (
+        ("json_accuracy", json_accuracy_range),
+        ("levenshtein_distance", levenshtein_range),
+    ):
+        if score_range is not None:
+            scores = metrics[column].fillna(0)
+            mask &= scores.between(*score_range).to_numpy()
+    if has_error is not None:
+        mask &= metrics["has_error"].to_numpy(dtype=bool) == has_error
+    return np.flatnonzero(mask)
+
+
+def sort_positions(
+    metrics: pd.DataFrame, positions: np.ndarray, sort_by: str, ascending: bool
+) -> np.ndarray:
+    """Return ``positions`` ordered by a results table column as it is displayed
+
+    Missing scores, costs and durations sort as the 0 shown for them; other
+    missing values go last.
+    """
+    column = RESULTS_SORT_COLUMNS[sort_by]
+    rows = metrics.iloc[positions]
+    if column is None:
+        values = model_combination_labels(rows)
+    elif column in ZERO_FILLED_COLUMNS:
+        values = rows[column].fillna(0)
+    else:
+        values = rows[column]
+    values = values.reset_index(drop=True)
+    order = values.sort_values(
+        ascending=ascending, na_position="last", kind="stable"
+    ).index
+    return positions[order.to_numpy()]
+
+
+def flatten_metadata_columns(metadata: pd.Series) -> pd.DataFrame:
+    """Flatten JSON metadata strings into one typed column per (nested) key
+
+    Meant for a page of rows: keys become ``Metadata.<key>`` columns with
+    nullable integer, float, boolean or string dtypes; lists stay objects.
+    """
+    flat = pd.json_normalize([json.loads(value) for value in metadata], sep=".")
+    flat.index = metadata.index
+    return flat.convert_dtypes().add_prefix("Metadata.")
+
+
+def page_bounds(total: int, page: int, page_size: int) -> Tuple[int, int, int]:
+    """Return the clamped 1-based page, its first row position and the page count"""
+    page_count = max(1, -(-total // page_size))
+    page = min(max(page, 1), page_count)
+    return page, (page - 1) * page_size, page_count
+
+
+def results_page(
+    metrics: pd.DataFrame, positions: np.ndarray, page: int, page_size: int
+) -> ResultsPage:
+    """Slice one page of ordered row positions out of the metrics table"""
+    page, start, page_count = page_bounds(len(positions), page, page_size)
+    return {
+        "rows": metrics.iloc[positions[start : start + page_size]],
+        "total": len(positions),
+        "page": page,
+        "page_count": page_count,
+    }
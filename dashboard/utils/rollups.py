@@ -0,0 +1,137 @@
+import os
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional
+
+import pandas as pd
+
+from utils.aggregation import MODEL_COMPARISON_COLUMNS
+from utils.cache import TTLCache
+from utils.data_loader import (
+    RUN_LIST_CACHE_TTL,
+    BenchmarkRunMetadata,
+    get_run_version_from_folder,
+    load_model_stats,
+    load_run_list,
+)
+from utils.metrics_table import METRICS_CACHE_DIR
+
+ROLLUPS_NAME = "rollups.parquet"
+# Overrides where the rollup table is stored
+ROLLUPS_PATH = os.getenv("ROLLUPS_PATH")
+
+# Per-model statistics kept for every run
+ROLLUP_STAT_COLUMNS = MODEL_COMPARISON_COLUMNS + ["json_count", "json_accuracy_all"]
+ROLLUP_COLUMNS = ["timestamp", "run_time", "run_version", "model"] + ROLLUP_STAT_COLUMNS
+
+_rollups_cache = TTLCache(maxsize=1, ttl=RUN_LIST_CACHE_TTL)
+_update_lock = threading.Lock()
+
+
+def get_rollups_path(results_dir: str = "results", from_db: bool = False) -> Path:
+    """Return where the rollup table is stored
+
+    Folder runs keep it in the results directory; database runs under
+    ``METRICS_CACHE_DIR``. ``ROLLUPS_PATH`` overrides both.
+    """
+    if ROLLUPS_PATH:
+        return Path(ROLLUPS_PATH)
+    if from_db:
+        return Path(METRICS_CACHE_DIR) / ROLLUPS_NAME
+    return Path(results_dir) / ROLLUPS_NAME
+
+
+def _run_version(run: BenchmarkRunMetadata, from_db: bool) -> Optional[str]:
+    """Return the version a run's rollup was computed for, as a string"""
+    if from_db:
+        version: Any = (run["status"], run["completed_at"])
+    else:
+        version = get_run_version_from_folder(run["timestamp"])
+    return json.dumps(version, default=str) if version is not None else None
+
+
+def compute_run_rollup(timestamp: str, run_version: str) -> pd.DataFrame:
+    """Return one rollup row per model combination of a run"""
+    stats = load_model_stats(timestamp)
+    rollup = stats[ROLLUP_STAT_COLUMNS].rename_axis("model").reset_index()
+    rollup.insert(0, "timestamp", timestamp)
+    rollup.insert(1, "run_time", datetime.strptime(timestamp, "%Y-%m-%d-%H-%M-%S"))
+    rollup.insert(2, "run_version", run_version)
+    return rollup[ROLLUP_COLUMNS]
+
+
+def read_rollups(path: Path) -> pd.DataFrame:
+    """Read the rollup table, or an empty one if it does not exist yet"""
+    if not path.exists():
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    return pd.read_parquet(path)
+
+
+def _write_rollups(path: Path, rollups: pd.DataFrame) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rollups.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Read-only location: rollups are recomputed on the next load
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def update_rollups(runs: Optional[List[BenchmarkRunMetadata]] = None) -> pd.DataFrame:
+    """Bring the rollup table up to date with the completed runs and return it
+
+    Only completed runs that are missing or whose version changed are
+    aggregated, so after the first load this reads a few rows per run.
+    In-progress runs are left out until they complete, and rows of runs no
+    longer listed, e.g. deleted ones, are dropped.
+    """
+    from_db = bool(os.getenv("DATABASE_URL"))
+    path = get_rollups_path(from_db=from_db)
+    runs = load_run_list() if runs is None else runs
+
+    with _update_lock:
+        rollups = read_rollups(path)
+        known = set(zip(rollups["timestamp"], rollups["run_version"]))
+
+        stale = []
+        for run in runs:
+            if run["status"] != "completed":
+                continue
+            run_version = _run_version(run, from_db)
+            if run_version is not None and (run["timestamp"], run_version) not in known:
+                stale.append((run["timestamp"], run_version))
+
+        listed = rollups["timestamp"].isin({run["timestamp"] for run in runs})
+        if stale or not listed.all():
+            fresh = [compute_run_rollup(*run) for run in stale]
+            stale_timestamps = {timestamp for timestamp, _ in stale}
+            kept = rollups[listed & ~rollups["timestamp"].isin(stale_timestamps)]
+            frames = [frame for frame in [kept, *fresh] if not frame.empty]
+            if frames:
+                rollups = pd.concat(frames, ignore_index=True)
+            else:
+                rollups = pd.DataFrame(columns=ROLLUP_COLUMNS)
+            rollups = rollups.sort_values(["run_time", "model"], ignore_index=True)
+            _write_rollups(path, rollups)
+
+    return rollups
+
+
+def load_rollups() -> pd.DataFrame:
+    """Load the per-run, per-model rollups of every completed run
+
+    The table is checked for new or changed runs at most every
+    ``RUN_LIST_CACHE_TTL`` seconds; the returned frame is shared between
+    callers and must not be mutated.
+    """
+    runs = load_run_list()
+    key = tuple((run["timestamp"], run["status"], run["completed_at"]) for run in runs)
+    rollups = _rollups_cache.get("rollups", key)
+    if rollups is None:
+        rollups = update_rollups(runs)
+        _rollups_cache.set("rollups", rollups, key)
+    return rollups
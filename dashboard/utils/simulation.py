@@ -0,0 +1,177 @@
+import heapq
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import model_combination_labels
+
+# Mirrors MODEL_CONCURRENCY in src/index.ts
+MODEL_CONCURRENCY = {
+    "aws-textract": 50,
+    "azure-document-intelligence": 50,
+    "claude-3-5-sonnet-20241022": 10,
+    "gemini-2.0-flash-001": 30,
+    "mistral-ocr": 5,
+    "gpt-4o": 50,
+    "qwen2.5-vl-32b-instruct": 10,
+    "qwen2.5-vl-72b-instruct": 10,
+    "google/gemma-3-27b-it": 10,
+    "meta-llama/Llama-3.2-11B-Vision-Instruct-Turbo": 10,
+    "meta-llama/Llama-3.2-90B-Vision-Instruct-Turbo": 10,
+    "omniai": 30,
+    "zerox": 50,
+}
+DEFAULT_CONCURRENCY = 20
+
+SIMULATION_COLUMNS = [
+    "concurrency",
+    "documents",
+    "makespan",
+    "throughput",
+    "queue_delay_mean",
+    "queue_delay_p95",
+    "utilization",
+    "cost_per_hour",
+]
+
+
+def model_concurrency(ocr_model: Optional[str], extraction_model: Optional[str]) -> int:
+    """Return the concurrency the benchmark uses for a model combination"""
+    return min(
+        MODEL_CONCURRENCY.get(ocr_model, DEFAULT_CONCURRENCY),
+        MODEL_CONCURRENCY.get(extraction_model, DEFAULT_CONCURRENCY),
+    )
+
+
+def simulate_queue(
+    service_times: np.ndarray,
+    concurrency: int,
+    arrival_rate: float = 0,
+    rate_limit: float = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Replay requests through a FIFO pool and return their arrival and start times
+
+    Requests arrive ``arrival_rate`` per minute (all at once if 0), run on at
+    most ``concurrency`` workers like ``p-limit`` and, with a ``rate_limit``
+    in requests per minute, start at least ``60 / rate_limit`` seconds apart.
+    Times are in seconds.
+    """
+    count = len(service_times)
+    if arrival_rate > 0:
+        arrivals = np.arange(count) * (60 / arrival_rate)
+    else:
+        arrivals = np.zeros(count)
+
+    # Every request starts on arrival when nothing limits it
+    if concurrency >= count and rate_limit <= 0:
+        return arrivals, arrivals.copy()
+
+    min_gap = 60 / rate_limit if rate_limit > 0 else 0.0
+    free_at = [0.0] * min(concurrency, count)
+    starts = np.empty(count)
+    last_start = -np.inf
+    for i, (arrival, service) in enumerate(
+        zip(arrivals.tolist(), service_times.tolist())
+    ):
+        start = max(arrival, free_at[0], last_start + min_gap)
+        heapq.heapreplace(free_at, start + service)
+        starts[i] = last_start = start
+    return arrivals, starts
+
+
+def summarize_simulation(
+    service_times: np.ndarray,
+    costs: np.ndarray,
+    concurrency: int,
+    arrivals: np.ndarray,
+    starts: np.ndarray,
+) -> Dict[str, float]:
+    """Return throughput, queueing delay and cost rate of a simulated replay"""
+    makespan = float((starts + service_times).max())
+    delays = starts - arrivals
+    return {
+        "concurrency": concurrency,
+        "documents": len(service_times),
+        "makespan": makespan,
+        "throughput": len(service_times) / makespan * 60 if makespan else np.nan,
+        "queue_delay_mean": float(delays.mean()),
+        "queue_delay_p95": float(np.percentile(delays, 95)),
+        "utilization": (
+            float(service_times.sum()) / (concurrency * makespan)
+            if makespan
+            else np.nan
+        ),
+        "cost_per_hour": float(costs.sum()) / makespan * 3600 if makespan else np.nan,
+    }
+
+
+def replay_workloads(
+    metrics: pd.DataFrame,
+) -> Dict[str, Tuple[np.ndarray, np.ndarray, int]]:
+    """Return each model combination's service times, costs and benchmark concurrency
+
+    Service times are the recorded OCR plus extraction durations in seconds,
+    in run order; errored tests are skipped.
+    """
+    valid = metrics[~metrics["has_error"].to_numpy(dtype=bool)]
+    service_times = (
+        valid["ocr_duration"].fillna(0) + valid["extraction_duration"].fillna(0)
+    ) / 1000
+    costs = valid["total_cost"].fillna(0)
+
+    workloads = {}
+    for label, rows in valid.groupby(model_combination_labels(valid), sort=False):
+        first = rows.iloc[0]
+        workloads[label] = (
+            service_times.loc[rows.index].to_numpy(dtype=float),
+            costs.loc[rows.index].to_numpy(dtype=float),
+            model_concurrency(first["ocr_model"], first["extraction_model"]),
+        )
+    return workloads
+
+
+def simulate_run(
+    metrics: pd.DataFrame,
+    concurrency: Optional[int] = None,
+    arrival_rate: float = 0,
+    rate_limit: float = 0,
+) -> pd.DataFrame:
+    """Simulate every model combination of a run, one row per combination
+
+    ``concurrency`` overrides the benchmark's per-model limits; see
+    ``simulate_queue`` for the other parameters.
+    """
+    rows = {}
+    for label, (service_times, costs, limit) in replay_workloads(metrics).items():
+        workers = concurrency or limit
+        arrivals, starts = simulate_queue(
+            service_times, workers, arrival_rate, rate_limit
+        )
+        rows[label] = summarize_simulation(
+            service_times, costs, workers, arrivals, starts
+        )
+    return pd.DataFrame.from_dict(
+        rows, orient="index", columns=SIMULATION_COLUMNS
+    ).rename_axis("Model Combination")
+
+
+def concurrency_sweep(
+    metrics: pd.DataFrame,
+    levels: Iterable[int],
+    arrival_rate: float = 0,
+    rate_limit: float = 0,
+) -> pd.DataFrame:
+    """Simulate every model combination at each concurrency level"""
+    levels = list(levels)
+    rows = []
+    for label, (service_times, costs, _) in replay_workloads(metrics).items():
+        for workers in levels:
+            arrivals, starts = simulate_queue(
+                service_times, workers, arrival_rate, rate_limit
+            )
+            stats = summarize_simulation(
+                service_times, costs, workers, arrivals, starts
+            )
+            rows.append({"Model Combination": label, **stats})
+    return pd.DataFrame(rows, columns=["Model Combination"] + SIMULATION_COLUMNS)
@@ -0,0 +1,349 @@
+import io
+import csv
+import json
+import random
+import uuid
+from copy import deepcopy
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from utils.parallel import chunks
+
+# Sample document the synthetic payloads are scaled from
+SAMPLE_PATH = Path(__file__).resolve().parents[2] / "data" / "receipt.json"
+
+# (ocr model, extraction model, direct image extraction) of synthetic results
+SYNTHETIC_MODELS = [
+    ("ground-truth", "gpt-4o", False),
+    ("gpt-4o", "gpt-4o", False),
+    ("gpt-4o", "gpt-4o", True),
+    ("azure-document-intelligence", "gpt-4o", False),
+    ("gemini-2.0-flash-001", "gemini-2.0-flash-001", False),
+    ("mistral-ocr", None, False),
+    ("zerox", "gpt-4o", False),
+    ("claude-3-5-sonnet-20241022", "claude-3-5-sonnet-20241022", False),
+]
+
+# Distinct documents generated per run; results reuse them with fresh scores
+DOCUMENT_POOL_SIZE = 64
+
+# Result fields whose values are shared by the results of a document
+_SHARED_FIELDS = {
+    "metadata",
+    "jsonSchema",
+    "trueMarkdown",
+    "trueJson",
+    "predictedMarkdown",
+    "predictedJson",
+}
+
+# benchmark_results columns filled by seed_database, with their result fields
+_RESULT_COLUMNS = {
+    "id": "id",
+    "benchmark_run_id": None,
+    "direct_image_extraction": "directImageExtraction",
+    "error": "error",
+    "extraction_model": "extractionModel",
+    "file_url": "fileUrl",
+    "full_json_diff": "fullJsonDiff",
+    "json_accuracy": "jsonAccuracy",
+    "json_accuracy_result": "jsonAccuracyResult",
+    "json_diff": "jsonDiff",
+    "json_diff_stats": "jsonDiffStats",
+    "json_schema": "jsonSchema",
+    "levenshtein_distance": "levenshteinDistance",
+    "metadata": "metadata",
+    "ocr_model": "ocrModel",
+    "predicted_json": "predictedJson",
+    "predicted_markdown": "predictedMarkdown",
+    "true_json": "trueJson",
+    "true_markdown": "trueMarkdown",
+    "usage": "usage",
+}
+
+
+def load_sample() -> Dict[str, Any]:
+    """Load the sample document from the data folder"""
+    with open(SAMPLE_PATH) as f:
+        return json.load(f)
+
+
+def _scale_document(
+    sample: Dict[str, Any], rng: random.Random, markdown_chars: int
+) -> Tuple[str, Dict[str, Any]]:
+    """Return a markdown page of about ``markdown_chars`` and its matching JSON"""
+    true_json = deepcopy(sample["trueJsonOutput"])
+    line_items = []
+    lines = [sample["trueMarkdownOutput"]]
+    size = len(lines[0])
+    while size < markdown_chars:
+        item = {
+            "amount": round(rng.uniform(1, 50), 2),
+            "description": " ".join(
+                rng.choice(["Gyro", "Pita", "Bowl", "Fries", "Salad", "Soda", "Wrap"])
+                for _ in range(rng.randint(1, 4))
+            ),
+        }
+        line_items.append(item)
+        line = f"{item['description']} ${item['amount']:.2f}  \n"
+        lines.append(line)
+        size += len(line)
+    true_json["line_items"] = true_json["line_items"] + line_items
+    return "".join(lines), true_json
+
+
+def _perturb_text(text_: str, rng: random.Random, rate: float) -> str:
+    """Return ``text_`` with about ``rate`` of its characters replaced"""
+    chars = list(text_)
+    for _ in range(int(len(chars) * rate)):
+        chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def _perturb_json(true_json: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Return a prediction of ``true_json`` with a few wrong or missing line items"""
+    predicted = deepcopy(true_json)
+    items = predicted["line_items"]
+    for item in rng.sample(items, k=min(len(items), rng.randint(0, 3))):
+        item["amount"] = round(item["amount"] + rng.uniform(-5, 5), 2)
+    if items and rng.random() < 0.3:
+        items.pop(rng.randrange(len(items)))
+    return predicted
+
+
+def _document_pool(
+    rng: random.Random, markdown_chars: int, size: int = DOCUMENT_POOL_SIZE
+) -> List[Dict[str, Any]]:
+    sample = load_sample()
+    pool = []
+    for index in range(size):
+        true_markdown, true_json = _scale_document(sample, rng, markdown_chars)
+        pool.append(
+            {
+                "fileUrl": f"https://example.com/synthetic/{index}.png",
+                "metadata": sample["metadata"],
+                "jsonSchema": sample["jsonSchema"],
+                "trueMarkdown": true_markdown,
+                "trueJson": true_json,
+                "predictedMarkdown": _perturb_text(true_markdown, rng, 0.02),
+                "predictedJson": _perturb_json(true_json, rng),
+            }
+        )
+    return pool
+
+
+def _phase_usage(rng: random.Random, started_at: float) -> Dict[str, Any]:
+    input_tokens = rng.randint(500, 3000)
+    output_tokens = rng.randint(100, 2000)
+    input_cost = input_tokens * 2.5e-6
+    output_cost = output_tokens * 1e-5
+    duration = rng.lognormvariate(8, 0.5)  # ms, median ~3 s
+    return {
+        "duration": duration,
+        "inputTokens": input_tokens,
+        "outputTokens": output_tokens,
+        "totalTokens": input_tokens + output_tokens,
+        "inputCost": input_cost,
+        "outputCost": output_cost,
+        "totalCost": input_cost + output_cost,
+        "startedAt": started_at,
+        "completedAt": started_at + duration,
+    }
+
+
+def generate_results(
+    count: int,
+    seed: int = 0,
+    markdown_chars: int = 4000,
+    error_rate: float = 0.02,
+) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` synthetic results shaped like the benchmark's output
+
+    Payloads are scaled from ``data/receipt.json`` to about
+    ``markdown_chars`` of markdown per result, with JSON and diffs to match.
+    Results are generated lazily, so arbitrarily large runs can be streamed.
+    """
+    rng = random.Random(seed)
+    pool = _document_pool(rng, markdown_chars)
+    started_at = datetime(2025, 1, 1).timestamp() * 1000
+
+    for index in range(count):
+        ocr_model, extraction_model, direct = SYNTHETIC_MODELS[
+            index % len(SYNTHETIC_MODELS)
+        ]
+        document = pool[rng.randrange(len(pool))]
+        result = {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "fileUrl": document["fileUrl"],
+            "metadata": document["metadata"],
+            "jsonSchema": document["jsonSchema"],
+            "ocrModel": ocr_model,
+            "extractionModel": extraction_model,
+            "directImageExtraction": direct,
+            "trueMarkdown": document["trueMarkdown"],
+            "trueJson": document["trueJson"],
+        }
+        started_at += rng.expovariate(1 / 50)
+
+        if rng.random() < error_rate:
+            result["error"] = "Error: synthetic timeout"
+            yield result
+            continue
+
+        usage = {}
+        if not direct:
+            usage["ocr"] = _phase_usage(rng, started_at)
+            result["predictedMarkdown"] = document["predictedMarkdown"]
+            result["levenshteinDistance"] = rng.uniform(0.6, 1)
+        if extraction_model:
+            extraction_start = usage["ocr"]["completedAt"] if not direct else started_at
+            usage["extraction"] = _phase_usage(rng, extraction_start)
+            additions, deletions, modifications = (rng.randint(0, 5) for _ in range(3))
+            total = additions + deletions + modifications
+            total_fields = 10 + len(document["trueJson"]["line_items"]) * 2
+            result["predictedJson"] = document["predictedJson"]
+            result["jsonAccuracy"] = round(
+                1 - min(total, total_fields) / total_fields, 4
+            )
+            result["jsonDiff"] = {
+                "line_items": [["~", {"amount__old": 1, "amount__new": 2}]]
+            }
+            result["fullJsonDiff"] = result["jsonDiff"]
+            result["jsonDiffStats"] = {
+                "additions": additions,
+                "deletions": deletions,
+                "modifications": modifications,
+                "total": total,
+            }
+            result["jsonAccuracyResult"] = {
+                "score": result["jsonAccuracy"],
+                "totalFields": total_fields,
+                "jsonDiffStats": result["jsonDiffStats"],
+            }
+
+        phases = list(usage.values())
+        usage.update(
+            {
+                key: sum(phase[key] for phase in phases)
+                for key in ("duration", "inputTokens", "outputTokens", "totalCost")
+            }
+        )
+        usage["startedAt"] = phases[0]["startedAt"]
+        usage["completedAt"] = phases[-1]["completedAt"]
+        result["usage"] = usage
+        yield result
+
+
+class _PayloadEncoder:
+    """JSON encoder that reuses the encoding of payloads shared between results
+
+    Synthetic results draw their documents from a small pool, so the large
+    fields are encoded once per document instead of once per result.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._encoded: Dict[int, Tuple[Any, str]] = {}
+
+    def encode(self, field: str, value: Any) -> str:
+        if field not in _SHARED_FIELDS:
+            return json.dumps(value)
+        # The cached value is kept alive, so its id cannot be reused
+        cached = self._encoded.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        if len(self._encoded) >= self.maxsize:
+            self._encoded.clear()
+        encoded = json.dumps(value)
+        self._encoded[id(value)] = (value, encoded)
+        return encoded
+
+    def encode_result(self, result: Dict[str, Any]) -> str:
+        fields = (
+            f"{json.dumps(field)}: {self.encode(field, value)}"
+            for field, value in result.items()
+        )
+        return "{" + ", ".join(fields) + "}"
+
+
+def write_results_file(path: Path, results: Iterable[Dict[str, Any]]) -> int:
+    """Stream results into a results.json array and return how many were written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    encoder = _PayloadEncoder()
+    count = 0
+    with open(path, "w") as f:
+        f.write("[")
+        for result in results:
+            f.write(",\n" if count else "\n")
+            f.write(encoder.encode_result(result))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+def _copy_row(
+    encoder: _PayloadEncoder, run_id: str, result: Dict[str, Any]
+) -> List[Optional[str]]:
+    row = []
+    for column, field in _RESULT_COLUMNS.items():
+        value = run_id if field is None else result.get(field)
+        if isinstance(value, (dict, list)):
+            value = encoder.encode(field, value)
+        elif value is None and column in ("json_schema", "metadata", "true_json"):
+            value = "{}"
+        row.append(value)
+    return row
+
+
+def seed_database(
+    engine: Engine,
+    timestamp: str,
+    results: Iterable[Dict[str, Any]],
+    total_documents: int,
+    batch_size: int = 5000,
+) -> str:
+    """Insert a completed run and its results into Postgres and return the run id
+
+    Results are streamed with ``COPY`` in batches, so millions of rows can be
+    seeded without holding them in memory. The tables must already exist
+    (``npx prisma db push``).
+    """
+    run_id = str(uuid.uuid4())
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO benchmark_runs
+                    (id, timestamp, status, models_config, total_documents,
+                     run_by, description, created_at, completed_at)
+                VALUES
+                    (:id, :timestamp, 'completed', '[]', :total_documents,
+                     'synthetic', 'Synthetic benchmark run', now(), now())
+                """
+            ),
+            {"id": run_id, "timestamp": timestamp, "total_documents": total_documents},
+        )
+
+    columns = ", ".join(_RESULT_COLUMNS)
+    encoder = _PayloadEncoder()
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for batch in chunks(results, batch_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for result in batch:
+                writer.writerow(_copy_row(encoder, run_id, result))
+            buffer.seek(0)
+            cursor.copy_expert(
+                f"COPY benchmark_results ({columns}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return run_id
@@ -0,0 +1,180 @@
+import argparse
+from typing import Any, Dict, Hashable, Iterable, Optional, Sequence, Tuple, TypedDict
+
+import pandas as pd
+
+from utils.data_loader import iter_results_for_run
+from utils.parallel import SCORING_CHUNK_SIZE, SCORING_WORKERS, process_map
+
+TEXT_SCORE_COLUMNS = [
+    "id",
+    "levenshtein_distance",
+    "text_similarity",
+    "text_similarity_ws",
+    "cer",
+    "wer",
+]
+
+
+class TextScores(TypedDict):
+    text_similarity: float
+    text_similarity_ws: float
+    cer: float
+    wer: float
+
+
+def levenshtein(a: Sequence[Hashable], b: Sequence[Hashable]) -> int:
+    """Return the edit distance between two strings or token sequences
+
+    Uses the bit-parallel algorithm of Myers (1999) as formulated by Hyyrö:
+    the shorter sequence is encoded as bit vectors held in one Python int,
+    so each element of the longer sequence costs a handful of big-int
+    operations instead of a row of the dynamic programming table.
+    """
+    # Common prefixes and suffixes never contribute to the distance
+    start = 0
+    end_a, end_b = len(a), len(b)
+    while start < end_a and start < end_b and a[start] == b[start]:
+        start += 1
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+
+    if len(a) < len(b):
+        a, b = b, a
+    m = len(b)
+    if m == 0:
+        return len(a)
+
+    peq: Dict[Hashable, int] = {}
+    for i, item in enumerate(b):
+        peq[item] = peq.get(item, 0) | (1 << i)
+
+    # Complements are taken against ``mask`` so every int stays non-negative,
+    # which keeps CPython on its fast path for bitwise operations
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m
+    for item in a:
+        eq = peq.get(item, 0)
+        xv = eq | mv
+        xh = ((((eq & pv) + pv) & mask) ^ pv) | eq
+        ph = mv | (mask ^ (xh | pv))
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (mask ^ (xv | ph))
+        mv = ph & xv
+    return score
+
+
+def text_similarity(original: str, predicted: str) -> float:
+    """Return the similarity score of src/evaluation/text.ts, between 0 and 1
+
+    Lengths are counted in code points rather than UTF-16 units, so scores
+    can differ slightly from stored ones for text outside the BMP.
+    """
+    if original == predicted:
+        return 1.0
+    if not original or not predicted:
+        return 0.0
+
+    original = original.strip().lower()
+    predicted = predicted.strip().lower()
+    max_length = max(len(original), len(predicted))
+    if max_length == 0:
+        return 1.0
+    return round(1 - levenshtein(original, predicted) / max_length, 4)
+
+
+def normalize_whitespace(value: str) -> str:
+    """Collapse every run of whitespace into a single space"""
+    return " ".join(value.split())
+
+
+def error_rate(reference: Sequence[Hashable], hypothesis: Sequence[Hashable]) -> float:
+    """Return the edit distance normalized by the reference length
+
+    An empty reference scores 0 against an empty hypothesis and 1 otherwise.
+    """
+    if not reference:
+        return float(len(hypothesis) > 0)
+    return levenshtein(reference, hypothesis) / len(reference)
+
+
+def score_texts(true_markdown: str, predicted_markdown: str) -> TextScores:
+    """Return all text metrics of one prediction against its ground truth"""
+    return {
+        "text_similarity": text_similarity(true_markdown, predicted_markdown),
+        "text_similarity_ws": text_similarity(
+            normalize_whitespace(true_markdown),
+            normalize_whitespace(predicted_markdown),
+        ),
+        "cer": error_rate(true_markdown, predicted_markdown),
+        "wer": error_rate(true_markdown.split(), predicted_markdown.split()),
+    }
+
+
+def _score_result(item: Tuple[Any, Optional[float], str, str]) -> Dict[str, Any]:
+    id, stored, true_markdown, predicted_markdown = item
+    return {
+        "id": id,
+        "levenshtein_distance": stored,
+        **score_texts(true_markdown, predicted_markdown),
+    }
+
+
+def rescore_results(
+    results: Iterable[Dict[str, Any]],
+    workers: int = SCORING_WORKERS,
+    chunk_size: int = SCORING_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Recompute text metrics for results across a pool of processes
+
+    Results without predicted markdown (e.g. failed OCR) are skipped. Input
+    is consumed in bounded windows, so streamed runs are never fully held
+    in memory; only the scores are.
+    """
+    items = (
+        (
+            str(result.get("id")),
+            result.get("levenshteinDistance"),
+            result.get("trueMarkdown") or "",
+            result["predictedMarkdown"],
+        )
+        for result in results
+        if result.get("predictedMarkdown") is not None
+    )
+
+    rows = list(process_map(_score_result, items, workers, chunk_size))
+    return pd.DataFrame(rows, columns=TEXT_SCORE_COLUMNS)
+
+
+def rescore_run(timestamp: str, workers: int = SCORING_WORKERS) -> pd.DataFrame:
+    """Recompute text metrics for every result of a stored run"""
+    results = iter_results_for_run(
+        timestamp, ["id", "levenshteinDistance", "trueMarkdown", "predictedMarkdown"]
+    )
+    return rescore_results(results, workers=workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute text similarity, CER and WER for a stored run"
+    )
+    parser.add_argument("timestamp", help="Run timestamp, e.g. 2025-01-01-00-00-00")
+    parser.add_argument("--workers", type=int, default=SCORING_WORKERS)
+    parser.add_argument("--output", help="Write scores to a .csv or .parquet file")
+    args = parser.parse_args()
+
+    scores = rescore_run(args.timestamp, workers=args.workers)
+    if args.output and args.output.endswith(".parquet"):
+        scores.to_parquet(args.output, index=False)
+    elif args.output:
+        scores.to_csv(args.output, index=False)
+    print(scores.drop(columns="id").describe().to_string())
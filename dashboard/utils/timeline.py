@@ -0,0 +1,197 @@
+import os
+import heapq
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import model_combination_labels
+from utils.simulation import model_concurrency
+
+# Number of time buckets the concurrency profile is downsampled to
+TIMELINE_BINS = int(os.getenv("TIMELINE_BINS", "500"))
+# Most requests drawn on the Gantt chart before it is thinned out
+TIMELINE_MAX_REQUESTS = int(os.getenv("TIMELINE_MAX_REQUESTS", "2000"))
+
+TIMELINE_COLUMNS = [
+    "Model Combination",
+    "ocr_model",
+    "extraction_model",
+    "start",
+    "end",
+    "ocr_start",
+    "ocr_end",
+    "extraction_start",
+    "extraction_end",
+]
+
+
+def request_timeline(metrics: pd.DataFrame) -> pd.DataFrame:
+    """Return the recorded start and end of every timed request, in run seconds
+
+    Times are seconds since the first request of the run started. A request
+    spans its OCR and extraction phases; results recorded before start and
+    end times were added to the benchmark are left out.
+    """
+    started = metrics[["ocr_started_at", "extraction_started_at"]].min(axis=1)
+    completed = metrics[["ocr_completed_at", "extraction_completed_at"]].max(axis=1)
+    timed = started.notna() & completed.notna()
+    if not timed.any():
+        return pd.DataFrame(columns=TIMELINE_COLUMNS)
+
+    rows = metrics[timed]
+    origin = started[timed].min()
+    timeline = pd.DataFrame(
+        {
+            "Model Combination": model_combination_labels(rows),
+            "ocr_model": rows["ocr_model"],
+            "extraction_model": rows["extraction_model"],
+            "start": started[timed] - origin,
+            "end": completed[timed] - origin,
+            "ocr_start": rows["ocr_started_at"] - origin,
+            "ocr_end": rows["ocr_completed_at"] - origin,
+            "extraction_start": rows["extraction_started_at"] - origin,
+            "extraction_end": rows["extraction_completed_at"] - origin,
+        }
+    )
+    # Timestamps are recorded in ms
+    time_columns = TIMELINE_COLUMNS[3:]
+    timeline[time_columns] = timeline[time_columns] / 1000
+    return timeline.sort_values("start", ignore_index=True)
+
+
+def concurrency_profile(
+    starts: np.ndarray, ends: np.ndarray, edges: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the mean and peak number of requests in flight per time bucket
+
+    ``edges`` are the bucket boundaries. The mean is exact (time-weighted)
+    and both are computed from sorted start and end times, so the cost is
+    ``O((n + buckets) log n)`` whatever the number of requests.
+    """
+    starts = np.sort(starts)
+    ends = np.sort(ends)
+
+    # Busy time accumulated up to each edge: sum of min(edge, end) - start
+    # over the requests that started before it
+    start_sums = np.concatenate([[0], np.cumsum(starts)])
+    end_sums = np.concatenate([[0], np.cumsum(ends)])
+    started = np.searchsorted(starts, edges, side="right")
+    ended = np.searchsorted(ends, edges, side="right")
+    busy = (started * edges - start_sums[started]) - (ended * edges - end_sums[ended])
+    mean = np.diff(busy) / np.diff(edges)
+
+    # In flight right after every start (only starts can raise the count),
+    # and at the start of each bucket
+    in_flight = np.arange(1, len(starts) + 1) - np.searchsorted(
+        ends, starts, side="right"
+    )
+    at_edges = started - ended
+    peak = at_edges[:-1].copy()
+    bucket = np.searchsorted(edges, starts, side="right") - 1
+    inside = (bucket >= 0) & (bucket < len(peak))
+    np.maximum.at(peak, bucket[inside], in_flight[inside])
+    return mean, peak
+
+
+def concurrency_over_time(
+    timeline: pd.DataFrame, bins: int = TIMELINE_BINS
+) -> pd.DataFrame:
+    """Return the downsampled concurrency of every model combination over the run"""
+    if timeline.empty:
+        return pd.DataFrame(columns=["Model Combination", "time", "mean", "peak"])
+    edges = np.linspace(0, max(timeline["end"].max(), 1e-3), bins + 1)
+    frames = []
+    for label, rows in timeline.groupby("Model Combination", sort=False):
+        mean, peak = concurrency_profile(
+            rows["start"].to_numpy(), rows["end"].to_numpy(), edges
+        )
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Model Combination": label,
+                    "time": edges[:-1],
+                    "mean": mean,
+                    "peak": peak,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def achieved_concurrency(timeline: pd.DataFrame) -> pd.DataFrame:
+    """Compare each model combination's achieved and configured concurrency
+
+    ``mean`` is the average number of requests in flight between the
+    combination's first start and last end, ``peak`` the maximum.
+    """
+    rows = {}
+    for label, group in timeline.groupby("Model Combination", sort=False):
+        starts = group["start"].to_numpy()
+        ends = group["end"].to_numpy()
+        edges = np.array([starts.min(), max(ends.max(), starts.min() + 1e-3)])
+        mean, peak = concurrency_profile(starts, ends, edges)
+        configured = model_concurrency(
+            group["ocr_model"].iloc[0], group["extraction_model"].iloc[0]
+        )
+        rows[label] = {
+            "requests": len(group),
+            "configured": configured,
+            "mean": mean[0],
+            "peak": peak[0],
+            "saturation": mean[0] / configured,
+            "wall_time": edges[1] - edges[0],
+        }
+    return pd.DataFrame.from_dict(rows, orient="index").rename_axis("Model Combination")
+
+
+def assign_lanes(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Give every request the lowest pool slot free when it started
+
+    ``starts`` must be sorted. Requests sharing a lane never overlap, so
+    the lanes show how the pool's slots were filled over time.
+    """
+    lanes = np.empty(len(starts), dtype=np.int64)
+    busy = []
+    free = []
+    next_lane = 0
+    for i, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        while busy and busy[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        if free:
+            lane = heapq.heappop(free)
+        else:
+            lane = next_lane
+            next_lane += 1
+        heapq.heappush(busy, (end, lane))
+        lanes[i] = lane
+    return lanes
+
+
+def gantt_segments(
+    timeline: pd.DataFrame, max_requests: int = TIMELINE_MAX_REQUESTS
+) -> Tuple[pd.DataFrame, int]:
+    """Return the phase segments of a Gantt chart and the thinning step
+
+    ``timeline`` holds one model combination's requests sorted by start.
+    Lanes are assigned over every request; above ``max_requests`` only
+    every ``step``-th request is drawn.
+    """
+    lanes = assign_lanes(timeline["start"].to_numpy(), timeline["end"].to_numpy())
+    step = max(1, -(-len(timeline) // max_requests))
+    drawn = timeline.iloc[::step].assign(lane=lanes[::step])
+
+    frames = []
+    for phase in ("ocr", "extraction"):
+        segments = drawn[drawn[f"{phase}_start"].notna()]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "phase": "OCR" if phase == "ocr" else "Extraction",
+                    "lane": segments["lane"],
+                    "start": segments[f"{phase}_start"],
+                    "end": segments[f"{phase}_end"],
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True), step
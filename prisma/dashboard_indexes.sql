@@ -0,0 +1,18 @@
+-- Indexes for the dashboard query patterns (see dashboard/utils/data_loader.py)
+--
+-- Not a Prisma migration: the tables are created with `prisma db push`, and the
+-- expression and partial indexes below cannot be declared in schema.prisma.
+-- Safe to re-run; apply after creating or pushing the schema with:
+--
+--   npx prisma db execute --file prisma/dashboard_indexes.sql --schema prisma/schema.prisma
+
+-- Run lookup by timestamp and run list ordering
+CREATE INDEX IF NOT EXISTS "benchmark_runs_timestamp_idx" ON "benchmark_runs"("timestamp");
+CREATE INDEX IF NOT EXISTS "benchmark_runs_created_at_idx" ON "benchmark_runs"("created_at");
+
+-- Results of a run, keyset-paginated by id
+CREATE INDEX IF NOT EXISTS "benchmark_results_benchmark_run_id_id_idx" ON "benchmark_results"("benchmark_run_id", "id");
+
+-- Expression indexes for JSON diff totals (not expressible in schema.prisma)
+CREATE INDEX IF NOT EXISTS "benchmark_results_benchmark_run_id_diff_total_idx" ON "benchmark_results"("benchmark_run_id", ((("json_diff_stats"->>'total')::int)));
+CREATE INDEX IF NOT EXISTS "benchmark_results_benchmark_run_id_id_with_diffs_idx" ON "benchmark_results"("benchmark_run_id", "id") WHERE (("json_diff_stats"->>'total')::int) > 0;
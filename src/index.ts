@@ -90,6 +90,13 @@ const withTimeout = async (promise: Promise<any>, operation: string) => {
   }
 };
 
+// Records when a phase started and completed (Unix epoch ms) in its usage
+const withTiming = async (run: () => Promise<any>) => {
+  const startedAt = Date.now();
+  const result = await run();
+  return { ...result, usage: { ...result.usage, startedAt, completedAt: Date.now() } };
+};
+
 /* -------------------------------------------------------------------------- */
 /*                                Run Benchmark                               */
 /* -------------------------------------------------------------------------- */
@@ -166,9 +173,14 @@ const runBenchmark = async () => {
 
           try {
             if (directImageExtraction) {
-              const extractionResult = await withTimeout(
-                extractionModelProvider.extractFromImage(item.imageUrl, item.jsonSchema),
-                `JSON extraction: ${extractionModel}`,
+              const extractionResult = await withTiming(() =>
+                withTimeout(
+                  extractionModelProvider.extractFromImage(
+                    item.imageUrl,
+                    item.jsonSchema,
+                  ),
+                  `JSON extraction: ${extractionModel}`,
+                ),
               );
               result.predictedJson = extractionResult.json;
               result.usage = {
@@ -182,9 +194,8 @@ const runBenchmark = async () => {
                 result.predictedMarkdown = item.trueMarkdownOutput;
               } else {
                 if (ocrModelProvider) {
-                  ocrResult = await withTimeout(
-                    ocrModelProvider.ocr(item.imageUrl),
-                    `OCR: ${ocrModel}`,
+                  ocrResult = await withTiming(() =>
+                    withTimeout(ocrModelProvider.ocr(item.imageUrl), `OCR: ${ocrModel}`),
                   );
                   result.predictedMarkdown = ocrResult.text;
                   result.usage = {
@@ -197,13 +208,15 @@ const runBenchmark = async () => {
 
               let extractionResult;
               if (extractionModelProvider) {
-                extractionResult = await withTimeout(
-                  extractionModelProvider.extractFromText(
-                    result.predictedMarkdown,
-                    item.jsonSchema,
-                    ocrResult?.imageBase64s,
+                extractionResult = await withTiming(() =>
+                  withTimeout(
+                    extractionModelProvider.extractFromText(
+                      result.predictedMarkdown,
+                      item.jsonSchema,
+                      ocrResult?.imageBase64s,
+                    ),
+                    `JSON extraction: ${extractionModel}`,
                   ),
-                  `JSON extraction: ${extractionModel}`,
                 );
                 result.predictedJson = extractionResult.json;
 
@@ -222,6 +235,8 @@ const runBenchmark = async () => {
                   ocr: result.usage?.ocr ?? {},
                   extraction: extractionResult.usage,
                   ...mergeUsage(result.usage, extractionResult.usage),
+                  startedAt: result.usage?.startedAt ?? extractionResult.usage.startedAt,
+                  completedAt: extractionResult.usage.completedAt,
                 };
               }
             }
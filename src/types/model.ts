@@ -12,6 +12,8 @@ export interface Usage {
   inputCost?: number;
   outputCost?: number;
   totalCost?: number;
+  startedAt?: number; // Unix epoch ms
+  completedAt?: number; // Unix epoch ms
   ocr?: Usage;
   extraction?: Usage;
 }